@@ -5,14 +5,33 @@ A web-based interface for evaluating candidate resumes against job descriptions.
 """
 
 import streamlit as st
-import tempfile
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src folder to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from core_engine import process_application
+from parser import extract_text_from_bytes
+from core_engine import (
+    text_hash,
+    load_taxonomy,
+    extract_jd_features,
+    extract_resume_features,
+    embed_features,
+    build_feature_vector,
+)
+from matcher import get_model
+from scoring import DEFAULT_PROFILE, score_features
+
+SKILLS_FILE = os.path.join(os.path.dirname(__file__), "data", "skills.txt")
+
+# Per-resume pipeline stages, in order, for progress reporting
+STAGES = ("parsing", "skill extraction", "embedding", "scoring")
+
+# Seconds between leaderboard refreshes while a batch is running
+POLL_INTERVAL = 0.5
 
 
 # Configure page
@@ -23,6 +42,264 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ----------------------------
+# Cached resources
+# ----------------------------
+@st.cache_resource(show_spinner="Loading NLP models...")
+def get_taxonomy(skills_file: str = SKILLS_FILE):
+    """Process-wide: skills list, compiled PhraseMatcher and the warm encoder."""
+    taxonomy = load_taxonomy(skills_file)
+    get_model()
+    return taxonomy
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_jd_features(jd_hash: str, _jd_text: str) -> dict:
+    """Per-JD: skills, frequencies, experience requirements and embedding."""
+    skills_list, nlp_matcher = get_taxonomy()
+    jd_features = extract_jd_features(_jd_text, nlp_matcher, skills_list)
+    return embed_features(jd_features, ("embedding",))
+
+
+@st.cache_resource
+def get_executor():
+    """Process-wide worker pool; the models release the GIL while encoding."""
+    return ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
+
+# ----------------------------
+# Batch evaluation
+# ----------------------------
+def evaluate_upload(job: dict, data: bytes, jd_features: dict, nlp_matcher, skills_list: list):
+    """Runs on a worker thread; records each finished stage on the job."""
+    text = extract_text_from_bytes(data)
+    job["stage"] = 1
+    
+    resume_features = extract_resume_features(text, nlp_matcher, skills_list)
+    job["stage"] = 2
+    
+    embed_features(resume_features, ("embedding", "project_embedding"))
+    job["stage"] = 3
+    
+    result = score_features(build_feature_vector(jd_features, resume_features))
+    job["stage"] = len(STAGES)
+    return result
+
+
+def start_batch(uploads: list, jd_features: dict, nlp_matcher, skills_list: list) -> dict:
+    executor = get_executor()
+    jobs = {}
+    
+    for upload in uploads:
+        # Keep same-named uploads apart on the leaderboard
+        name = upload.name
+        copy = 1
+        while name in jobs:
+            copy += 1
+            name = f"{upload.name} ({copy})"
+        
+        job = {"stage": 0, "future": None, "result": None, "error": None}
+        job["future"] = executor.submit(
+            evaluate_upload, job, upload.getvalue(), jd_features, nlp_matcher, skills_list
+        )
+        jobs[name] = job
+    
+    return {"jobs": jobs}
+
+
+def ranked_results(batch: dict) -> list:
+    scored = [(name, job["result"]) for name, job in batch["jobs"].items() if job["result"]]
+    scored.sort(key=lambda item: -item[1]["final_score"])
+    return scored
+
+
+def update_leaderboard(batch: dict, progress_bar, status_text, leaderboard) -> bool:
+    """Collect finished jobs and redraw; returns True once the batch is done."""
+    jobs = batch["jobs"]
+    
+    for job in jobs.values():
+        future = job["future"]
+        if future.done() and job["result"] is None and job["error"] is None:
+            try:
+                job["result"] = future.result()
+            except Exception as e:
+                job["error"] = str(e)
+    
+    total_stages = len(STAGES) * len(jobs)
+    done_stages = sum(
+        len(STAGES) if job["error"] else job["stage"] for job in jobs.values()
+    )
+    finished = sum(1 for job in jobs.values() if job["result"] or job["error"])
+    
+    progress_bar.progress(done_stages / total_stages)
+    # A job reaches the last stage just before its future completes; clamp
+    # so a job caught in between still reads as "scoring"
+    in_flight = [STAGES[min(job["stage"], len(STAGES) - 1)] for job in jobs.values()
+                 if not job["future"].done()]
+    if in_flight:
+        status_text.text(
+            f"🔍 {finished}/{len(jobs)} resumes evaluated "
+            f"({', '.join(sorted(set(in_flight)))} in progress)..."
+        )
+    else:
+        status_text.text(f"✅ {finished}/{len(jobs)} resumes evaluated")
+    
+    rows = [
+        {
+            "Rank": rank,
+            "Resume": name,
+            "Final Score": result["final_score"],
+            "Skill Match": result["skill_score"],
+            "Experience-Adjusted": result["experience_adjusted_score"],
+            "Project Relevance": result["project_score"],
+            "Semantic Similarity": result["semantic_score"],
+            "Matched Skills": len(result["matched_skills"]),
+            "Missing Skills": len(result["missing_skills"]),
+        }
+        for rank, (name, result) in enumerate(ranked_results(batch), start=1)
+    ]
+    if rows:
+        leaderboard.dataframe(rows, hide_index=True, use_container_width=True)
+    
+    return finished == len(jobs)
+
+
+def render_result(result: dict):
+    """Detailed breakdown for one evaluated candidate."""
+    # Display results
+    st.markdown("---")
+    st.markdown("## 📊 Evaluation Results")
+
+    # Final Score - Large highlighted display with color coding
+    st.markdown("### Overall Score")
+
+    final_score = result['final_score']
+
+    # Color-code the final score
+    if final_score > 75:
+        st.success(f"🟢 **STRONG MATCH** - Final Score: {final_score}%")
+    elif final_score >= 50:
+        st.warning(f"🟡 **MODERATE MATCH** - Final Score: {final_score}%")
+    else:
+        st.error(f"🔴 **WEAK MATCH** - Final Score: {final_score}%")
+
+    # Score metrics
+    col_scores = st.columns(4)
+
+    with col_scores[0]:
+        st.metric(
+            label="Final Score",
+            value=f"{result['final_score']}%",
+            delta=None,
+            label_visibility="visible"
+        )
+
+    with col_scores[1]:
+        st.metric(
+            label="Skill Match",
+            value=f"{result['skill_score']}%"
+        )
+
+    with col_scores[2]:
+        st.metric(
+            label="Project Relevance",
+            value=f"{result['project_score']}%"
+        )
+
+    with col_scores[3]:
+        st.metric(
+            label="Semantic Similarity",
+            value=f"{result['semantic_score']}%"
+        )
+
+    # Experience adjusted score
+    st.markdown("---")
+
+    exp_score = result['experience_adjusted_score']
+    if exp_score > 75:
+        st.success(f"✅ Experience-Adjusted Skill Score: **{exp_score}%**")
+    elif exp_score >= 50:
+        st.info(f"ℹ️ Experience-Adjusted Skill Score: **{exp_score}%**")
+    else:
+        st.warning(f"⚠️ Experience-Adjusted Skill Score: **{exp_score}%**")
+
+    # Skills Analysis
+    st.markdown("---")
+    st.markdown("### 🎯 Skills Analysis")
+
+    skills_col1, skills_col2 = st.columns(2)
+
+    with skills_col1:
+        st.markdown("#### ✅ Matched Skills")
+        if result['matched_skills']:
+            st.success(f"Found {len(result['matched_skills'])} matching skills")
+            for skill in result['matched_skills']:
+                st.markdown(f"✓ **{skill}**")
+        else:
+            st.warning("No matched skills found")
+
+    with skills_col2:
+        st.markdown("#### ❌ Missing Skills")
+        if result['missing_skills']:
+            st.error(f"Missing {len(result['missing_skills'])} required skills")
+            for skill in result['missing_skills']:
+                st.markdown(f"✗ {skill}")
+        else:
+            st.success("All required skills present!")
+
+    # Detailed Skills Information
+    st.markdown("---")
+    st.markdown("### 📚 Detailed Skills")
+
+    detail_col1, detail_col2 = st.columns(2)
+
+    with detail_col1:
+        st.markdown("**JD Skills Extracted:**")
+        st.write(f"{len(result['jd_skills'])} skills found")
+        with st.expander("View all JD skills"):
+            for skill in result['jd_skills']:
+                st.text(skill)
+
+    with detail_col2:
+        st.markdown("**Resume Skills Extracted:**")
+        st.write(f"{len(result['resume_skills'])} skills found")
+        with st.expander("View all resume skills"):
+            for skill in result['resume_skills']:
+                st.text(skill)
+
+    # Recommendation
+    st.markdown("---")
+    st.markdown("### 💡 Recommendation")
+
+    if final_score > 75:
+        st.success(f"""
+        🟢 **STRONG MATCH - Highly Recommended**
+
+        Score: **{final_score}%**
+
+        This candidate is an excellent fit for the position. 
+        Recommend proceeding to interview.
+        """)
+    elif final_score >= 50:
+        st.warning(f"""
+        🟡 **MODERATE MATCH - Consider for Review**
+
+        Score: **{final_score}%**
+
+        This candidate has potential but may have some skill gaps.
+        Consider for further evaluation.
+        """)
+    else:
+        st.error(f"""
+        🔴 **WEAK MATCH - Not Recommended**
+
+        Score: **{final_score}%**
+
+        This candidate does not meet the minimum requirements.
+        Consider other applicants.
+        """)
+
+
 # Custom CSS for better styling
 st.markdown("""
     <style>
@@ -72,10 +349,10 @@ with st.sidebar:
     
     st.markdown("---")
     st.markdown("**Scoring Breakdown:**")
-    st.markdown("""
-    - 60% Skill Match (with experience penalty)
-    - 20% Project Relevance
-    - 20% Semantic Similarity
+    st.markdown(f"""
+    - {DEFAULT_PROFILE.skill_weight:.0%} Skill Match (with experience penalty)
+    - {DEFAULT_PROFILE.project_weight:.0%} Project Relevance
+    - {DEFAULT_PROFILE.semantic_weight:.0%} Semantic Similarity
     """)
 
 # Main content area
@@ -92,21 +369,22 @@ with col1:
 
 with col2:
     st.subheader("📤 Resume Upload")
-    uploaded_resume = st.file_uploader(
-        label="Upload Candidate Resume (PDF):",
+    uploaded_resumes = st.file_uploader(
+        label="Upload Candidate Resumes (PDF):",
         type="pdf",
+        accept_multiple_files=True,
         key="resume_upload"
     )
     
-    if uploaded_resume is not None:
-        st.success(f"✓ File uploaded: {uploaded_resume.name}")
+    if uploaded_resumes:
+        st.success(f"✓ {len(uploaded_resumes)} file(s) uploaded")
 
 # Evaluation button
 st.markdown("---")
 col_button = st.columns([1, 4])
 with col_button[0]:
     evaluate_button = st.button(
-        "🚀 Evaluate Candidate",
+        "🚀 Evaluate Candidates",
         use_container_width=True,
         type="primary"
     )
@@ -116,177 +394,57 @@ if evaluate_button:
     # Validation
     if not jd_text.strip():
         st.error("❌ Please paste a Job Description")
-    elif uploaded_resume is None:
-        st.error("❌ Please upload a Resume PDF")
+    elif not uploaded_resumes:
+        st.error("❌ Please upload at least one Resume PDF")
     else:
-        # Create temporary file for resume
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-            tmp_file.write(uploaded_resume.read())
-            tmp_resume_path = tmp_file.name
-        
         try:
-            # Show processing message with progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            status_text.text("🔍 Analyzing resume and job description...")
-            progress_bar.progress(25)
-            
-            # Call core engine
-            result = process_application(
-                jd_text=jd_text,
-                resume_file=tmp_resume_path
+            with st.spinner("🔍 Analyzing job description..."):
+                skills_list, nlp_matcher = get_taxonomy()
+                jd_features = get_jd_features(text_hash(jd_text), jd_text)
+            st.session_state["batch"] = start_batch(
+                uploaded_resumes, jd_features, nlp_matcher, skills_list
             )
-            
-            progress_bar.progress(100)
-            status_text.text("✅ Analysis complete!")
-            status_text.empty()
-            progress_bar.empty()
-            
-            # Display results
-            st.markdown("---")
-            st.markdown("## 📊 Evaluation Results")
-            
-            # Final Score - Large highlighted display with color coding
-            st.markdown("### Overall Score")
-            
-            final_score = result['final_score']
-            
-            # Color-code the final score
-            if final_score > 75:
-                st.success(f"🟢 **STRONG MATCH** - Final Score: {final_score}%")
-            elif final_score >= 50:
-                st.warning(f"🟡 **MODERATE MATCH** - Final Score: {final_score}%")
-            else:
-                st.error(f"🔴 **WEAK MATCH** - Final Score: {final_score}%")
-            
-            # Score metrics
-            col_scores = st.columns(4)
-            
-            with col_scores[0]:
-                st.metric(
-                    label="Final Score",
-                    value=f"{result['final_score']}%",
-                    delta=None,
-                    label_visibility="visible"
-                )
-            
-            with col_scores[1]:
-                st.metric(
-                    label="Skill Match",
-                    value=f"{result['skill_score']}%"
-                )
-            
-            with col_scores[2]:
-                st.metric(
-                    label="Project Relevance",
-                    value=f"{result['project_score']}%"
-                )
-            
-            with col_scores[3]:
-                st.metric(
-                    label="Semantic Similarity",
-                    value=f"{result['semantic_score']}%"
-                )
-            
-            # Experience adjusted score
-            st.markdown("---")
-            
-            exp_score = result['experience_adjusted_score']
-            if exp_score > 75:
-                st.success(f"✅ Experience-Adjusted Skill Score: **{exp_score}%**")
-            elif exp_score >= 50:
-                st.info(f"ℹ️ Experience-Adjusted Skill Score: **{exp_score}%**")
-            else:
-                st.warning(f"⚠️ Experience-Adjusted Skill Score: **{exp_score}%**")
-            
-            # Skills Analysis
-            st.markdown("---")
-            st.markdown("### 🎯 Skills Analysis")
-            
-            skills_col1, skills_col2 = st.columns(2)
-            
-            with skills_col1:
-                st.markdown("#### ✅ Matched Skills")
-                if result['matched_skills']:
-                    st.success(f"Found {len(result['matched_skills'])} matching skills")
-                    for skill in result['matched_skills']:
-                        st.markdown(f"✓ **{skill}**")
-                else:
-                    st.warning("No matched skills found")
-            
-            with skills_col2:
-                st.markdown("#### ❌ Missing Skills")
-                if result['missing_skills']:
-                    st.error(f"Missing {len(result['missing_skills'])} required skills")
-                    for skill in result['missing_skills']:
-                        st.markdown(f"✗ {skill}")
-                else:
-                    st.success("All required skills present!")
-            
-            # Detailed Skills Information
-            st.markdown("---")
-            st.markdown("### 📚 Detailed Skills")
-            
-            detail_col1, detail_col2 = st.columns(2)
-            
-            with detail_col1:
-                st.markdown("**JD Skills Extracted:**")
-                st.write(f"{len(result['jd_skills'])} skills found")
-                with st.expander("View all JD skills"):
-                    for skill in result['jd_skills']:
-                        st.text(skill)
-            
-            with detail_col2:
-                st.markdown("**Resume Skills Extracted:**")
-                st.write(f"{len(result['resume_skills'])} skills found")
-                with st.expander("View all resume skills"):
-                    for skill in result['resume_skills']:
-                        st.text(skill)
-            
-            # Recommendation
-            st.markdown("---")
-            st.markdown("### 💡 Recommendation")
-            
-            if final_score > 75:
-                st.success(f"""
-                🟢 **STRONG MATCH - Highly Recommended**
-                
-                Score: **{final_score}%**
-                
-                This candidate is an excellent fit for the position. 
-                Recommend proceeding to interview.
-                """)
-            elif final_score >= 50:
-                st.warning(f"""
-                🟡 **MODERATE MATCH - Consider for Review**
-                
-                Score: **{final_score}%**
-                
-                This candidate has potential but may have some skill gaps.
-                Consider for further evaluation.
-                """)
-            else:
-                st.error(f"""
-                🔴 **WEAK MATCH - Not Recommended**
-                
-                Score: **{final_score}%**
-                
-                This candidate does not meet the minimum requirements.
-                Consider other applicants.
-                """)
-        
         except Exception as e:
-            st.error(f"❌ Error processing resume: {str(e)}")
-            st.info("Please check that:")
-            st.markdown("- The resume is a valid PDF file")
+            st.error(f"❌ Error processing job description: {str(e)}")
             st.markdown("- The job description is properly formatted")
             st.markdown("- All required models are loaded")
-        
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_resume_path):
-                os.remove(tmp_resume_path)
+
+# Live leaderboard (re-attaches to a running batch on every rerun)
+batch = st.session_state.get("batch")
+finished = True
+if batch:
+    st.markdown("---")
+    st.markdown("## 🏆 Candidate Leaderboard")
+    
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    leaderboard = st.empty()
+    
+    # One poll per script run; the rerun at the bottom of the page polls
+    # again, so finished candidates can be inspected while others run
+    finished = update_leaderboard(batch, progress_bar, status_text, leaderboard)
+    if finished:
+        progress_bar.empty()
+    
+    scored = ranked_results(batch)
+    failed = [name for name, job in batch["jobs"].items() if job["error"]]
+    for name in failed:
+        st.error(f"❌ Error processing {name}: {batch['jobs'][name]['error']}")
+        st.info("Please check that the resume is a valid PDF file")
+    
+    if scored:
+        st.markdown("---")
+        names = [name for name, _ in scored]
+        # Ranks shift as results arrive; keep the candidate being viewed
+        previous = st.session_state.get("viewed_candidate")
+        selected = st.selectbox(
+            "View detailed results for:",
+            options=names,
+            index=names.index(previous) if previous in names else 0,
+            key="selected_candidate"
+        )
+        st.session_state["viewed_candidate"] = selected
+        render_result(dict(scored)[selected])
 
 # Footer
 st.markdown("---")
@@ -295,3 +453,8 @@ st.markdown("""
     AI Resume Screening System | Powered by NLP & Machine Learning
 </div>
 """, unsafe_allow_html=True)
+
+# Keep polling a running batch once the page is rendered
+if not finished:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
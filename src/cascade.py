@@ -0,0 +1,212 @@
+"""
+Cascade Scoring
+
+Scores a pool tier by tier, cheapest first, and stops early on candidates
+whose best reachable final score cannot beat the cutoff (or the current
+top-K floor):
+
+    skill    - skill match + experience penalty (no embeddings)
+    project  - project section embedding
+    semantic - full resume embedding (final score)
+
+Upper bounds assume every not-yet-computed similarity is at its ceiling.
+The default ceilings are the highest similarities each mode's encoder
+realistically produces, not 100: with ceilings of 100 the project and
+semantic weights alone reach most cutoffs, so nobody exits at the skill
+tier. A candidate whose similarity beats its ceiling could be dropped;
+tier_counts["over_ceiling"] counts how often that happened among the
+fully scored ones, so the ceilings can be recalibrated.
+"""
+
+import heapq
+
+from core_engine import (
+    build_skill_vector,
+    build_feature_vector,
+    build_pool_feature_vectors,
+    embed_features,
+    embed_many,
+)
+from matcher import embedding_similarity
+from scoring import (
+    ScoringProfile,
+    DEFAULT_PROFILE,
+    score_features,
+    score_skill_match,
+    score_upper_bound,
+)
+
+TIERS = ("skill", "project", "semantic")
+
+# The app's "moderate match" threshold
+DEFAULT_CUTOFF = 50
+
+# Similarity ceilings (0-100) per mode. Lexical: the highest TF-IDF cosines
+# on the regression corpus are ~27 (project) and ~55 (resume), rounded up.
+# Full: MiniLM cosines between a JD and a resume or project section stay
+# below 0.8.
+DEFAULT_CEILINGS = {
+    "full": {"project_ceiling": 80, "semantic_ceiling": 80},
+    "lexical": {"project_ceiling": 40, "semantic_ceiling": 60},
+}
+
+
+def _floor(cutoff: float, top_scores: list, top_k: int) -> float:
+    if top_k and len(top_scores) >= top_k:
+        return max(cutoff, top_scores[0])
+    return cutoff
+
+
+def _exit_record(tier: str, upper_bound: float, skill_score: float,
+                 experience_adjusted_score: float, project_score=None) -> dict:
+    return {
+        "exit_tier": tier,
+        "upper_bound": upper_bound,
+        "skill_score": round(skill_score, 2),
+        "experience_adjusted_score": round(experience_adjusted_score, 2),
+        "project_score": project_score,
+    }
+
+
+def cascade_rank(jd_features: dict, pool: dict,
+                 profile: ScoringProfile = DEFAULT_PROFILE,
+                 cutoff: float = DEFAULT_CUTOFF,
+                 top_k: int = None,
+                 project_ceiling: float = None,
+                 semantic_ceiling: float = None,
+                 batch_size: int = 32) -> dict:
+    """
+    Rank a pool with early exit for candidates that cannot make the cut.
+
+    Args:
+        jd_features (dict): Output of core_engine.extract_jd_features
+        pool (dict): Candidate ID -> resume features
+        profile (ScoringProfile): Scoring weights
+        cutoff (float): Minimum final score worth computing in full
+            (50 = the app's "moderate match" threshold)
+        top_k (int): If set, also exit candidates that cannot beat the
+            current K-th best score
+        project_ceiling (float): Assumed maximum project score (default:
+            DEFAULT_CEILINGS for the JD's mode; 100 never drops a
+            candidate that could pass but rarely exits anyone early)
+        semantic_ceiling (float): Assumed maximum semantic score (same
+            default)
+        batch_size (int): Candidates embedded per encoder call
+
+    Returns:
+        dict: Contains:
+            - ranked: (candidate_id, result) pairs for fully scored
+              candidates, best first (these may still end up below the
+              cutoff; their bound just did not rule them out)
+            - exited: Candidate ID -> exit record (exit_tier, upper_bound
+              and the partial scores computed before exiting)
+            - tier_counts: Number of candidates exiting at each tier
+              ("skill", "project") and completing ("semantic"), plus
+              "over_ceiling": completed candidates with a similarity
+              above its ceiling
+    """
+    ceilings = DEFAULT_CEILINGS[jd_features.get("mode", "full")]
+    if project_ceiling is None:
+        project_ceiling = ceilings["project_ceiling"]
+    if semantic_ceiling is None:
+        semantic_ceiling = ceilings["semantic_ceiling"]
+
+    # Cheap tier for everyone: skill match + experience penalty
+    candidates = []
+    for candidate_id, resume_features in pool.items():
+        vector = build_skill_vector(jd_features, resume_features)
+        _, skill_score, adjusted = score_skill_match(vector, profile)
+        upper_bound = score_upper_bound(adjusted, project_ceiling, semantic_ceiling, profile)
+        candidates.append((upper_bound, candidate_id, skill_score, adjusted))
+
+    # Most promising first, so the top-K floor rises as early as possible
+    candidates.sort(key=lambda item: (-item[0], str(item[1])))
+
+    # The lexical similarities cost next to nothing; compute them up front
+    lexical_vectors = None
+    if jd_features.get("mode") == "lexical":
+        lexical_vectors = build_pool_feature_vectors(jd_features, pool)
+    else:
+        embed_features(jd_features, ("embedding",))
+
+    ranked = []
+    exited = {}
+    over_ceiling = 0
+    top_scores = []  # min-heap of the best top_k final scores
+
+    for start in range(0, len(candidates), batch_size):
+        batch = candidates[start:start + batch_size]
+
+        # ----------------------------
+        # Tier 1: skill bound
+        # ----------------------------
+        floor = _floor(cutoff, top_scores, top_k)
+        survivors = []
+        for upper_bound, candidate_id, skill_score, adjusted in batch:
+            if upper_bound < floor:
+                exited[candidate_id] = _exit_record("skill", upper_bound, skill_score, adjusted)
+            else:
+                survivors.append((candidate_id, skill_score, adjusted))
+
+        # ----------------------------
+        # Tier 2: project relevance
+        # ----------------------------
+        if lexical_vectors is None:
+            embed_many([pool[candidate_id] for candidate_id, _, _ in survivors], "project_embedding")
+
+        remaining = []
+        for candidate_id, skill_score, adjusted in survivors:
+            if lexical_vectors is not None:
+                project_score = lexical_vectors[candidate_id]["project_score"]
+            else:
+                project_embedding = pool[candidate_id].get("project_embedding")
+                project_score = 0 if project_embedding is None else embedding_similarity(
+                    jd_features["embedding"], project_embedding
+                )
+
+            upper_bound = score_upper_bound(adjusted, project_score, semantic_ceiling, profile)
+            if upper_bound < floor:
+                exited[candidate_id] = _exit_record(
+                    "project", upper_bound, skill_score, adjusted, project_score
+                )
+            else:
+                remaining.append((candidate_id, project_score))
+
+        # ----------------------------
+        # Tier 3: full semantic similarity
+        # ----------------------------
+        if lexical_vectors is None:
+            embed_many([pool[candidate_id] for candidate_id, _ in remaining], "embedding")
+
+        for candidate_id, _ in remaining:
+            if lexical_vectors is not None:
+                vector = lexical_vectors[candidate_id]
+            else:
+                # Both embeddings are cached by now; this is two dot products
+                vector = build_feature_vector(jd_features, pool[candidate_id])
+
+            result = score_features(vector, profile)
+            ranked.append((candidate_id, result))
+            if (vector["project_score"] > project_ceiling
+                    or vector["semantic_score"] > semantic_ceiling):
+                over_ceiling += 1
+
+            if top_k:
+                if len(top_scores) < top_k:
+                    heapq.heappush(top_scores, result["final_score"])
+                elif result["final_score"] > top_scores[0]:
+                    heapq.heapreplace(top_scores, result["final_score"])
+
+    ranked.sort(key=lambda item: (-item[1]["final_score"], str(item[0])))
+
+    tier_counts = {tier: 0 for tier in TIERS}
+    for record in exited.values():
+        tier_counts[record["exit_tier"]] += 1
+    tier_counts["semantic"] = len(ranked)
+    tier_counts["over_ceiling"] = over_ceiling
+
+    return {
+        "ranked": ranked,
+        "exited": exited,
+        "tier_counts": tier_counts,
+    }
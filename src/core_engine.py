@@ -4,24 +4,454 @@ Core Resume Screening Engine
 Orchestrates the entire resume screening workflow.
 """
 
+import hashlib
+
 from parser import extract_text_from_pdf
 from skill_extracter import (
     load_skills,
     build_matcher,
     extract_skills_hybrid,
+    extract_skills_lexical,
+    extract_skills_lexical_batch,
 )
 from matcher import (
-    calculate_dynamic_match,
+    calculate_jd_frequency,
     extract_experience_requirements,
     extract_candidate_experience,
-    apply_experience_penalty,
     extract_project_section,
-    calculate_project_relevance,
-    calculate_resume_similarity,
+    MODEL_NAME,
+    encode_texts,
+    embedding_similarity,
+    calculate_lexical_similarities,
 )
+from scoring import ScoringProfile, DEFAULT_PROFILE, score_features, rerank
+from sections import HEADER, segment_sections, section_text
+from skill_index import SkillIndex
+
+# Engine modes:
+#   full    - spaCy parser + MiniLM skill discovery and embedding similarities
+#   lexical - tokenizer + PhraseMatcher skills and hashed term-vector similarities only
+MODES = ("full", "lexical")
+
+# Score components that the lexical mode approximates, and how
+LEXICAL_APPROXIMATIONS = {
+    "skill_score": "PhraseMatcher only, no semantic skill discovery",
+    "project_score": "term-vector cosine instead of MiniLM embeddings",
+    "semantic_score": "term-vector cosine instead of MiniLM embeddings",
+}
+
+# Resume sections scanned for "N years of <skill>" claims and parsed for new
+# skills; education and honors lines hold course lengths and award names
+RELEVANT_SECTIONS = (HEADER, "experience", "projects", "skills")
+
+# Embedding field -> text field it is computed from
+EMBEDDING_FIELDS = {
+    "embedding": "text",
+    "project_embedding": "project_text",
+}
+
+
+def text_hash(text: str) -> str:
+    """Stable content hash used to recognise already-processed resumes."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def taxonomy_hash(skills_list: list) -> str:
+    """Content hash of a skill taxonomy, stamped on feature stores built with it."""
+    return text_hash("\n".join(sorted(set(skills_list))))
+
+
+def _check_mode(mode: str):
+    if mode not in MODES:
+        raise ValueError(f"Unknown engine mode {mode!r}; expected one of {MODES}")
+
+
+def load_taxonomy(skills_file: str = "data/skills.txt", mode: str = "full") -> tuple:
+    """
+    Load the skills list and compile the PhraseMatcher for it.
+
+    Returns:
+        tuple: (skills_list, nlp_matcher)
+    """
+    _check_mode(mode)
+    skills_list = load_skills(skills_file)
+    nlp_matcher = build_matcher(skills_list, lexical=(mode == "lexical"))
+    return skills_list, nlp_matcher
+
+
+def extract_jd_features(jd_text: str, nlp_matcher, skills_list: list,
+                        mode: str = "full") -> dict:
+    """
+    Extract everything the scorer needs from a job description.
+
+    Returns:
+        dict: Contains text, skills, frequency (mentions per skill) and
+        experience (required years per skill)
+    """
+    _check_mode(mode)
+    if mode == "lexical":
+        jd_skills = extract_skills_lexical(jd_text, nlp_matcher)
+    else:
+        jd_skills = extract_skills_hybrid(jd_text, nlp_matcher, skills_list)
+
+    return {
+        "mode": mode,
+        "text": jd_text,
+        "skills": jd_skills,
+        "frequency": calculate_jd_frequency(jd_text, set(jd_skills)),
+        "experience": extract_experience_requirements(jd_text, set(jd_skills)),
+    }
+
+
+def extract_jd_pool(jd_texts: dict, nlp_matcher, skills_list: list,
+                    mode: str = "full") -> dict:
+    """
+    Extract features for many job descriptions, embedding them in one batch
+    (full mode).
+
+    Args:
+        jd_texts (dict): JD ID -> job description text
+
+    Returns:
+        dict: JD ID -> JD features
+    """
+    jd_pool = {
+        jd_id: extract_jd_features(jd_text, nlp_matcher, skills_list, mode)
+        for jd_id, jd_text in jd_texts.items()
+    }
+    if mode == "full":
+        embed_many(list(jd_pool.values()), "embedding")
+    return jd_pool
+
+
+def extract_resume_features(resume_text: str, nlp_matcher, skills_list: list,
+                            mode: str = "full", resume_skills: list = None) -> dict:
+    """
+    Extract the JD-independent features of a resume.
+
+    The resume is segmented once; experience claims and new-skill discovery
+    read only the relevant sections, and project relevance uses the
+    projects section.
+
+    Args:
+        resume_skills (list): Skills already extracted for this text (e.g. by
+            a batched lexical pass); extracted here when omitted
+
+    Returns:
+        dict: Contains text, text_hash, sections (section -> content
+        offsets), skills, experience (years per skill) and project_text
+    """
+    _check_mode(mode)
+    sections = segment_sections(resume_text)
+
+    if resume_skills is None:
+        if mode == "lexical":
+            resume_skills = extract_skills_lexical(resume_text, nlp_matcher)
+        else:
+            resume_skills = extract_skills_hybrid(
+                resume_text, nlp_matcher, skills_list,
+                discovery_text=section_text(resume_text, sections, RELEVANT_SECTIONS),
+            )
+
+    return {
+        "mode": mode,
+        "text": resume_text,
+        "text_hash": text_hash(resume_text),
+        "sections": sections,
+        "skills": resume_skills,
+        "experience": extract_candidate_experience(
+            section_text(resume_text, sections, RELEVANT_SECTIONS), set(resume_skills)
+        ),
+        "project_text": extract_project_section(resume_text, sections),
+    }
+
+
+def embed_features(features: dict, fields: tuple = ("embedding",)) -> dict:
+    """
+    Encode the requested embedding fields in one batch and cache them on
+    the features dict. Fields that are already present (e.g. reloaded from
+    the feature store) or whose source text is empty are skipped.
+    """
+    pending = [
+        name for name in fields
+        if features.get(name) is None and features.get(EMBEDDING_FIELDS[name], "").strip()
+    ]
+
+    if pending:
+        vectors = encode_texts([features[EMBEDDING_FIELDS[name]] for name in pending])
+        for name, vector in zip(pending, vectors):
+            features[name] = vector
+
+    return features
+
+
+def embed_many(features_list: list, name: str = "embedding"):
+    """Like embed_features, but encodes one field across many feature dicts in a single batch."""
+    source = EMBEDDING_FIELDS[name]
+    pending = [
+        features for features in features_list
+        if features.get(name) is None and features.get(source, "").strip()
+    ]
+
+    if pending:
+        vectors = encode_texts([features[source] for features in pending])
+        for features, vector in zip(pending, vectors):
+            features[name] = vector
+
+
+def build_skill_vector(jd_features: dict, resume_features: dict) -> dict:
+    """The skill/experience part of a feature vector; needs no similarity model."""
+    return {
+        "jd_skills": list(jd_features["skills"]),
+        "resume_skills": list(resume_features["skills"]),
+        "jd_frequency": dict(jd_features["frequency"]),
+        "jd_experience": dict(jd_features["experience"]),
+        "candidate_experience": dict(resume_features["experience"]),
+    }
+
+
+def build_feature_vector(jd_features: dict, resume_features: dict) -> dict:
+    """
+    Combine JD and resume features into the vector consumed by
+    scoring.score_features. This is the last step that needs the encoder;
+    everything after it can be re-weighted instantly.
+    """
+    if jd_features.get("mode") == "lexical":
+        resume_scores, project_scores = calculate_lexical_similarities(
+            jd_features["text"], [resume_features["text"]], [resume_features["project_text"]]
+        )
+        return _lexical_feature_vector(
+            jd_features, resume_features, project_scores[0], resume_scores[0]
+        )
+
+    embed_features(jd_features, ("embedding",))
+    embed_features(resume_features, ("embedding", "project_embedding"))
+
+    # An empty project section (or resume) scores 0
+    project_embedding = resume_features.get("project_embedding")
+    if project_embedding is None:
+        project_score = 0
+    else:
+        project_score = embedding_similarity(jd_features["embedding"], project_embedding)
+
+    resume_embedding = resume_features.get("embedding")
+    if resume_embedding is None:
+        semantic_score = 0
+    else:
+        semantic_score = embedding_similarity(jd_features["embedding"], resume_embedding)
+
+    return {
+        **build_skill_vector(jd_features, resume_features),
+        "project_score": project_score,
+        "semantic_score": semantic_score,
+        "mode": "full",
+        "approximated": {},
+    }
+
+
+def _lexical_feature_vector(jd_features: dict, resume_features: dict,
+                            project_score: float, semantic_score: float) -> dict:
+    return {
+        **build_skill_vector(jd_features, resume_features),
+        "project_score": project_score,
+        "semantic_score": semantic_score,
+        "mode": "lexical",
+        "approximated": dict(LEXICAL_APPROXIMATIONS),
+    }
+
+
+def build_pool_feature_vectors(jd_features: dict, pool: dict) -> dict:
+    """
+    Build feature vectors for every resume in a pool against one JD.
+
+    In lexical mode the whole pool is vectorised in one call; every score
+    still depends only on the JD and that resume.
 
+    Returns:
+        dict: Candidate ID -> feature vector
+    """
+    if jd_features.get("mode") != "lexical":
+        return {
+            candidate_id: build_feature_vector(jd_features, resume_features)
+            for candidate_id, resume_features in pool.items()
+        }
+
+    candidate_ids = list(pool)
+    resume_scores, project_scores = calculate_lexical_similarities(
+        jd_features["text"],
+        [pool[candidate_id]["text"] for candidate_id in candidate_ids],
+        [pool[candidate_id]["project_text"] for candidate_id in candidate_ids],
+    )
+
+    return {
+        candidate_id: _lexical_feature_vector(
+            jd_features, pool[candidate_id], project_score, semantic_score
+        )
+        for candidate_id, project_score, semantic_score
+        in zip(candidate_ids, project_scores, resume_scores)
+    }
+
+
+def extract_pool_features(resume_texts: dict, nlp_matcher, skills_list: list,
+                          store=None, mode: str = "full", embed: bool = True,
+                          must_have: str = None) -> dict:
+    """
+    Extract (and embed) features for a pool of resumes, reusing a
+    FeatureStore when given.
+
+    Resumes whose text hash matches the stored entry are loaded from the
+    store; the rest are processed and written back in a single bulk insert.
+    A store written with a different taxonomy, embedding model or schema
+    is cleared first, since none of its features apply.
+
+    Args:
+        resume_texts (dict): Candidate ID -> resume text
+        store (FeatureStore): Optional persistent store (full mode only)
+        mode (str): Engine mode, "full" or "lexical"
+        embed (bool): Encode the resume and project embeddings of every
+            candidate. Pass False when a caller such as cascade.cascade_rank
+            embeds only the candidates it needs; use persist_embeddings
+            afterwards to write those back to the store.
+        must_have (str): Boolean skill query (skill_index syntax). Stored
+            resumes are filtered on their stored skills before they are
+            loaded; the rest after skill extraction, before any embedding
+            (they are still written to the store).
+
+    Returns:
+        dict: Candidate ID -> resume features (only the resumes satisfying
+        must_have, if given)
+    """
+    _check_mode(mode)
+
+    if mode == "lexical":
+        if store is not None:
+            raise ValueError("The feature store holds full-mode features only")
+
+        candidate_ids = list(resume_texts)
+        texts = [resume_texts[candidate_id] for candidate_id in candidate_ids]
+        skills = extract_skills_lexical_batch(texts, nlp_matcher)
+        pool = {
+            candidate_id: extract_resume_features(
+                text, nlp_matcher, skills_list, mode="lexical", resume_skills=resume_skills
+            )
+            for candidate_id, text, resume_skills in zip(candidate_ids, texts, skills)
+        }
+        return prefilter_pool(pool, must_have) if must_have else pool
+
+    pool = {}
+    pending = dict(resume_texts)
+
+    if store is not None:
+        store.ensure_stamp(taxonomy_hash(skills_list), MODEL_NAME)
+        stored_hashes = store.text_hashes(resume_texts)
+        reusable = [
+            candidate_id for candidate_id, text in resume_texts.items()
+            if stored_hashes.get(str(candidate_id)) == text_hash(text)
+        ]
+        for candidate_id in reusable:
+            pending.pop(candidate_id, None)
+        if must_have:
+            # Stored resumes that fail the query are never loaded
+            reusable = SkillIndex.from_store(store, reusable).query(must_have)
+        for candidate_id, features in store.get_many(reusable).items():
+            features["mode"] = "full"
+            features["text"] = resume_texts.get(candidate_id, "")
+            pool[candidate_id] = features
+
+    extracted = {
+        candidate_id: extract_resume_features(text, nlp_matcher, skills_list)
+        for candidate_id, text in pending.items()
+    }
+    pool.update(extracted)
+
+    # Newly extracted resumes are always written back
+    before = embedding_state(pool)
+    before.update(dict.fromkeys(extracted))
+
+    shortlist = prefilter_pool(pool, must_have) if must_have else pool
+    if embed:
+        # Also fills embeddings skipped by an earlier embed=False run
+        embed_many(list(shortlist.values()), "embedding")
+        embed_many(list(shortlist.values()), "project_embedding")
+
+    persist_embeddings(pool, before, store)
+    return shortlist
+
+
+def embedding_state(pool: dict) -> dict:
+    """Candidate ID -> which embedding fields are computed, for persist_embeddings."""
+    return {
+        candidate_id: tuple(features.get(name) is not None for name in EMBEDDING_FIELDS)
+        for candidate_id, features in pool.items()
+    }
+
+
+def persist_embeddings(pool: dict, before: dict, store=None):
+    """
+    Write back, in one bulk insert, the candidates whose embeddings were
+    computed since the embedding_state snapshot `before` (or that are
+    absent from it), so later runs reuse them.
+    """
+    if store is None:
+        return
+
+    changed = {
+        candidate_id: pool[candidate_id]
+        for candidate_id, state in embedding_state(pool).items()
+        if state != before.get(candidate_id)
+    }
+    if changed:
+        store.put_many(changed)
+
+
+def prefilter_pool(pool: dict, must_have: str, index: SkillIndex = None) -> dict:
+    """
+    Prune a pool to the resumes satisfying a boolean must-have skill query
+    (e.g. "python AND (aws OR gcp)") before full scoring.
+
+    Args:
+        pool (dict): Candidate ID -> resume features
+        must_have (str): Query in skill_index syntax
+        index (SkillIndex): Index covering at least the pool (built if
+            omitted); it may also hold other resumes
 
-def process_application(jd_text: str, resume_file: str, skills_file: str = "data/skills.txt") -> dict:
+    Returns:
+        dict: The subset of pool that matches
+    """
+    if index is None:
+        index = SkillIndex.from_pool(pool)
+
+    shortlist = index.query(must_have)
+    return {candidate_id: features for candidate_id, features in pool.items()
+            if candidate_id in shortlist}
+
+
+def score_pool(jd_features: dict, pool: dict,
+               profile: ScoringProfile = DEFAULT_PROFILE) -> list:
+    """
+    Score and rank a pool of resume features against one JD.
+
+    Returns:
+        list: (candidate_id, result) pairs sorted by final score, best first
+    """
+    return rerank(build_pool_feature_vectors(jd_features, pool), profile)
+
+
+def score_resume(jd_features: dict, resume_text: str, nlp_matcher, skills_list: list,
+                 profile: ScoringProfile = DEFAULT_PROFILE) -> dict:
+    """
+    Score one resume text against already-extracted JD features, so callers
+    evaluating many resumes against one JD do the JD-side work only once.
+    """
+    mode = jd_features.get("mode", "full")
+    resume_features = extract_resume_features(resume_text, nlp_matcher, skills_list, mode)
+    features = build_feature_vector(jd_features, resume_features)
+    return score_features(features, profile)
+
+
+def process_application(jd_text: str, resume_file: str, skills_file: str = "data/skills.txt",
+                        profile: ScoringProfile = DEFAULT_PROFILE,
+                        mode: str = "full") -> dict:
     """
     Process a resume against a job description and return comprehensive scoring.
     
@@ -29,6 +459,8 @@ def process_application(jd_text: str, resume_file: str, skills_file: str = "data
         jd_text (str): Full text of the job description
         resume_file (str): Path to the resume PDF file
         skills_file (str): Path to the skills list file (default: data/skills.txt)
+        profile (ScoringProfile): Scoring weights (default: DEFAULT_PROFILE)
+        mode (str): "full" (default) or "lexical" for fast neural-free triage
     
     Returns:
         dict: Contains:
@@ -41,79 +473,23 @@ def process_application(jd_text: str, resume_file: str, skills_file: str = "data
             - missing_skills: Set of skills required but not in resume
             - jd_skills: All skills extracted from JD
             - resume_skills: All skills extracted from resume
+            - mode: Engine mode used
+            - approximated: Score components approximated by the mode, with
+              the reason (empty in full mode)
     """
     
     # ----------------------------
     # Load Skills List
     # ----------------------------
-    skills_list = load_skills(skills_file)
-    nlp_matcher = build_matcher(skills_list)
+    skills_list, nlp_matcher = load_taxonomy(skills_file, mode)
     
     # ----------------------------
-    # Extract JD Skills
+    # Extract JD Features
     # ----------------------------
-    jd_skills = extract_skills_hybrid(jd_text, nlp_matcher, skills_list)
+    jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, mode)
     
     # ----------------------------
-    # Extract Resume Text and Skills
+    # Extract Resume Text and Score
     # ----------------------------
     resume_text = extract_text_from_pdf(resume_file)
-    resume_skills = extract_skills_hybrid(resume_text, nlp_matcher, skills_list)
-    
-    # ----------------------------
-    # Calculate Weighted Skill Match
-    # ----------------------------
-    skill_match_result = calculate_dynamic_match(jd_text, jd_skills, resume_skills)
-    skill_score = skill_match_result["match_percentage"]
-    matched_skills = skill_match_result["matched_skills"]
-    missing_skills = skill_match_result["missing_skills"]
-    
-    # ----------------------------
-    # Apply Experience Penalty
-    # ----------------------------
-    jd_experience = extract_experience_requirements(jd_text, set(jd_skills))
-    candidate_experience = extract_candidate_experience(resume_text, set(resume_skills))
-    
-    experience_adjusted_score = apply_experience_penalty(
-        skill_score,
-        jd_experience,
-        candidate_experience
-    )
-    
-    # ----------------------------
-    # Calculate Project Relevance
-    # ----------------------------
-    project_text = extract_project_section(resume_text)
-    project_score = calculate_project_relevance(jd_text, project_text)
-    
-    # ----------------------------
-    # Calculate Semantic Similarity
-    # ----------------------------
-    semantic_score = calculate_resume_similarity(jd_text, resume_text)
-    
-    # ----------------------------
-    # Compute Final Score
-    # ----------------------------
-    final_score = (
-        0.5 * experience_adjusted_score +
-        0.2 * project_score +
-        0.3 * semantic_score
-    )
-    
-    # Ensure score is between 0-100
-    final_score = min(100, max(0, round(final_score, 2)))
-    
-    # ----------------------------
-    # Return Results
-    # ----------------------------
-    return {
-        "final_score": final_score,
-        "skill_score": round(skill_score, 2),
-        "experience_adjusted_score": round(experience_adjusted_score, 2),
-        "project_score": round(project_score, 2),
-        "semantic_score": round(semantic_score, 2),
-        "matched_skills": sorted(list(matched_skills)),
-        "missing_skills": sorted(list(missing_skills)),
-        "jd_skills": sorted(jd_skills),
-        "resume_skills": sorted(resume_skills),
-    }
+    return score_resume(jd_features, resume_text, nlp_matcher, skills_list, profile)
@@ -0,0 +1,184 @@
+"""
+Phrase Embedding Cache
+
+Candidate skill phrases ("rest api", "data pipelines", ...) repeat across
+thousands of resumes. This cache keeps their embeddings so each distinct
+phrase is encoded once:
+
+    memory - bounded LRU of recently used phrases
+    disk   - optional SQLite table shared by runs (and by forked workers)
+
+Entries are keyed by model ID and normalized phrase text (lowercased,
+whitespace collapsed), so switching encoders never returns stale vectors.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS phrase_embeddings (
+    model_id TEXT NOT NULL,
+    phrase TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (model_id, phrase)
+);
+"""
+
+# SQLite's default limit on bound parameters per statement (minus model_id)
+_SQLITE_MAX_VARIABLES = 899
+
+
+def normalize_phrase(phrase: str) -> str:
+    return " ".join(phrase.lower().split())
+
+
+class PhraseEmbeddingCache:
+    """
+    Two-tier cache of phrase embeddings for one model.
+
+    Args:
+        model_id (str): Encoder identifier, part of every key
+        max_entries (int): In-memory LRU capacity
+        path (str): Optional SQLite file for the on-disk tier
+    """
+
+    def __init__(self, model_id: str, max_entries: int = 50000, path: str = None):
+        self.model_id = model_id
+        self.max_entries = max_entries
+        self.path = path
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self.reset_stats()
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def reset_stats(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._memory),
+        }
+
+    # -----------------------------
+    # Disk tier
+    # -----------------------------
+    def _disk(self):
+        if self.path is None:
+            return None
+        # A connection must not cross a fork; reopen in each process
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _disk_get(self, phrases: List[str]) -> Dict[str, np.ndarray]:
+        conn = self._disk()
+        if conn is None or not phrases:
+            return {}
+
+        found = {}
+        for i in range(0, len(phrases), _SQLITE_MAX_VARIABLES):
+            chunk = phrases[i:i + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            for phrase, blob in conn.execute(
+                f"SELECT phrase, vector FROM phrase_embeddings "
+                f"WHERE model_id = ? AND phrase IN ({placeholders})",
+                (self.model_id, *chunk),
+            ):
+                found[phrase] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _disk_put(self, vectors: Dict[str, np.ndarray]):
+        conn = self._disk()
+        if conn is None or not vectors:
+            return
+
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO phrase_embeddings (model_id, phrase, vector) "
+                "VALUES (?, ?, ?)",
+                [(self.model_id, phrase, vector.tobytes()) for phrase, vector in vectors.items()],
+            )
+
+    # -----------------------------
+    # Memory tier
+    # -----------------------------
+    def _remember(self, phrase: str, vector: np.ndarray):
+        self._memory[phrase] = vector
+        self._memory.move_to_end(phrase)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    def encode(self, phrases: List[str], encode_fn: Callable) -> np.ndarray:
+        """
+        Embeddings for the given phrases, encoding only unseen ones.
+
+        Args:
+            phrases (list): Phrases to embed
+            encode_fn (callable): Maps a list of phrases to a 2D array of
+                embeddings (called at most once, with distinct phrases)
+
+        Returns:
+            np.ndarray: float32 matrix, one row per input phrase
+        """
+        keys = [normalize_phrase(phrase) for phrase in phrases]
+        vectors = {}
+
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    vectors[key] = self._memory[key]
+                    self.memory_hits += 1
+
+            missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+            for key, vector in self._disk_get(missing).items():
+                vectors[key] = vector
+                self._remember(key, vector)
+                self.disk_hits += 1
+
+        missing = [key for key in missing if key not in vectors]
+        if missing:
+            encoded = np.asarray(encode_fn(missing), dtype=np.float32)
+            new_vectors = dict(zip(missing, encoded))
+
+            with self._lock:
+                self.misses += len(missing)
+                for key, vector in new_vectors.items():
+                    self._remember(key, vector)
+                self._disk_put(new_vectors)
+            vectors.update(new_vectors)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([vectors[key] for key in keys])
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
@@ -0,0 +1,473 @@
+"""
+Resume Feature Store
+
+Persists extracted resume features so batch and ranking jobs can reload a
+processed pool instead of re-running the NLP pipeline.
+
+Layout of a store directory:
+    features.db      SQLite metadata (hash, skills, experience, projects)
+    embeddings.f32   Append-only float32 matrix, memory-mapped on read
+                     (FeatureStore.compact drops rows no resume refers to)
+
+A store is stamped with the schema version, the skill taxonomy hash and the
+embedding model ID its features were computed with; features are only
+reused under the same stamp.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+DB_FILE = "features.db"
+EMBEDDINGS_FILE = "embeddings.f32"
+LOCK_FILE = "store.lock"
+
+# Bump when the stored features change shape or are extracted differently
+SCHEMA_VERSION = 1
+
+# Meta keys that must match before stored features are reused
+STAMP_KEYS = ("schema_version", "taxonomy_hash", "model_id")
+
+# SQLite's default limit on bound parameters per statement
+_SQLITE_MAX_VARIABLES = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resumes (
+    candidate_id TEXT PRIMARY KEY,
+    text_hash TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    experience TEXT NOT NULL,
+    project_text TEXT NOT NULL,
+    embedding_row INTEGER,
+    project_embedding_row INTEGER
+);
+CREATE TABLE IF NOT EXISTS resume_skills (
+    skill TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, skill)
+);
+CREATE INDEX IF NOT EXISTS idx_resume_skills_skill ON resume_skills (skill);
+"""
+
+
+class FeatureStore:
+    """
+    Local store of resume features keyed by candidate ID.
+
+    Args:
+        path (str): Directory holding the store (created if missing)
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._embeddings_path = os.path.join(path, EMBEDDINGS_FILE)
+        self._lock_path = os.path.join(path, LOCK_FILE)
+        self._conn = sqlite3.connect(os.path.join(path, DB_FILE), timeout=30)
+        self._conn.executescript(_SCHEMA)
+        self._matrix = None
+        self._matrix_key = None
+        self._checked_stamp = None
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def close(self):
+        self._matrix = None
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def __contains__(self, candidate_id):
+        row = self._conn.execute(
+            "SELECT 1 FROM resumes WHERE candidate_id = ?", (candidate_id,)
+        ).fetchone()
+        return row is not None
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Serialise writers across processes, so concurrent batch workers
+        never compute the same embedding row offsets.
+        """
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # -----------------------------
+    # Stamp
+    # -----------------------------
+    def _meta(self, key: str):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def stamp(self) -> Dict[str, str]:
+        """The schema version, taxonomy hash and model ID the store was written with."""
+        return {key: self._meta(key) for key in STAMP_KEYS}
+
+    def ensure_stamp(self, taxonomy_hash: str, model_id: str) -> bool:
+        """
+        Make the store usable for features computed with the given taxonomy
+        and embedding model. A store stamped differently (or by an older
+        schema) is emptied and re-stamped, since none of its features can
+        be reused. The check runs once per store object and stamp, so
+        callers can ensure the stamp before every batch of a run.
+
+        Returns:
+            bool: True if the existing contents were kept
+        """
+        expected = {
+            "schema_version": str(SCHEMA_VERSION),
+            "taxonomy_hash": taxonomy_hash,
+            "model_id": model_id,
+        }
+        if expected == self._checked_stamp:
+            return True
+
+        with self._write_lock(), self._conn:
+            kept = self.stamp() == expected
+            if not kept:
+                self._conn.execute("DELETE FROM resume_skills")
+                self._conn.execute("DELETE FROM resumes")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)", list(expected.items())
+                )
+                if os.path.exists(self._embeddings_path):
+                    os.truncate(self._embeddings_path, 0)
+                self._matrix = None
+
+        self._checked_stamp = expected
+        return kept
+
+    # -----------------------------
+    # Embedding matrix
+    # -----------------------------
+    @property
+    def embedding_dim(self):
+        value = self._meta("embedding_dim")
+        return int(value) if value is not None else None
+
+    def _row_count(self, dim: int) -> int:
+        if not os.path.exists(self._embeddings_path):
+            return 0
+        return os.path.getsize(self._embeddings_path) // (dim * 4)
+
+    def _embedding_matrix(self):
+        dim = self.embedding_dim
+        if dim is None:
+            return None
+
+        rows = self._row_count(dim)
+        # compact() swaps in a new file, possibly with the same row count
+        key = (os.stat(self._embeddings_path).st_ino, rows) if rows else None
+        if self._matrix is None or self._matrix_key != key:
+            self._matrix = (
+                np.memmap(self._embeddings_path, dtype=np.float32, mode="r", shape=(rows, dim))
+                if rows else None
+            )
+            self._matrix_key = key
+        return self._matrix
+
+    def _append_embeddings(self, vectors: List[np.ndarray]) -> int:
+        """Append vectors to the matrix file; returns the first new row index."""
+        block = np.vstack(vectors).astype(np.float32)
+        dim = self.embedding_dim
+
+        if dim is None:
+            dim = block.shape[1]
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('embedding_dim', ?)", (str(dim),)
+            )
+        elif block.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension {block.shape[1]} does not match store dimension {dim}"
+            )
+
+        # A writer that died mid-append leaves a partial row behind; drop it
+        # so the new block starts on a row boundary
+        first_row = self._row_count(dim)
+        if os.path.exists(self._embeddings_path):
+            os.truncate(self._embeddings_path, first_row * dim * 4)
+
+        with open(self._embeddings_path, "ab") as f:
+            f.write(block.tobytes())
+        return first_row
+
+    def compact(self) -> int:
+        """
+        Rewrite the matrix file with only the rows still referenced,
+        dropping the vectors of replaced resumes. Run it while no other
+        process reads the store.
+
+        Returns:
+            int: Number of rows removed
+        """
+        with self._write_lock(), self._conn:
+            dim = self.embedding_dim
+            if dim is None:
+                return 0
+
+            references = self._conn.execute(
+                "SELECT candidate_id, embedding_row, project_embedding_row FROM resumes"
+            ).fetchall()
+            old_rows = sorted({
+                row for _, emb_row, proj_row in references
+                for row in (emb_row, proj_row) if row is not None
+            })
+            total = self._row_count(dim)
+            if len(old_rows) == total:
+                return 0
+
+            new_row = {old: new for new, old in enumerate(old_rows)}
+            matrix = self._embedding_matrix()
+            tmp_path = self._embeddings_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                if old_rows:
+                    f.write(np.ascontiguousarray(matrix[old_rows]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._conn.executemany(
+                "UPDATE resumes SET embedding_row = ?, project_embedding_row = ? "
+                "WHERE candidate_id = ?",
+                [
+                    (new_row.get(emb_row), new_row.get(proj_row), candidate_id)
+                    for candidate_id, emb_row, proj_row in references
+                ],
+            )
+            os.replace(tmp_path, self._embeddings_path)
+            self._matrix = None
+
+        return total - len(old_rows)
+
+    # -----------------------------
+    # Bulk insert
+    # -----------------------------
+    def put_many(self, records: Dict[str, dict]):
+        """
+        Insert or replace features for many candidates in one transaction.
+
+        Embeddings already stored for the same candidate and text hash keep
+        their rows; only new vectors are appended to the matrix file.
+
+        Args:
+            records (dict): Candidate ID -> resume features as produced by
+                core_engine.extract_resume_features (embeddings optional)
+        """
+        rows = [
+            {
+                "candidate_id": str(candidate_id),
+                "text_hash": features["text_hash"],
+                "skills": sorted(set(features["skills"])),
+                "experience": features["experience"],
+                "project_text": features.get("project_text", ""),
+                "embedding_row": None,
+                "project_embedding_row": None,
+            }
+            for candidate_id, features in records.items()
+        ]
+
+        with self._write_lock(), self._conn:
+            stored = self._stored_rows([row["candidate_id"] for row in rows])
+            vectors = []
+            new_rows = []  # (row, key) whose vector is appended below
+
+            for row, features in zip(rows, records.values()):
+                for name in ("embedding", "project_embedding"):
+                    if features.get(name) is None:
+                        continue
+                    key = name + "_row"
+                    previous = stored.get(row["candidate_id"])
+                    if (previous and previous["text_hash"] == row["text_hash"]
+                            and previous[key] is not None):
+                        row[key] = previous[key]
+                    else:
+                        new_rows.append((row, key))
+                        vectors.append(np.asarray(features[name], dtype=np.float32))
+
+            if vectors:
+                offset = self._append_embeddings(vectors)
+                for i, (row, key) in enumerate(new_rows):
+                    row[key] = offset + i
+
+            self._conn.executemany(
+                "DELETE FROM resume_skills WHERE candidate_id = ?",
+                [(row["candidate_id"],) for row in rows],
+            )
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO resumes
+                    (candidate_id, text_hash, skills, experience, project_text,
+                     embedding_row, project_embedding_row)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        row["candidate_id"],
+                        row["text_hash"],
+                        json.dumps(row["skills"]),
+                        json.dumps(row["experience"], sort_keys=True),
+                        row["project_text"],
+                        row["embedding_row"],
+                        row["project_embedding_row"],
+                    )
+                    for row in rows
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO resume_skills (skill, candidate_id) VALUES (?, ?)",
+                [(skill, row["candidate_id"]) for row in rows for skill in row["skills"]],
+            )
+
+    def _stored_rows(self, candidate_ids: List[str]) -> Dict[str, dict]:
+        """Candidate ID -> stored text hash and embedding rows."""
+        stored = {}
+        for i in range(0, len(candidate_ids), _SQLITE_MAX_VARIABLES):
+            chunk = candidate_ids[i:i + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            for candidate_id, hash_, emb_row, proj_row in self._conn.execute(
+                "SELECT candidate_id, text_hash, embedding_row, project_embedding_row "
+                f"FROM resumes WHERE candidate_id IN ({placeholders})",
+                tuple(chunk),
+            ):
+                stored[candidate_id] = {
+                    "text_hash": hash_,
+                    "embedding_row": emb_row,
+                    "project_embedding_row": proj_row,
+                }
+        return stored
+
+    def put(self, candidate_id: str, features: dict):
+        self.put_many({candidate_id: features})
+
+    # -----------------------------
+    # Bulk fetch
+    # -----------------------------
+    def _select(self, where: str = "", params: tuple = ()) -> Dict[str, dict]:
+        query = (
+            "SELECT candidate_id, text_hash, skills, experience, project_text, "
+            "embedding_row, project_embedding_row FROM resumes " + where
+        )
+        matrix = self._embedding_matrix()
+        results = {}
+
+        for candidate_id, hash_, skills, experience, project_text, emb_row, proj_row in (
+            self._conn.execute(query, params)
+        ):
+            results[candidate_id] = {
+                "text_hash": hash_,
+                "skills": json.loads(skills),
+                "experience": json.loads(experience),
+                "project_text": project_text,
+                "embedding": None if emb_row is None else np.array(matrix[emb_row]),
+                "project_embedding": None if proj_row is None else np.array(matrix[proj_row]),
+            }
+
+        return results
+
+    def get_many(self, candidate_ids: Iterable[str]) -> Dict[str, dict]:
+        """Fetch features for the given candidates; unknown IDs are omitted."""
+        candidate_ids = [str(c) for c in candidate_ids]
+        results = {}
+
+        for i in range(0, len(candidate_ids), _SQLITE_MAX_VARIABLES):
+            chunk = candidate_ids[i:i + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            results.update(self._select(f"WHERE candidate_id IN ({placeholders})", tuple(chunk)))
+
+        return results
+
+    def get(self, candidate_id: str):
+        return self.get_many([candidate_id]).get(str(candidate_id))
+
+    def load_all(self) -> Dict[str, dict]:
+        """Fetch every stored candidate's features."""
+        return self._select()
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def candidate_ids(self) -> List[str]:
+        return [row[0] for row in self._conn.execute("SELECT candidate_id FROM resumes")]
+
+    def text_hashes(self, candidate_ids: Iterable[str] = None) -> Dict[str, str]:
+        """
+        Candidate ID -> stored text hash, for skipping unchanged resumes.
+        Only the given candidates are looked up (unknown IDs are omitted);
+        every stored candidate when candidate_ids is None.
+        """
+        if candidate_ids is None:
+            return dict(self._conn.execute("SELECT candidate_id, text_hash FROM resumes"))
+
+        candidate_ids = [str(c) for c in candidate_ids]
+        hashes = {}
+
+        for i in range(0, len(candidate_ids), _SQLITE_MAX_VARIABLES):
+            chunk = candidate_ids[i:i + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            hashes.update(self._conn.execute(
+                f"SELECT candidate_id, text_hash FROM resumes WHERE candidate_id IN ({placeholders})",
+                tuple(chunk),
+            ))
+
+        return hashes
+
+    def candidates_with_skill(self, skill: str) -> List[str]:
+        return [
+            row[0] for row in self._conn.execute(
+                "SELECT candidate_id FROM resume_skills WHERE skill = ?", (skill.lower(),)
+            )
+        ]
+
+    def skill_postings(self, candidate_ids: Iterable[str] = None) -> Dict[str, List[str]]:
+        """
+        Skill -> candidate IDs for every stored skill, or only for the
+        skills of the given candidates.
+        """
+        if candidate_ids is None:
+            queries = [("SELECT skill, candidate_id FROM resume_skills ORDER BY skill", ())]
+        else:
+            candidate_ids = [str(c) for c in candidate_ids]
+            queries = []
+            for i in range(0, len(candidate_ids), _SQLITE_MAX_VARIABLES):
+                chunk = candidate_ids[i:i + _SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                queries.append((
+                    "SELECT skill, candidate_id FROM resume_skills "
+                    f"WHERE candidate_id IN ({placeholders}) ORDER BY skill",
+                    tuple(chunk),
+                ))
+
+        postings = {}
+        for query, params in queries:
+            for skill, candidate_id in self._conn.execute(query, params):
+                postings.setdefault(skill, []).append(candidate_id)
+        return postings
@@ -1,118 +1,543 @@
+"""
+Batch Resume Screening CLI
+
+Scores a directory, glob or manifest of resume PDFs against one job
+description and streams one JSON line per resume. Re-running with the same
+output file skips resumes that already have a result, so a crashed backfill
+resumes where it stopped.
+
+Examples:
+    python src/main.py --jd data/job_description.txt --resumes data/resume -o results.jsonl
+    python src/main.py --jd jd.txt --resumes "incoming/**/*.pdf" --mode lexical -o triage.jsonl
+    find /mnt/resumes -name "*.pdf" | python src/main.py --jd jd.txt --manifest - -o out.jsonl
+    python src/main.py --jd jd.txt --resumes data/resume --workers 4 --max-rss-mb 1500 -o out.jsonl
+    python src/main.py --jd jd.txt --resumes data/resume --cascade-cutoff 50 --top-k 20 -o out.jsonl
+    python src/main.py --jd jd.txt --resumes data/resume --must-have "python AND (aws OR gcp)" -o out.jsonl
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import sys
+import time
+
 from parser import extract_text_from_pdf
-from matcher import (
-    calculate_dynamic_match,
-    extract_project_section,
-    calculate_project_relevance,
-    extract_experience_requirements,
-    extract_candidate_experience,
-    apply_experience_penalty,
-    calculate_resume_similarity
-)
-from skill_extracter import (
-    load_skills,
-    build_matcher,
-    extract_skills_hybrid,
+from core_engine import (
+    MODES,
+    text_hash,
+    load_taxonomy,
+    extract_jd_features,
+    extract_pool_features,
+    score_pool,
+    embed_features,
+    embedding_state,
+    persist_embeddings,
 )
+from cascade import TIERS, DEFAULT_CEILINGS, cascade_rank
+from scoring import DEFAULT_PROFILE, load_profile
+from skill_index import parse_query
+from skill_extracter import configure_phrase_cache, get_phrase_cache
+from workers import WorkerPool, preload_models, cap_torch_threads
 
-# File paths
-JD_FILE = "data/job_description.txt"
 SKILLS_FILE = "data/skills.txt"
-RESUME_FILE = "data/resume/resume_aakash.pdf"
 
+# Inputs shared with forked workers; set in the parent before the pool starts
+_WORKER_CONTEXT = {}
+
+
+# -----------------------------
+# Inputs
+# -----------------------------
+def collect_resume_paths(patterns: list, manifest=None) -> list:
+    """
+    Expand directories (searched recursively for PDFs), globs and plain paths,
+    plus newline-delimited manifest entries, into a de-duplicated list.
+    """
+    paths = []
+
+    for pattern in patterns or []:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "**", "*.pdf"), recursive=True)
+        else:
+            matches = glob.glob(pattern, recursive=True) or [pattern]
+        paths.extend(sorted(matches))
+
+    if manifest is not None:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(line)
+
+    return list(dict.fromkeys(paths))
+
+
+def run_config_hash(args, profile) -> str:
+    """
+    Hash of every option that changes a result record: mode, scoring
+    profile, skills file, must-have query and cascade options.
+    """
+    with open(args.skills, "r", encoding="utf-8") as f:
+        skills_hash = text_hash(f.read())
+
+    return text_hash(json.dumps({
+        "mode": args.mode,
+        "profile": profile.to_dict(),
+        "skills": skills_hash,
+        "must_have": args.must_have,
+        "cascade": cascade_options(args),
+    }, sort_keys=True))
+
+
+def load_completed(output_path: str, jd_hash: str, config_hash: str = None) -> set:
+    """
+    Resumes that already have a successful result in the output file.
+
+    Failed resumes are retried. A truncated last line (from a crash mid-write)
+    is ignored. Refuses to resume a file produced for a different JD or
+    with a different run configuration (see run_config_hash).
+    """
+    completed = set()
+    if not output_path or output_path == "-" or not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            if record.get("jd_hash") not in (None, jd_hash):
+                raise SystemExit(
+                    f"{output_path} holds results for a different job description; "
+                    "use a new output file or --overwrite"
+                )
+            if record.get("config_hash") not in (None, config_hash):
+                raise SystemExit(
+                    f"{output_path} holds results scored with different options (mode, "
+                    "profile, skills, --must-have or cascade); use a new output file or "
+                    "--overwrite"
+                )
+            if "error" not in record:
+                completed.add(record["resume"])
+
+    return completed
+
+
+def open_output(output_path: str, overwrite: bool):
+    if not output_path or output_path == "-":
+        return sys.stdout
+
+    if overwrite or not os.path.exists(output_path):
+        return open(output_path, "w", encoding="utf-8")
+
+    # Terminate a line cut short by a crash before appending
+    needs_newline = False
+    if os.path.getsize(output_path) > 0:
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    out = open(output_path, "a", encoding="utf-8")
+    if needs_newline:
+        out.write("\n")
+    return out
+
+
+# -----------------------------
+# Processing
+# -----------------------------
+def score_batch(paths: list, jd_features: dict, nlp_matcher, skills_list: list,
+                profile, mode: str, store=None, cascade: dict = None,
+                must_have: str = None) -> list:
+    """
+    Run one batch through the shared pipeline.
+
+    Args:
+        cascade (dict): cascade_rank options (cutoff, top_k, ceilings). When given,
+            only candidates that can still make the cut are embedded, and
+            the rest get their exit record instead of a full result.
+        must_have (str): Boolean skill query; resumes not satisfying it
+            get a "filtered" record and are never embedded
+
+    Returns:
+        list: (path, record) pairs in input order; unreadable resumes get
+        an "error" record instead of failing the batch
+    """
+    records = {}
+    texts = {}
+
+    for path in paths:
+        try:
+            texts[path] = extract_text_from_pdf(path)
+        except Exception as e:
+            records[path] = {"error": f"{type(e).__name__}: {e}"}
+
+    if not texts:
+        return [(path, records[path]) for path in paths]
+
+    pool = extract_pool_features(texts, nlp_matcher, skills_list, store=store, mode=mode,
+                                 embed=cascade is None, must_have=must_have)
+    for path in texts:
+        if path not in pool:
+            records[path] = {"filtered": "must-have"}
 
-def load_job_description():
-    with open(JD_FILE, "r", encoding="utf-8") as f:
-        return f.read()
+    if cascade is None:
+        for path, result in score_pool(jd_features, pool, profile):
+            records[path] = result
+    else:
+        before = embedding_state(pool)
+        ranking = cascade_rank(jd_features, pool, profile, **cascade)
+        persist_embeddings(pool, before, store)
 
+        for path, result in ranking["ranked"]:
+            records[path] = result
+        records.update(ranking["exited"])
 
-def main():
+    return [(path, records[path]) for path in paths]
 
-    # ----------------------------
-    # Load JD
-    # ----------------------------
-    jd_text = load_job_description()
 
-    skills_list = load_skills(SKILLS_FILE)
-    nlp_matcher = build_matcher(skills_list)
+def _score_batch_in_worker(paths: list) -> list:
+    """Worker-side score_batch; the feature store is opened once per worker."""
+    context = _WORKER_CONTEXT
+    if context["store_path"] and context.get("store") is None:
+        from feature_store import FeatureStore
+        context["store"] = FeatureStore(context["store_path"])
 
-    jd_skills = extract_skills_hybrid(jd_text, nlp_matcher, skills_list)
+    return score_batch(paths, context["jd_features"], context["nlp_matcher"],
+                       context["skills_list"], context["profile"], context["mode"],
+                       context.get("store"), context["cascade"], context["must_have"])
 
-    print("\n=== Extracted Skills from Job Description ===\n")
-    for skill in sorted(jd_skills):
-        print(skill)
 
-    # ----------------------------
-    # Load Resume
-    # ----------------------------
-    resume_text = extract_text_from_pdf(RESUME_FILE)
+def cascade_options(args):
+    """cascade_rank options from --cascade-cutoff/--top-k, or None to score every resume in full."""
+    if args.cascade_cutoff is None and args.top_k is None:
+        return None
+    ceilings = DEFAULT_CEILINGS[args.mode]
+    return {
+        "cutoff": 0 if args.cascade_cutoff is None else args.cascade_cutoff,
+        "top_k": args.top_k,
+        "project_ceiling": (ceilings["project_ceiling"] if args.project_ceiling is None
+                            else args.project_ceiling),
+        "semantic_ceiling": (ceilings["semantic_ceiling"] if args.semantic_ceiling is None
+                             else args.semantic_ceiling),
+    }
 
-    resume_skills = extract_skills_hybrid(resume_text, nlp_matcher, skills_list)
 
-    print("\n=== Extracted Resume Skills ===\n")
-    for skill in sorted(resume_skills):
-        print(skill)
+def _over_ceiling(cascade: dict, record: dict) -> bool:
+    """True for a fully scored record whose similarity beat a cascade ceiling."""
+    return (record.get("project_score", 0) > cascade["project_ceiling"]
+            or record.get("semantic_score", 0) > cascade["semantic_ceiling"])
 
-    # ----------------------------
-    # Skill Match
-    # ----------------------------
-    result = calculate_dynamic_match(jd_text, jd_skills, resume_skills)
 
-    print("\n=== MATCH RESULTS ===")
-    print(f"Skill Match Percentage: {result['match_percentage']}%")
+def _raise_floor(cascade: dict, top_scores: list) -> dict:
+    """Carry the run's K-th best score into the next batch's cutoff."""
+    if not cascade or not cascade["top_k"] or len(top_scores) < cascade["top_k"]:
+        return cascade
+    return dict(cascade, cutoff=max(cascade["cutoff"], top_scores[0]))
 
-    print("\nMatched Skills:")
-    for s in sorted(result["matched_skills"]):
-        print(s)
 
-    print("\nMissing Skills:")
-    for s in sorted(result["missing_skills"]):
-        print(s)
+def _track_top_scores(top_scores: list, results: list, top_k: int):
+    for _, record in results:
+        if "final_score" not in record:
+            continue
+        if len(top_scores) < top_k:
+            heapq.heappush(top_scores, record["final_score"])
+        elif record["final_score"] > top_scores[0]:
+            heapq.heapreplace(top_scores, record["final_score"])
 
-    # ----------------------------
-    # Project Relevance
-    # ----------------------------
-    project_text = extract_project_section(resume_text)
-    project_score = calculate_project_relevance(jd_text, project_text)
 
-    print("\nProject Relevance Score:", project_score, "%")
+def _phrase_cache_stats() -> dict:
+    return {"phrase_cache": get_phrase_cache().stats()}
 
-    # ----------------------------
-    # Experience Analysis
-    # ----------------------------
-    jd_experience = extract_experience_requirements(jd_text, set(jd_skills))
-    candidate_experience = extract_candidate_experience(resume_text, set(resume_skills))
-    
-    # Apply experience penalty to skill score (modifier, not separate component)
-    adjusted_skill_score = apply_experience_penalty(
-        result["match_percentage"],
-        jd_experience,
-        candidate_experience
+
+def iter_batches(batches: list, args, jd_features: dict, nlp_matcher, skills_list: list,
+                 profile, summary: dict):
+    """
+    Yield (batch, results) for every batch, in-process or across workers.
+
+    With --workers > 1 the models are loaded once here and shared with
+    forked workers; per-worker stats are added to the summary. In-process,
+    a --top-k cascade carries the run's K-th best score across batches;
+    workers only see their own batch's.
+    """
+    cascade = cascade_options(args)
+
+    if args.workers <= 1:
+        cap_torch_threads(args.torch_threads)
+        store = None
+        if args.store:
+            from feature_store import FeatureStore
+            store = FeatureStore(args.store)
+        top_scores = []  # min-heap of the run's best top_k final scores
+        try:
+            for batch in batches:
+                results = score_batch(batch, jd_features, nlp_matcher, skills_list, profile,
+                                      args.mode, store, _raise_floor(cascade, top_scores),
+                                      args.must_have)
+                if cascade and cascade["top_k"]:
+                    _track_top_scores(top_scores, results, cascade["top_k"])
+                yield batch, results
+        finally:
+            if store is not None:
+                store.close()
+            summary.update(_phrase_cache_stats())
+        return
+
+    preload_models(args.mode)
+    if args.mode == "full":
+        # Encode the JD once here instead of once per forked worker
+        embed_features(jd_features)
+    _WORKER_CONTEXT.update(
+        jd_features=jd_features,
+        nlp_matcher=nlp_matcher,
+        skills_list=skills_list,
+        profile=profile,
+        mode=args.mode,
+        store_path=args.store,
+        store=None,
+        cascade=cascade,
+        must_have=args.must_have,
+    )
+
+    pool = WorkerPool(
+        _score_batch_in_worker,
+        workers=args.workers,
+        max_docs=args.max_docs_per_worker,
+        max_rss_mb=args.max_rss_mb,
+        torch_threads=args.torch_threads,
+        stats_fn=_phrase_cache_stats,
+    )
+    try:
+        for batch, results, error in pool.map_unordered(batches):
+            if error is not None:
+                results = [(path, {"error": error}) for path in batch]
+            yield batch, results
+    finally:
+        summary["parent_rss_mb"] = pool.parent_rss_mb
+        summary["workers"] = pool.worker_stats
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def report_progress(done: int, total: int, failed: int, started: float):
+    elapsed = max(time.time() - started, 1e-9)
+    rate = done / elapsed
+    eta = (total - done) / rate if rate else 0
+    print(
+        f"\r[{done}/{total}] {rate:.1f} resumes/s, {failed} failed, ETA {_format_duration(eta)}",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def run(args) -> dict:
+    with open(args.jd, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+    jd_hash = text_hash(jd_text)
+
+    profile = load_profile(args.profile) if args.profile else DEFAULT_PROFILE
+
+    if args.manifest and args.manifest != "-":
+        with open(args.manifest, "r", encoding="utf-8") as manifest:
+            paths = collect_resume_paths(args.resumes, manifest)
+    else:
+        paths = collect_resume_paths(args.resumes, sys.stdin if args.manifest == "-" else None)
+
+    config_hash = run_config_hash(args, profile)
+    completed = set() if args.overwrite else load_completed(args.output, jd_hash, config_hash)
+    pending = [path for path in paths if path not in completed]
+
+    print(
+        f"{len(paths)} resumes, {len(paths) - len(pending)} already done, "
+        f"{len(pending)} to process ({args.mode} mode, {profile.name} profile)",
+        file=sys.stderr,
     )
-    
-    print("\nExperience-Adjusted Skill Score:", adjusted_skill_score, "%")
-
-    # ----------------------------
-    # Final Combined Score
-    # ----------------------------
-    resume_similarity_score = calculate_resume_similarity(jd_text, resume_text)
-
-    print("\nFull Resume Semantic Similarity:", resume_similarity_score, "%")
-    
-    # Experience is already applied to skill score, so final combines:
-    # - Adjusted skill score (skill match with experience penalty applied)
-    # - Project relevance score
-    # - Resume semantic similarity
-    final_score = (
-        0.6 * adjusted_skill_score +
-        0.2 * project_score +
-        0.2 * resume_similarity_score
+
+    summary = {"total": len(paths), "skipped": len(paths) - len(pending), "scored": 0,
+               "exited": 0, "filtered": 0, "failed": 0}
+    cascade = cascade_options(args)
+    if cascade is not None:
+        summary["tier_counts"] = {tier: 0 for tier in TIERS}
+        summary["tier_counts"]["over_ceiling"] = 0
+    if not pending:
+        return summary
+
+    configure_phrase_cache(args.phrase_cache)
+    skills_list, nlp_matcher = load_taxonomy(args.skills, args.mode)
+    jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, args.mode)
+
+    out = open_output(args.output, args.overwrite)
+    started = time.time()
+    done = 0
+
+    batches = [pending[i:i + args.batch_size] for i in range(0, len(pending), args.batch_size)]
+
+    try:
+        for batch, results in iter_batches(batches, args, jd_features, nlp_matcher,
+                                           skills_list, profile, summary):
+            for path, record in results:
+                out.write(json.dumps({"resume": path, "jd_hash": jd_hash,
+                                      "config_hash": config_hash, **record}) + "\n")
+                if "error" in record:
+                    summary["failed"] += 1
+                elif "filtered" in record:
+                    summary["filtered"] += 1
+                elif "exit_tier" in record:
+                    summary["exited"] += 1
+                    summary["tier_counts"][record["exit_tier"]] += 1
+                else:
+                    summary["scored"] += 1
+                    if "tier_counts" in summary:
+                        summary["tier_counts"]["semantic"] += 1
+                        if _over_ceiling(cascade, record):
+                            summary["tier_counts"]["over_ceiling"] += 1
+
+            # Make every finished batch durable before starting the next one
+            out.flush()
+            if out is not sys.stdout:
+                os.fsync(out.fileno())
+
+            done += len(batch)
+            if not args.quiet:
+                report_progress(done, len(pending), summary["failed"], started)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score resume PDFs against a job description (JSON lines output).",
     )
+    parser.add_argument("--jd", required=True, help="Job description text file")
+    parser.add_argument("--resumes", nargs="*", default=[],
+                        help="Resume PDFs, directories or glob patterns")
+    parser.add_argument("--manifest",
+                        help="File with one resume path per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSON lines output file (default: stdout, not resumable)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Start over instead of resuming an existing output file")
+    parser.add_argument("--skills", default=SKILLS_FILE, help="Skills list file")
+    parser.add_argument("--mode", choices=MODES, default="full", help="Engine mode")
+    parser.add_argument("--profile", help="Scoring profile JSON file")
+    parser.add_argument("--store", help="Feature store directory to reuse/persist features")
+    parser.add_argument("--phrase-cache",
+                        help="SQLite file caching candidate-phrase embeddings across runs")
+    parser.add_argument("--must-have",
+                        help='Boolean skill query resumes must satisfy, e.g. "python AND '
+                             '(aws OR gcp)"; others are filtered out before embedding')
+    parser.add_argument("--cascade-cutoff", type=float,
+                        help="Score in cascade tiers and stop early on resumes whose best "
+                             "reachable score is below this (exit records instead of full "
+                             "results; 50 = moderate match)")
+    parser.add_argument("--project-ceiling", type=float,
+                        help="Highest project similarity (0-100) the cascade assumes before "
+                             "computing it (default: calibrated per mode; 100 = never drop a "
+                             "resume that could pass, but rarely exit early)")
+    parser.add_argument("--semantic-ceiling", type=float,
+                        help="Highest resume similarity (0-100) the cascade assumes before "
+                             "computing it (default: calibrated per mode)")
+    parser.add_argument("--top-k", type=int,
+                        help="With the cascade, also stop early on resumes that cannot beat "
+                             "the K-th best score seen so far")
+    parser.add_argument("--batch-size", type=int, default=32,
+                        help="Resumes per pipeline batch and per durable write "
+                             "(scores do not depend on it)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes sharing the parent's models via fork "
+                             "(default: 1, score in-process)")
+    parser.add_argument("--max-docs-per-worker", type=int, default=0,
+                        help="Recycle a worker after this many resumes (0 = never)")
+    parser.add_argument("--max-rss-mb", type=float, default=0,
+                        help="Recycle a worker once its RSS exceeds this many MB (0 = no limit)")
+    parser.add_argument("--torch-threads", type=int,
+                        help="Torch threads per worker (default: CPU count / workers)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No progress output")
+
+    args = parser.parse_args(argv)
+    if not args.resumes and not args.manifest:
+        parser.error("provide --resumes and/or --manifest")
+    if args.store and args.mode != "full":
+        parser.error("--store holds full-mode features only")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    for option in ("project_ceiling", "semantic_ceiling"):
+        value = getattr(args, option)
+        if value is not None and not 0 <= value <= 100:
+            parser.error(f"--{option.replace('_', '-')} must be between 0 and 100")
+    if args.must_have:
+        try:
+            parse_query(args.must_have)
+        except ValueError as e:
+            parser.error(f"--must-have: {e}")
+    if args.torch_threads is None:
+        args.torch_threads = max(1, (os.cpu_count() or 1) // args.workers)
+    return args
 
-    print("\n=== FINAL SCORE ===")
-    print("Overall Candidate Score:", round(final_score, 2), "%")
-    print("Overall Candidate Score:", round(final_score, 2), "%")
 
+def main(argv=None):
+    args = parse_args(argv)
+    summary = run(args)
+    print(
+        f"Scored {summary['scored']}, "
+        + (f"exited early {summary['exited']}, " if "tier_counts" in summary else "")
+        + (f"filtered {summary['filtered']}, " if args.must_have else "")
+        + f"failed {summary['failed']}, skipped {summary['skipped']} of {summary['total']} resumes",
+        file=sys.stderr,
+    )
+    if "tier_counts" in summary:
+        counts = summary["tier_counts"]
+        print(
+            f"Cascade: {counts['skill']} exited at skill tier, {counts['project']} at project "
+            f"tier, {counts['semantic']} fully scored",
+            file=sys.stderr,
+        )
+        if counts["over_ceiling"]:
+            print(
+                f"Cascade: {counts['over_ceiling']} fully scored resumes beat a similarity "
+                f"ceiling; raise --project-ceiling/--semantic-ceiling if early exits look wrong",
+                file=sys.stderr,
+            )
+    if args.mode == "full":
+        cache_stats = [summary.get("phrase_cache")] + [
+            stats.get("phrase_cache") for stats in summary.get("workers", [])
+        ]
+        cache_stats = [stats for stats in cache_stats if stats]
+        lookups = sum(stats["lookups"] for stats in cache_stats)
+        if lookups:
+            hits = sum(stats["memory_hits"] + stats["disk_hits"] for stats in cache_stats)
+            print(
+                f"Phrase embedding cache: {hits}/{lookups} hits ({hits / lookups:.1%}), "
+                f"{lookups - hits} phrases encoded",
+                file=sys.stderr,
+            )
+    if "workers" in summary:
+        print(f"Parent RSS before fork: {summary['parent_rss_mb']} MB", file=sys.stderr)
+        for stats in summary["workers"]:
+            peak = "n/a" if stats["peak_rss_mb"] is None else f"{stats['peak_rss_mb']} MB"
+            docs = "?" if stats["docs"] is None else stats["docs"]
+            print(
+                f"  worker {stats['worker']} (pid {stats['pid']}): {docs} resumes, "
+                f"peak RSS {peak}, {stats['reason']}",
+                file=sys.stderr,
+            )
+    return 1 if summary["failed"] else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
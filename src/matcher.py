@@ -1,6 +1,12 @@
 from collections import Counter
+from functools import lru_cache
+from itertools import chain
 import re
 
+import numpy as np
+
+from sections import segment_sections, section_text
+
 CORE_TECH = {
     "python", "java", "c", "c++", "r",
     "machine learning", "deep learning",
@@ -26,20 +32,30 @@ TOOLS = {
 }
 
 
-def get_weight(skill: str):
+DEFAULT_TIER_WEIGHTS = {
+    "core_tech": 3,
+    "frameworks": 2,
+    "tools": 1,
+    "default": 1,
+}
+
+
+def get_weight(skill: str, tier_weights: dict = None):
+
+    weights = tier_weights or DEFAULT_TIER_WEIGHTS
 
     if skill in CORE_TECH:
-        return 3
+        return weights["core_tech"]
     elif skill in FRAMEWORKS:
-        return 2
+        return weights["frameworks"]
     elif skill in TOOLS:
-        return 1
+        return weights["tools"]
     else:
-        return 1  # default fallback
+        return weights["default"]  # default fallback
 
 
-def frequency_boost(count):
-    return 1 + (0.2 * (count - 1))
+def frequency_boost(count, step: float = 0.2):
+    return 1 + (step * (count - 1))
 
 
 
@@ -58,40 +74,72 @@ def calculate_jd_frequency(jd_text: str, jd_skills: set):
 
     return freq
 
-def extract_experience_requirements(text: str, jd_skills: set):
-    """Extract experience requirements for skills from JD text"""
-    text = text.lower()
-    requirements = {}
+# "3 years", "5+ yrs", ... The skill must follow on the same line.
+YEARS_PATTERN = re.compile(r'(\d+)\+?\s*(?:years|yrs)')
 
-    for skill in jd_skills:
-        # Pattern like: 3+ years of python
-        pattern = rf'(\d+)\+?\s*(?:years|yrs).*?\b{re.escape(skill)}\b'
-        match = re.search(pattern, text)
+# YEARS_PATTERN on the reversed text: it starts with a literal, so the scan
+# skips ahead instead of trying \d+ at every position of the document.
+# A match's digits run right up to its unit, so both directions find the
+# same mentions.
+_REVERSED_YEARS_PATTERN = re.compile(r'(?:sraey|sry)\s*\+?(\d+)')
 
-        if match:
-            years = int(match.group(1))
-            requirements[skill] = years
 
-    return requirements
+@lru_cache(maxsize=None)
+def _skill_pattern(skill: str):
+    return re.compile(rf'\b{re.escape(skill)}\b')
 
-def extract_candidate_experience(text: str, resume_skills: set):
-    """Extract experience for skills from resume text"""
+
+def _extract_skill_years(text: str, skills) -> dict:
+    r"""
+    Map each skill to the years of the first "N years ... skill" mention.
+
+    Equivalent to searching rf'(\d+)\+?\s*(?:years|yrs).*?\b{skill}\b' per
+    skill, but scans the year mentions once per document instead of once
+    per skill.
+    """
     text = text.lower()
-    experience = {}
 
-    for skill in resume_skills:
-        pattern = rf'(\d+)\+?\s*(?:years|yrs).*?\b{re.escape(skill)}\b'
-        match = re.search(pattern, text)
+    mentions = []
+    reversed_text = text[::-1]
+    for match in _REVERSED_YEARS_PATTERN.finditer(reversed_text):
+        end = len(text) - match.start()
+        line_end = text.find("\n", end)
+        mentions.append((
+            int(match.group(1)[::-1]),
+            end,
+            len(text) if line_end == -1 else line_end,
+        ))
+    mentions.reverse()
+
+    years_by_skill = {}
+    if not mentions:
+        return years_by_skill
 
-        if match:
-            years = int(match.group(1))
-            experience[skill] = years
+    for skill in skills:
+        pattern = _skill_pattern(skill)
+        for years, start, end in mentions:
+            if pattern.search(text, start, end):
+                years_by_skill[skill] = years
+                break
+
+    return years_by_skill
+
+
+def extract_experience_requirements(text: str, jd_skills: set):
+    """Extract experience requirements for skills from JD text"""
+    # Pattern like: 3+ years of python
+    return _extract_skill_years(text, jd_skills)
+
+
+def extract_candidate_experience(text: str, resume_skills: set):
+    """Extract experience for skills from resume text"""
+    return _extract_skill_years(text, resume_skills)
 
-    return experience
 
 def apply_experience_penalty(match_percentage,
                              jd_requirements,
-                             candidate_experience):
+                             candidate_experience,
+                             penalty_per_gap: float = 5):
     """Apply penalty to match percentage based on experience gaps"""
     penalty = 0
 
@@ -99,13 +147,16 @@ def apply_experience_penalty(match_percentage,
         candidate_years = candidate_experience.get(skill, 0)
 
         if candidate_years < required_years:
-            penalty += 5  # deduct 5% per unmet requirement
+            penalty += penalty_per_gap  # deduct per unmet requirement
 
     adjusted_score = max(match_percentage - penalty, 0)
 
     return adjusted_score
 
-def calculate_dynamic_match(jd_text: str, jd_skills, resume_skills):
+def calculate_dynamic_match(jd_text: str, jd_skills, resume_skills,
+                            jd_frequency: dict = None,
+                            tier_weights: dict = None,
+                            boost_step: float = 0.2):
     # Convert to sets if they're lists
     jd_skills_set = set(jd_skills) if isinstance(jd_skills, list) else jd_skills
     resume_skills_set = set(resume_skills) if isinstance(resume_skills, list) else resume_skills
@@ -113,15 +164,19 @@ def calculate_dynamic_match(jd_text: str, jd_skills, resume_skills):
     matched = jd_skills_set.intersection(resume_skills_set)
     missing = jd_skills_set.difference(resume_skills_set)
 
-    freq_dict = calculate_jd_frequency(jd_text, jd_skills_set)
+    # Reuse precomputed JD frequencies when re-scoring cached features
+    if jd_frequency is None:
+        freq_dict = calculate_jd_frequency(jd_text, jd_skills_set)
+    else:
+        freq_dict = jd_frequency
 
     total_weight = 0
     matched_weight = 0
 
     for skill in jd_skills_set:
 
-        base_weight = get_weight(skill)
-        boost = frequency_boost(freq_dict[skill])
+        base_weight = get_weight(skill, tier_weights)
+        boost = frequency_boost(freq_dict[skill], boost_step)
 
         final_weight = base_weight * boost
         total_weight += final_weight
@@ -138,39 +193,169 @@ def calculate_dynamic_match(jd_text: str, jd_skills, resume_skills):
     }
 
 
-def extract_project_section(resume_text: str):
-    resume_text = resume_text.lower()
+def extract_project_section(resume_text: str, sections: dict = None):
+    """
+    The resume's projects section(s), located by heading rather than by the
+    first mention of "projects"; pass precomputed segment_sections output
+    to avoid re-segmenting.
+    """
+    if sections is None:
+        sections = segment_sections(resume_text)
+    return section_text(resume_text, sections, ("projects",))
 
-    start_keywords = ["projects"]
-    end_keywords = ["experience", "education", "skills", "honors"]
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
-    start_index = -1
-    for keyword in start_keywords:
-        if keyword in resume_text:
-            start_index = resume_text.find(keyword)
-            break
+# Loaded on first use so that re-scoring cached features never pulls in the encoder
+model = None
 
-    if start_index == -1:
-        return ""
 
-    end_index = len(resume_text)
+def get_model():
+    global model
 
-    for keyword in end_keywords:
-        idx = resume_text.find(keyword, start_index + 8)
-        if idx != -1:
-            end_index = min(end_index, idx)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(MODEL_NAME)
 
-    return resume_text[start_index:end_index]
+    return model
 
-from sentence_transformers import SentenceTransformer, util
 
-model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+def encode_texts(texts):
+    """Encode texts into unit-length float32 vectors (one row per text)."""
+    embeddings = get_model().encode(
+        list(texts),
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def embedding_similarity(embedding_a, embedding_b):
+    """
+    Cosine similarity of two unit-length embeddings on the 0-100 scale.
+
+    Computed in float64 (float32 products are exact there), so the result
+    does not depend on how a BLAS routine orders a float32 sum; matrix
+    scoring rounds the same values.
+    """
+    score = float(np.dot(np.asarray(embedding_a, dtype=np.float64),
+                         np.asarray(embedding_b, dtype=np.float64)))
+    return round(score * 100, 2)
+
+
+# Stateless term hashing: a text's vector never depends on the other texts
+# scored with it, so single, batched and pooled scoring agree exactly
+LEXICAL_FEATURES = 2 ** 20
+
+# scikit-learn's default token pattern; terms never span whitespace, so the
+# hashed columns of each whitespace-delimited chunk are cached by its text
+_LEXICAL_TERM = re.compile(r"(?u)\b\w\w+\b")
+
+
+class _ChunkColumns(dict):
+    """Whitespace-delimited chunk -> hashed columns of its non-stop-word terms."""
+
+    def __init__(self, max_chunks: int = 500000):
+        super().__init__()
+        self.max_chunks = max_chunks
+
+    def __missing__(self, chunk: str) -> tuple:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        from sklearn.utils import murmurhash3_32
+
+        columns = tuple(
+            abs(murmurhash3_32(term, seed=0)) % LEXICAL_FEATURES
+            for term in _LEXICAL_TERM.findall(chunk)
+            if term not in ENGLISH_STOP_WORDS
+        )
+        if len(self) >= self.max_chunks:
+            self.clear()
+        self[chunk] = columns
+        return columns
+
+
+_lexical_columns = _ChunkColumns()
+
+
+def lexical_vectors(texts):
+    """
+    Unit-length sparse term vectors (one row per text) for lexical similarity.
+
+    Terms are hashed, English stop words dropped and term counts damped to
+    1 + log(tf) (as TF-IDF's sublinear_tf). There is no IDF: document
+    frequencies would have to come from whichever texts share the call.
+    Empty texts get a zero row. The rows equal those of scikit-learn's
+    HashingVectorizer(n_features=LEXICAL_FEATURES, stop_words="english",
+    alternate_sign=False, norm=None) with the same damping and L2 norm.
+    """
+    from scipy.sparse import csr_matrix
+    from sklearn.preprocessing import normalize
+
+    columns = []
+    ends = []
+    for text in texts:
+        columns.extend(chain.from_iterable(
+            map(_lexical_columns.__getitem__, text.lower().split())
+        ))
+        ends.append(len(columns))
+
+    if not ends:
+        return csr_matrix((0, LEXICAL_FEATURES))
+
+    # Count (row, column) pairs for the whole batch at once; sorting the
+    # combined keys also leaves each row's columns in order
+    rows = np.repeat(np.arange(len(ends), dtype=np.int64), np.diff(ends, prepend=0))
+    keys = rows * LEXICAL_FEATURES + np.asarray(columns, dtype=np.int64)
+    keys.sort()
+    firsts = np.flatnonzero(np.diff(keys, prepend=-1))
+    counts = np.diff(firsts, append=len(keys))
+    keys = keys[firsts]
+
+    matrix = csr_matrix(
+        (
+            1 + np.log(counts.astype(np.float64)),
+            (keys % LEXICAL_FEATURES).astype(np.int32),
+            np.searchsorted(keys, np.arange(len(ends) + 1) * LEXICAL_FEATURES),
+        ),
+        shape=(len(ends), LEXICAL_FEATURES),
+    )
+    return normalize(matrix)
+
+
+def lexical_scores(jd_vector, rows):
+    """Cosine similarities of lexical_vectors rows against one JD row (0-100 scale)."""
+    scores = np.asarray((rows @ jd_vector.T).todense()).ravel()
+    return [round(float(score) * 100, 2) for score in scores]
+
+
+def calculate_lexical_similarities(jd_text: str, resume_texts, project_texts=None):
+    """
+    Cheap lexical stand-in for the embedding similarities.
+
+    Scores every resume (and optionally every project section) against the
+    JD by cosine similarity of lexical_vectors on the 0-100 scale. Each
+    score depends only on the JD and that one text.
+
+    Returns:
+        tuple: (resume_scores, project_scores) as lists; project_scores is
+        None when project_texts is not given
+    """
+    jd_vector = lexical_vectors([jd_text])
+    resume_scores = lexical_scores(jd_vector, lexical_vectors(resume_texts))
+
+    project_scores = None
+    if project_texts is not None:
+        project_scores = lexical_scores(jd_vector, lexical_vectors(project_texts))
+
+    return resume_scores, project_scores
+
 
 def calculate_project_relevance(jd_text: str, project_text: str):
+    from sentence_transformers import util
 
     if not project_text.strip():
         return 0
 
+    model = get_model()
     jd_embedding = model.encode(jd_text, convert_to_tensor=True)
     project_embedding = model.encode(project_text, convert_to_tensor=True)
 
@@ -184,26 +369,32 @@ def calculate_project_relevance(jd_text: str, project_text: str):
 
     return relevance_percentage
 
-def calculate_final_score(skill_score, project_score, experience_adjusted_score):
+def calculate_final_score(experience_adjusted_score, project_score, semantic_score,
+                          weights: tuple = (0.5, 0.2, 0.3)):
     """
     Calculate final composite score from multiple scoring components.
     
-    Weights:
-    - 60% skill match score
+    Weights (skill, project, semantic) default to the engine's standard split:
+    - 50% experience-adjusted skill score
     - 20% project relevance score
-    - 20% experience-adjusted score
+    - 30% full resume semantic similarity
     """
+    skill_weight, project_weight, semantic_weight = weights
+
     final_score = (
-        0.6 * skill_score +
-        0.2 * project_score +
-        0.2 * experience_adjusted_score
+        skill_weight * experience_adjusted_score +
+        project_weight * project_score +
+        semantic_weight * semantic_score
     )
     
-    return round(final_score, 2)
+    # Ensure score is between 0-100
+    return min(100, max(0, round(final_score, 2)))
 
 
 def calculate_resume_similarity(jd_text: str, resume_text: str):
+    from sentence_transformers import util
 
+    model = get_model()
     jd_embedding = model.encode(jd_text, convert_to_tensor=True)
     resume_embedding = model.encode(resume_text, convert_to_tensor=True)
 
@@ -0,0 +1,424 @@
+"""
+Multi-JD Matrix Scoring
+
+Scores many job descriptions against many resumes in one pass, for routing
+applicants to their best-fitting roles. Every JD and resume is extracted
+once; the score components are then computed for all J x R pairs at once:
+
+    skill       - JD skill weights (J x S) @ resume skill indicators (S x R)
+    experience  - unmet year requirements counted by broadcasting the
+                  JD requirements (J x E) against candidate years (R x E)
+    similarity  - JD embeddings (J x d) @ resume embeddings (d x R), for
+                  the full resume and the project section
+
+Scores follow score_features exactly (same weights, penalties and rounding
+to 0.01), up to float summation order.
+
+Example:
+    python src/matrix_scoring.py --jds roles/ --resumes incoming/ --top-n 3 -o routing.jsonl
+    python src/matrix_scoring.py --jds roles/ --resumes incoming/ --must-have "python OR java"
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+
+from core_engine import (
+    MODES,
+    LEXICAL_APPROXIMATIONS,
+    load_taxonomy,
+    extract_jd_pool,
+    extract_pool_features,
+    embed_many,
+)
+from matcher import get_weight, frequency_boost, lexical_vectors, lexical_scores
+from parser import extract_text_from_pdf
+from scoring import ScoringProfile, DEFAULT_PROFILE, load_profile
+from skill_index import parse_query
+
+SKILLS_FILE = "data/skills.txt"
+
+COMPONENTS = (
+    "skill_score",
+    "experience_adjusted_score",
+    "project_score",
+    "semantic_score",
+)
+
+
+_python_round = np.frompyfunc(round, 2, 1)
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 0.01 exactly like Python's round(x, 2), which the per-pair
+    scorers use. np.round scales by 100 first and can land on the other
+    side of a half, so those few entries are re-rounded in Python.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = _python_round(values[near_half], 2).astype(np.float64)
+    return rounded
+
+
+# -----------------------------
+# Skill component
+# -----------------------------
+def _skill_scores(jd_ids: list, jd_pool: dict, candidate_ids: list, pool: dict,
+                  profile: ScoringProfile) -> np.ndarray:
+    vocabulary = sorted(set().union(*(jd_pool[jd_id]["skills"] for jd_id in jd_ids)))
+    column = {skill: i for i, skill in enumerate(vocabulary)}
+
+    # W[j, s]: tier weight x frequency boost of skill s in JD j (0 if absent)
+    weights = np.zeros((len(jd_ids), len(vocabulary)))
+    for row, jd_id in enumerate(jd_ids):
+        jd = jd_pool[jd_id]
+        for skill in set(jd["skills"]):
+            weights[row, column[skill]] = (
+                get_weight(skill, profile.tier_weights)
+                * frequency_boost(jd["frequency"][skill], profile.frequency_boost)
+            )
+
+    # M[r, s]: 1 if resume r has skill s
+    has_skill = np.zeros((len(candidate_ids), len(vocabulary)))
+    for row, candidate_id in enumerate(candidate_ids):
+        for skill in pool[candidate_id]["skills"]:
+            if skill in column:
+                has_skill[row, column[skill]] = 1
+
+    total = weights.sum(axis=1, keepdims=True)
+    matched = weights @ has_skill.T
+    ratio = np.divide(matched, total, out=np.zeros_like(matched), where=total > 0)
+    return _round2(ratio * 100)
+
+
+def _unmet_requirements(jd_ids: list, jd_pool: dict, candidate_ids: list,
+                        pool: dict) -> np.ndarray:
+    """Number of each JD's year requirements each candidate falls short of (J x R)."""
+    required_skills = sorted(set().union(*(jd_pool[jd_id]["experience"] for jd_id in jd_ids)))
+    if not required_skills:
+        return np.zeros((len(jd_ids), len(candidate_ids)), dtype=int)
+
+    column = {skill: i for i, skill in enumerate(required_skills)}
+
+    # NaN where a JD has no requirement; NaN comparisons are False
+    required = np.full((len(jd_ids), len(required_skills)), np.nan)
+    for row, jd_id in enumerate(jd_ids):
+        for skill, years in jd_pool[jd_id]["experience"].items():
+            required[row, column[skill]] = years
+
+    candidate_years = np.zeros((len(candidate_ids), len(required_skills)))
+    for row, candidate_id in enumerate(candidate_ids):
+        for skill, years in pool[candidate_id]["experience"].items():
+            if skill in column:
+                candidate_years[row, column[skill]] = years
+
+    return (candidate_years[None, :, :] < required[:, None, :]).sum(axis=2)
+
+
+# -----------------------------
+# Similarity components
+# -----------------------------
+def _stack(vectors: list, dim: int) -> tuple:
+    """Rows of the given vectors (zeros for missing ones) and a presence mask."""
+    present = np.array([vector is not None for vector in vectors])
+    matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+    for row, vector in enumerate(vectors):
+        if vector is not None:
+            matrix[row] = vector
+    return matrix, present
+
+
+def _embedding_scores(jd_vectors: list, resume_vectors: list) -> np.ndarray:
+    """Cosine similarities of unit embeddings on the 0-100 scale; missing -> 0."""
+    dim = next(
+        (len(vector) for vector in jd_vectors + resume_vectors if vector is not None), 1
+    )
+    jd_matrix, jd_present = _stack(jd_vectors, dim)
+    resume_matrix, resume_present = _stack(resume_vectors, dim)
+
+    # float64 like matcher.embedding_similarity: a float32 product rounds
+    # differently from a float32 dot often enough to move the 0.01 rounding
+    scores = _round2((jd_matrix.astype(np.float64) @ resume_matrix.T.astype(np.float64)) * 100)
+    scores[~jd_present, :] = 0
+    scores[:, ~resume_present] = 0
+    return scores
+
+
+def _similarity_scores(jd_ids: list, jd_pool: dict, candidate_ids: list, pool: dict,
+                       mode: str) -> tuple:
+    """(project_scores, semantic_scores) as J x R matrices."""
+    if mode == "lexical":
+        # Resumes are vectorised once; scores are computed per JD row exactly
+        # as score_pool does, so results match it
+        resume_rows = lexical_vectors([pool[candidate_id]["text"] for candidate_id in candidate_ids])
+        project_rows = lexical_vectors(
+            [pool[candidate_id]["project_text"] for candidate_id in candidate_ids]
+        )
+        jd_rows = lexical_vectors([jd_pool[jd_id]["text"] for jd_id in jd_ids])
+
+        shape = (len(jd_ids), len(candidate_ids))
+        project = np.zeros(shape)
+        semantic = np.zeros(shape)
+        for row in range(len(jd_ids)):
+            project[row] = lexical_scores(jd_rows[row], project_rows)
+            semantic[row] = lexical_scores(jd_rows[row], resume_rows)
+        return project, semantic
+
+    resumes = [pool[candidate_id] for candidate_id in candidate_ids]
+    jds = [jd_pool[jd_id] for jd_id in jd_ids]
+    embed_many(jds, "embedding")
+    embed_many(resumes, "embedding")
+    embed_many(resumes, "project_embedding")
+
+    jd_vectors = [jd.get("embedding") for jd in jds]
+    project = _embedding_scores(jd_vectors, [resume.get("project_embedding") for resume in resumes])
+    semantic = _embedding_scores(jd_vectors, [resume.get("embedding") for resume in resumes])
+    return project, semantic
+
+
+# -----------------------------
+# Matrix scoring
+# -----------------------------
+def score_matrix(jd_pool: dict, pool: dict,
+                 profile: ScoringProfile = DEFAULT_PROFILE,
+                 top_n: int = 3) -> dict:
+    """
+    Score every JD against every resume.
+
+    Args:
+        jd_pool (dict): JD ID -> JD features (core_engine.extract_jd_pool)
+        pool (dict): Candidate ID -> resume features
+            (core_engine.extract_pool_features), same engine mode
+        profile (ScoringProfile): Scoring weights
+        top_n (int): Roles listed per candidate in best_roles
+
+    Returns:
+        dict: Contains:
+            - jd_ids / candidate_ids: Row and column order of the matrices
+            - scores: Field -> J x R array, for final_score and each component
+            - best_roles: Candidate ID -> up to top_n (jd_id, final_score)
+              pairs, best first
+            - mode / approximated: As in score_features results
+    """
+    modes = {features.get("mode", "full") for features in list(jd_pool.values()) + list(pool.values())}
+    if len(modes) > 1:
+        raise ValueError(f"JD and resume features come from different engine modes: {sorted(modes)}")
+    mode = modes.pop() if modes else "full"
+
+    jd_ids = sorted(jd_pool, key=str)
+    candidate_ids = sorted(pool, key=str)
+
+    skill = _skill_scores(jd_ids, jd_pool, candidate_ids, pool, profile)
+    unmet = _unmet_requirements(jd_ids, jd_pool, candidate_ids, pool)
+    # Like score_features, the final score uses the unrounded adjusted score
+    adjusted = np.maximum(skill - profile.experience_penalty * unmet, 0)
+    project, semantic = _similarity_scores(jd_ids, jd_pool, candidate_ids, pool, mode)
+
+    skill_weight, project_weight, semantic_weight = profile.component_weights
+    final = np.clip(
+        _round2(skill_weight * adjusted + project_weight * project + semantic_weight * semantic),
+        0, 100,
+    )
+
+    matrix = {
+        "jd_ids": jd_ids,
+        "candidate_ids": candidate_ids,
+        "scores": {
+            "final_score": final,
+            "skill_score": skill,
+            "experience_adjusted_score": _round2(adjusted),
+            "project_score": project,
+            "semantic_score": semantic,
+        },
+        "mode": mode,
+        "approximated": dict(LEXICAL_APPROXIMATIONS) if mode == "lexical" else {},
+    }
+    matrix["best_roles"] = best_roles(matrix, top_n)
+    return matrix
+
+
+def best_roles(matrix: dict, top_n: int = 3) -> dict:
+    """
+    Best-scoring JDs per candidate.
+
+    Returns:
+        dict: Candidate ID -> up to top_n (jd_id, final_score) pairs, best
+        first (ties in JD ID order)
+    """
+    final = matrix["scores"]["final_score"]
+    jd_ids = matrix["jd_ids"]
+    order = np.argsort(-final, axis=0, kind="stable")[:top_n]
+
+    return {
+        candidate_id: [(jd_ids[row], float(final[row, col])) for row in order[:, col]]
+        for col, candidate_id in enumerate(matrix["candidate_ids"])
+    }
+
+
+def matrix_result(matrix: dict, jd_pool: dict, pool: dict, jd_id, candidate_id) -> dict:
+    """One pair's scores in the same shape as scoring.score_features."""
+    row = matrix["jd_ids"].index(jd_id)
+    col = matrix["candidate_ids"].index(candidate_id)
+    jd_skills = set(jd_pool[jd_id]["skills"])
+    resume_skills = set(pool[candidate_id]["skills"])
+
+    result = {"final_score": float(matrix["scores"]["final_score"][row, col])}
+    for field in COMPONENTS:
+        result[field] = float(matrix["scores"][field][row, col])
+
+    result.update({
+        "matched_skills": sorted(jd_skills & resume_skills),
+        "missing_skills": sorted(jd_skills - resume_skills),
+        "jd_skills": sorted(jd_skills),
+        "resume_skills": sorted(resume_skills),
+        "mode": matrix["mode"],
+        "approximated": dict(matrix["approximated"]),
+    })
+    return result
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _collect_jd_paths(patterns: list) -> list:
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.txt"))
+        else:
+            matches = glob.glob(pattern) or [pattern]
+        paths.extend(sorted(matches))
+    return list(dict.fromkeys(paths))
+
+
+def write_matrix_csv(matrix: dict, path: str):
+    """Final scores with one row per candidate and one column per JD."""
+    import csv
+
+    final = matrix["scores"]["final_score"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["resume"] + list(matrix["jd_ids"]))
+        for col, candidate_id in enumerate(matrix["candidate_ids"]):
+            writer.writerow([candidate_id] + [f"{score:.2f}" for score in final[:, col]])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score many job descriptions against many resume PDFs and route "
+                    "each candidate to their best-fitting roles.",
+    )
+    parser.add_argument("--jds", nargs="+", required=True,
+                        help="Job description text files, directories or glob patterns")
+    parser.add_argument("--resumes", nargs="*", default=[],
+                        help="Resume PDFs, directories or glob patterns")
+    parser.add_argument("--manifest", help="File with one resume path per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSON lines output, one record per resume (default: stdout)")
+    parser.add_argument("--matrix-csv", help="Also write the full final score matrix as CSV")
+    parser.add_argument("--top-n", type=int, default=3, help="Best roles listed per resume")
+    parser.add_argument("--skills", default=SKILLS_FILE, help="Skills list file")
+    parser.add_argument("--mode", choices=MODES, default="full", help="Engine mode")
+    parser.add_argument("--profile", help="Scoring profile JSON file")
+    parser.add_argument("--store", help="Feature store directory to reuse/persist features")
+    parser.add_argument("--must-have",
+                        help='Boolean skill query resumes must satisfy, e.g. "python AND '
+                             '(aws OR gcp)"; others are filtered out before embedding')
+
+    args = parser.parse_args(argv)
+    if not args.resumes and not args.manifest:
+        parser.error("provide --resumes and/or --manifest")
+    if args.store and args.mode != "full":
+        parser.error("--store holds full-mode features only")
+    if args.must_have:
+        try:
+            parse_query(args.must_have)
+        except ValueError as e:
+            parser.error(f"--must-have: {e}")
+    return args
+
+
+def main(argv=None):
+    from main import collect_resume_paths
+
+    args = parse_args(argv)
+    profile = load_profile(args.profile) if args.profile else DEFAULT_PROFILE
+
+    jd_texts = {}
+    for path in _collect_jd_paths(args.jds):
+        with open(path, "r", encoding="utf-8") as f:
+            jd_texts[path] = f.read()
+
+    if args.manifest and args.manifest != "-":
+        with open(args.manifest, "r", encoding="utf-8") as manifest:
+            paths = collect_resume_paths(args.resumes, manifest)
+    else:
+        paths = collect_resume_paths(args.resumes, sys.stdin if args.manifest == "-" else None)
+
+    resume_texts = {}
+    failed = {}
+    for path in paths:
+        try:
+            resume_texts[path] = extract_text_from_pdf(path)
+        except Exception as e:
+            failed[path] = f"{type(e).__name__}: {e}"
+
+    skills_list, nlp_matcher = load_taxonomy(args.skills, args.mode)
+    jd_pool = extract_jd_pool(jd_texts, nlp_matcher, skills_list, args.mode)
+
+    store = None
+    if args.store:
+        from feature_store import FeatureStore
+        store = FeatureStore(args.store)
+    try:
+        pool = extract_pool_features(resume_texts, nlp_matcher, skills_list,
+                                     store=store, mode=args.mode, must_have=args.must_have)
+    finally:
+        if store is not None:
+            store.close()
+
+    matrix = score_matrix(jd_pool, pool, profile, args.top_n)
+    final = matrix["scores"]["final_score"]
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for col, candidate_id in enumerate(matrix["candidate_ids"]):
+            out.write(json.dumps({
+                "resume": candidate_id,
+                "best_roles": [
+                    {"jd": jd_id, "final_score": score}
+                    for jd_id, score in matrix["best_roles"][candidate_id]
+                ],
+                "scores": {jd_id: float(final[row, col]) for row, jd_id in enumerate(matrix["jd_ids"])},
+                "mode": matrix["mode"],
+            }) + "\n")
+        for path in resume_texts:
+            if path not in pool:
+                out.write(json.dumps({"resume": path, "filtered": "must-have"}) + "\n")
+        for path, error in failed.items():
+            out.write(json.dumps({"resume": path, "error": error}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.matrix_csv:
+        write_matrix_csv(matrix, args.matrix_csv)
+
+    print(
+        f"Scored {len(matrix['candidate_ids'])} resumes against {len(matrix['jd_ids'])} "
+        f"job descriptions ({len(resume_texts) - len(pool)} filtered, {len(failed)} unreadable)",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
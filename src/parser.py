@@ -1,8 +1,18 @@
 import fitz  # PyMuPDF
 
-def extract_text_from_pdf(pdf_path):
-    doc = fitz.open(pdf_path)
+def _extract_text(doc):
     text = ""
     for page in doc:
         text += page.get_text()
     return text.lower()
+
+
+def extract_text_from_pdf(pdf_path):
+    with fitz.open(pdf_path) as doc:
+        return _extract_text(doc)
+
+
+def extract_text_from_bytes(pdf_bytes):
+    """Parse an in-memory PDF (e.g. an upload) without touching disk."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return _extract_text(doc)
@@ -0,0 +1,723 @@
+"""
+Score Regression Harness
+
+Pins the reference pipeline's output on a fixed, generated corpus and
+checks that every faster or alternative path reproduces it:
+
+    generate  - write a deterministic corpus of JD texts and resume PDFs
+    record    - score every JD x resume pair with process_application and
+                save the results as the golden file
+    check     - re-score the corpus through each alternative path and diff
+                against the golden file
+
+Score fields are compared within per-field tolerances and skill sets
+exactly. Components a path reports under "approximated" (and the scores
+derived from them) are held to looser tolerances, and their skill sets
+are not compared. For each JD the golden top-K ranking is compared with
+the path's ranking by Kendall tau (with a lower floor for approximated
+paths) and top-K overlap. The cascade_topk path runs the cascade with its
+default cutoff and the top-K pruning on, and fails if a golden top-K
+candidate that reaches the cutoff is pruned. A path that cannot run
+against the golden's mode fails rather than passing silently; by default
+only the paths that apply to the golden's mode are checked.
+
+Examples:
+    python src/regression.py generate --corpus data/regression
+    python src/regression.py record --corpus data/regression --golden data/regression/golden-full.json
+    python src/regression.py check --corpus data/regression --paths pool store cascade_topk lexical
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+
+from core_engine import (
+    MODES,
+    load_taxonomy,
+    extract_jd_features,
+    extract_jd_pool,
+    extract_pool_features,
+    score_pool,
+    score_resume,
+    process_application,
+)
+from parser import extract_text_from_pdf
+from scoring import DEFAULT_PROFILE, ScoringProfile, load_profile
+from skill_extracter import load_skills
+
+SKILLS_FILE = "data/skills.txt"
+CORPUS_FILE = "corpus.json"
+GOLDEN_FILE = "golden.json"
+# Full-mode golden for the same corpus, recorded where the models are installed
+FULL_GOLDEN_FILE = "golden-full.json"
+
+SCORE_FIELDS = (
+    "final_score",
+    "skill_score",
+    "experience_adjusted_score",
+    "project_score",
+    "semantic_score",
+)
+SKILL_FIELDS = ("matched_skills", "missing_skills", "jd_skills", "resume_skills")
+
+# Maximum absolute difference per score field (scores are rounded to 0.01;
+# embedding fields allow for batched vs. single encoder calls)
+DEFAULT_TOLERANCES = {
+    "final_score": 0.05,
+    "skill_score": 0.01,
+    "experience_adjusted_score": 0.01,
+    "project_score": 0.05,
+    "semantic_score": 0.05,
+}
+
+# Maximum absolute difference for score fields a path approximates (e.g.
+# lexical mode against a full-mode golden): catches a broken approximation,
+# not the expected gap between term vectors and embeddings
+DEFAULT_APPROXIMATED_TOLERANCES = {
+    "final_score": 20.0,
+    "skill_score": 20.0,
+    "experience_adjusted_score": 20.0,
+    "project_score": 40.0,
+    "semantic_score": 40.0,
+}
+
+# Minimum Kendall tau of a JD's golden top-K list under a path's scores
+DEFAULT_MIN_RANK_TAU = 0.9
+DEFAULT_MIN_APPROXIMATED_TAU = 0.3
+
+# Approximated component -> score fields computed from it
+_DERIVED_FIELDS = {
+    "skill_score": ("skill_score", "experience_adjusted_score", "final_score"),
+    "project_score": ("project_score", "final_score"),
+    "semantic_score": ("semantic_score", "final_score"),
+}
+
+
+# -----------------------------
+# Corpus generation
+# -----------------------------
+_ROLES = ("backend engineer", "data scientist", "ml engineer", "platform engineer",
+          "full stack developer", "data engineer", "devops engineer", "research engineer")
+_FILLER = ("designed", "built", "maintained", "migrated", "optimised", "shipped")
+_OBJECTS = ("a billing service", "an analytics dashboard", "a recommendation engine",
+            "an internal api", "a data pipeline", "a chat assistant", "a search backend")
+
+
+def _taxonomy_skills(skills_file: str) -> list:
+    # Section comments in the skills file are not skills
+    return [skill for skill in load_skills(skills_file) if not skill.startswith("#")]
+
+
+def _generate_jd(rng: random.Random, skills: list) -> tuple:
+    required = rng.sample(skills, rng.randint(5, 9))
+    lines = [f"we are hiring a {rng.choice(_ROLES)}.", "", "requirements:"]
+
+    for skill in required:
+        if rng.random() < 0.4:
+            lines.append(f"- {rng.randint(1, 6)}+ years of {skill}")
+        else:
+            lines.append(f"- hands-on work with {skill}")
+
+    # Repeat a few skills so frequency boosts come into play
+    lines.append("")
+    lines.append("nice to have: " + ", ".join(rng.sample(required, min(3, len(required)))))
+    return "\n".join(lines) + "\n", required
+
+
+def _generate_resume(rng: random.Random, index: int, skills: list, focus: list = None) -> str:
+    # A focused resume covers most of one JD's requirements, so the corpus
+    # holds strong matches as well as noise
+    own = rng.sample(skills, rng.randint(4, 12))
+    if focus:
+        own = rng.sample(focus, max(1, len(focus) - rng.randint(0, 2))) + own[:rng.randint(0, 3)]
+    lines = [f"candidate {index:03d}", f"{rng.choice(_ROLES)}"]
+    if rng.random() < 0.6:
+        lines.append(f"{rng.randint(1, 9)} years of {rng.choice(own)}")
+
+    lines += ["", "skills", ", ".join(own), "", "projects"]
+    for _ in range(rng.randint(1, 3)):
+        lines.append(f"{rng.choice(_FILLER)} {rng.choice(_OBJECTS)} using {rng.choice(own)}")
+    # A section word inside a project line must not end the section
+    lines.append(f"gained experience with {rng.choice(own)} in production")
+
+    lines += ["", "work experience"]
+    for _ in range(rng.randint(1, 2)):
+        lines.append(f"company {rng.randint(1, 99)}: {rng.randint(1, 8)}+ years {rng.choice(own)}")
+
+    lines += ["", "education", "b.tech computer science, 4 years", "", "honors",
+              f"hackathon winner {rng.randint(2015, 2024)}"]
+    return "\n".join(lines) + "\n"
+
+
+def _write_pdf(text: str, path: str):
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 60), text, fontsize=10)
+    doc.save(path, garbage=4, deflate=True)
+    doc.close()
+
+
+def generate_corpus(corpus_dir: str, jd_count: int = 6, resume_count: int = 40,
+                    seed: int = 0, skills_file: str = SKILLS_FILE) -> dict:
+    """
+    Write a deterministic corpus of JD texts and resume PDFs.
+
+    Returns:
+        dict: Corpus manifest (seed, JD and resume file names), also saved
+        as corpus.json in corpus_dir
+    """
+    rng = random.Random(seed)
+    skills = _taxonomy_skills(skills_file)
+
+    os.makedirs(os.path.join(corpus_dir, "jds"), exist_ok=True)
+    os.makedirs(os.path.join(corpus_dir, "resumes"), exist_ok=True)
+
+    manifest = {"seed": seed, "jds": [], "resumes": []}
+
+    requirements = []
+    for i in range(jd_count):
+        name = f"jds/jd{i:02d}.txt"
+        text, required = _generate_jd(rng, skills)
+        with open(os.path.join(corpus_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+        manifest["jds"].append(name)
+        requirements.append(required)
+
+    for i in range(resume_count):
+        name = f"resumes/resume{i:03d}.pdf"
+        focus = rng.choice(requirements) if requirements and rng.random() < 0.4 else None
+        _write_pdf(_generate_resume(rng, i, skills, focus), os.path.join(corpus_dir, name))
+        manifest["resumes"].append(name)
+
+    with open(os.path.join(corpus_dir, CORPUS_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_corpus(corpus_dir: str) -> dict:
+    """
+    Read a generated corpus.
+
+    Returns:
+        dict: Contains jds (JD ID -> text), resumes (resume ID -> PDF path)
+        and fingerprint (hash of every JD text and resume text)
+    """
+    with open(os.path.join(corpus_dir, CORPUS_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    jds = {}
+    for name in manifest["jds"]:
+        with open(os.path.join(corpus_dir, name), "r", encoding="utf-8") as f:
+            jds[name] = f.read()
+
+    resumes = {name: os.path.join(corpus_dir, name) for name in manifest["resumes"]}
+
+    digest = hashlib.sha256()
+    for name in sorted(jds):
+        digest.update(name.encode("utf-8") + b"\0" + jds[name].encode("utf-8"))
+    for name in sorted(resumes):
+        digest.update(name.encode("utf-8") + b"\0" + extract_text_from_pdf(resumes[name]).encode("utf-8"))
+
+    return {"jds": jds, "resumes": resumes, "fingerprint": digest.hexdigest()}
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# -----------------------------
+# Reference
+# -----------------------------
+def record_golden(corpus: dict, skills_file: str = SKILLS_FILE,
+                  profile: ScoringProfile = DEFAULT_PROFILE, mode: str = "full") -> dict:
+    """
+    Score every JD x resume pair with process_application, one call per
+    pair exactly as a caller of the public API would.
+
+    Returns:
+        dict: Golden record (inputs fingerprint, profile, mode and
+        results as JD ID -> resume ID -> result)
+    """
+    results = {
+        jd_id: {
+            resume_id: process_application(jd_text, path, skills_file, profile, mode)
+            for resume_id, path in corpus["resumes"].items()
+        }
+        for jd_id, jd_text in corpus["jds"].items()
+    }
+
+    return {
+        "reference": "process_application",
+        "mode": mode,
+        "profile": profile.to_dict(),
+        "fingerprint": corpus["fingerprint"],
+        "skills_hash": _file_hash(skills_file),
+        "results": results,
+    }
+
+
+# -----------------------------
+# Alternative paths
+# -----------------------------
+def _resume_texts(corpus: dict) -> dict:
+    return {resume_id: extract_text_from_pdf(path) for resume_id, path in corpus["resumes"].items()}
+
+
+def _run_score_resume(corpus, skills_file, profile, mode):
+    """Taxonomy and JD extracted once, resumes scored one by one."""
+    skills_list, nlp_matcher = load_taxonomy(skills_file, mode)
+    texts = _resume_texts(corpus)
+    results = {}
+
+    for jd_id, jd_text in corpus["jds"].items():
+        jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, mode)
+        results[jd_id] = {
+            resume_id: score_resume(jd_features, text, nlp_matcher, skills_list, profile)
+            for resume_id, text in texts.items()
+        }
+    return results
+
+
+def _run_pool(corpus, skills_file, profile, mode, store=None):
+    """Resumes extracted (and embedded) once as a pool, scored per JD."""
+    skills_list, nlp_matcher = load_taxonomy(skills_file, mode)
+    pool = extract_pool_features(_resume_texts(corpus), nlp_matcher, skills_list,
+                                 store=store, mode=mode)
+    results = {}
+
+    for jd_id, jd_text in corpus["jds"].items():
+        jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, mode)
+        results[jd_id] = dict(score_pool(jd_features, pool, profile))
+    return results
+
+
+def _run_store(corpus, skills_file, profile, mode):
+    """Pool written to a fresh FeatureStore, then re-scored from the store."""
+    from feature_store import FeatureStore
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        with FeatureStore(store_dir) as store:
+            _run_pool(corpus, skills_file, profile, mode, store=store)
+        with FeatureStore(store_dir) as store:
+            return _run_pool(corpus, skills_file, profile, mode, store=store)
+
+
+def _run_cascade(corpus, skills_file, profile, mode):
+    """Cascade ranking with a zero cutoff, so every candidate is fully scored."""
+    from cascade import cascade_rank
+
+    skills_list, nlp_matcher = load_taxonomy(skills_file, mode)
+    pool = extract_pool_features(_resume_texts(corpus), nlp_matcher, skills_list, mode=mode)
+    results = {}
+
+    for jd_id, jd_text in corpus["jds"].items():
+        jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, mode)
+        results[jd_id] = dict(cascade_rank(jd_features, pool, profile, cutoff=0)["ranked"])
+    return results
+
+
+def _run_cascade_topk(corpus, skills_file, profile, mode, top_k=10):
+    """
+    Cascade ranking as deployed: default cutoff, top-K pruning and lazy
+    embeddings. Only the fully scored candidates are returned.
+    """
+    from cascade import cascade_rank
+
+    skills_list, nlp_matcher = load_taxonomy(skills_file, mode)
+    pool = extract_pool_features(_resume_texts(corpus), nlp_matcher, skills_list, mode=mode,
+                                 embed=False)
+    results = {}
+
+    for jd_id, jd_text in corpus["jds"].items():
+        jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, mode)
+        results[jd_id] = dict(cascade_rank(jd_features, pool, profile, top_k=top_k)["ranked"])
+    return results
+
+
+def _run_matrix(corpus, skills_file, profile, mode):
+    """All JDs against the whole pool in one matrix scoring pass."""
+    from matrix_scoring import score_matrix, matrix_result
+
+    skills_list, nlp_matcher = load_taxonomy(skills_file, mode)
+    pool = extract_pool_features(_resume_texts(corpus), nlp_matcher, skills_list, mode=mode)
+    jd_pool = extract_jd_pool(corpus["jds"], nlp_matcher, skills_list, mode)
+    matrix = score_matrix(jd_pool, pool, profile)
+
+    return {
+        jd_id: {
+            resume_id: matrix_result(matrix, jd_pool, pool, jd_id, resume_id)
+            for resume_id in pool
+        }
+        for jd_id in jd_pool
+    }
+
+
+def _run_lexical(corpus, skills_file, profile, mode):
+    """The neural-free engine mode through the public API."""
+    return {
+        jd_id: {
+            resume_id: process_application(jd_text, path, skills_file, profile, "lexical")
+            for resume_id, path in corpus["resumes"].items()
+        }
+        for jd_id, jd_text in corpus["jds"].items()
+    }
+
+
+# Path name -> runner(corpus, skills_file, profile, mode); mode is the golden's
+PATHS = {
+    "score_resume": _run_score_resume,
+    "pool": _run_pool,
+    "store": _run_store,
+    "cascade": _run_cascade,
+    "cascade_topk": _run_cascade_topk,
+    "matrix": _run_matrix,
+    "lexical": _run_lexical,
+}
+
+# Paths that only exist for full-mode features
+_FULL_MODE_PATHS = {"store"}
+
+
+def applicable_paths(mode: str) -> list:
+    """Paths that can be checked against a golden record of this mode."""
+    return sorted(name for name in PATHS if mode == "full" or name not in _FULL_MODE_PATHS)
+
+# Paths that prune candidates; they also receive the check's top_k
+_PRUNING_PATHS = {"cascade_topk"}
+
+
+# -----------------------------
+# Comparison
+# -----------------------------
+def _approximated_fields(result: dict) -> set:
+    fields = set()
+    for component in result.get("approximated", {}):
+        fields.update(_DERIVED_FIELDS.get(component, (component,)))
+    return fields
+
+
+def _ranking(results: dict) -> list:
+    return [
+        resume_id for resume_id, result in
+        sorted(results.items(), key=lambda item: (-item[1]["final_score"], item[0]))
+    ]
+
+
+def kendall_tau(reference_scores: dict, scores: dict) -> float:
+    """
+    Kendall tau-a between two scorings of the same items. A pair ordered the
+    same way (or tied in both) is concordant, one ordered oppositely is
+    discordant, and one tied in only one scoring is neither.
+    """
+    items = list(reference_scores)
+    n = len(items)
+    if n < 2:
+        return 1.0
+
+    def sign(value):
+        return (value > 0) - (value < 0)
+
+    concordant = discordant = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            expected = sign(reference_scores[items[i]] - reference_scores[items[j]])
+            actual = sign(scores[items[i]] - scores[items[j]])
+            if expected == actual:
+                concordant += 1
+            elif expected == -actual:
+                discordant += 1
+
+    return (concordant - discordant) / (n * (n - 1) / 2)
+
+
+def compare_results(golden: dict, candidate: dict, tolerances: dict = None,
+                    top_k: int = 10, min_rank_tau: float = DEFAULT_MIN_RANK_TAU,
+                    max_examples: int = 10, approximated_tolerances: dict = None,
+                    min_approximated_tau: float = DEFAULT_MIN_APPROXIMATED_TAU,
+                    pruned_below: float = None) -> dict:
+    """
+    Diff one path's results against the golden results.
+
+    Args:
+        golden (dict): JD ID -> resume ID -> reference result
+        candidate (dict): JD ID -> resume ID -> path result
+        tolerances (dict): Score field -> maximum absolute difference
+        top_k (int): Length of the per-JD ranking compared
+        min_rank_tau (float): Minimum Kendall tau for a path without
+            approximated components
+        max_examples (int): Failures listed in the report
+        approximated_tolerances (dict): Score field -> maximum absolute
+            difference where the path approximates the field
+        min_approximated_tau (float): Minimum Kendall tau for a path with
+            approximated components
+        pruned_below (float): For pruning paths: results may be missing,
+            except for golden top-K candidates scoring at least this much
+
+    Returns:
+        dict: Contains passed, pairs, pruned, fields (per score field:
+        max_abs_diff, violations, approximated), skill_mismatches (per
+        skill field), rank (k, mean/min tau, mean overlap) and example
+        failures
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    approximated_tolerances = {
+        **DEFAULT_APPROXIMATED_TOLERANCES, **(approximated_tolerances or {})
+    }
+
+    fields = {field: {"max_abs_diff": 0.0, "violations": 0, "approximated": False}
+              for field in SCORE_FIELDS}
+    skill_mismatches = {field: 0 for field in SKILL_FIELDS}
+    failures = []
+    problems = 0
+    pairs = 0
+    pruned = 0
+    approximated_any = False
+    taus, overlaps = [], []
+
+    def fail(message):
+        nonlocal problems
+        problems += 1
+        if len(failures) < max_examples:
+            failures.append(message)
+
+    for jd_id, golden_results in golden.items():
+        candidate_results = candidate.get(jd_id, {})
+        golden_top = _ranking(golden_results)[:top_k]
+
+        for resume_id, expected in golden_results.items():
+            actual = candidate_results.get(resume_id)
+            if actual is None and pruned_below is not None and not (
+                resume_id in golden_top and expected["final_score"] >= pruned_below
+            ):
+                pruned += 1
+                continue
+            if actual is None:
+                fail(f"{jd_id} / {resume_id}: missing result")
+                continue
+
+            pairs += 1
+            # Only approximations the reference did not make excuse a difference
+            approximated = _approximated_fields(actual) - _approximated_fields(expected)
+            approximated_any = approximated_any or bool(approximated)
+
+            for field in SCORE_FIELDS:
+                diff = abs(actual[field] - expected[field])
+                stats = fields[field]
+                stats["max_abs_diff"] = round(max(stats["max_abs_diff"], diff), 4)
+
+                limit = tolerances[field]
+                if field in approximated:
+                    stats["approximated"] = True
+                    limit = approximated_tolerances[field]
+                if diff > limit + 1e-9:
+                    stats["violations"] += 1
+                    fail(f"{jd_id} / {resume_id}: {field} {expected[field]} -> {actual[field]}")
+
+            for field in SKILL_FIELDS:
+                if sorted(actual[field]) != sorted(expected[field]):
+                    skill_mismatches[field] += 1
+                    if "skill_score" not in approximated:
+                        fail(f"{jd_id} / {resume_id}: {field} differs")
+
+        # Ranking: the golden top-K under the path's scores (the survivors of
+        # it, for a pruning path)
+        reference = golden_top
+        if pruned_below is not None:
+            reference = [resume_id for resume_id in reference if resume_id in candidate_results]
+        if candidate_results and all(resume_id in candidate_results for resume_id in reference):
+            taus.append(kendall_tau(
+                {resume_id: golden_results[resume_id]["final_score"] for resume_id in reference},
+                {resume_id: candidate_results[resume_id]["final_score"] for resume_id in reference},
+            ))
+            candidate_top = set(_ranking(candidate_results)[:top_k])
+            overlaps.append(len(candidate_top & set(reference)) / max(len(reference), 1))
+
+    rank = {
+        "k": top_k,
+        "mean_tau": round(sum(taus) / len(taus), 4) if taus else None,
+        "min_tau": round(min(taus), 4) if taus else None,
+        "mean_overlap": round(sum(overlaps) / len(overlaps), 4) if overlaps else None,
+    }
+
+    tau_floor = min_approximated_tau if approximated_any else min_rank_tau
+    if taus and rank["min_tau"] < tau_floor:
+        fail(f"top-{top_k} Kendall tau {rank['min_tau']} below {tau_floor}")
+
+    return {
+        "passed": problems == 0,
+        "pairs": pairs,
+        "pruned": pruned,
+        "fields": fields,
+        "skill_mismatches": skill_mismatches,
+        "skills_exact": not any(skill_mismatches.values()),
+        "rank": rank,
+        "failures": failures,
+    }
+
+
+def check_paths(corpus: dict, golden: dict, paths: list, skills_file: str = SKILLS_FILE,
+                tolerances: dict = None, top_k: int = 10,
+                min_rank_tau: float = DEFAULT_MIN_RANK_TAU,
+                approximated_tolerances: dict = None,
+                min_approximated_tau: float = DEFAULT_MIN_APPROXIMATED_TAU) -> dict:
+    """
+    Run each alternative path over the corpus and compare it with the golden
+    record.
+
+    Returns:
+        dict: Path name -> compare_results report. A path that cannot run
+        against the golden's mode gets a "skipped" reason and does not
+        pass.
+    """
+    if golden["fingerprint"] != corpus["fingerprint"]:
+        raise ValueError("Golden results were recorded for a different corpus")
+    if golden["skills_hash"] != _file_hash(skills_file):
+        raise ValueError("Golden results were recorded with a different skills file")
+
+    profile = ScoringProfile.from_dict(golden["profile"])
+    mode = golden["mode"]
+    reports = {}
+
+    for name in paths:
+        if name in _FULL_MODE_PATHS and mode != "full":
+            reports[name] = {"skipped": f"needs a full-mode golden record, not {mode}",
+                             "passed": False}
+            continue
+        pruned_below = None
+        if name in _PRUNING_PATHS:
+            from cascade import DEFAULT_CUTOFF
+
+            results = PATHS[name](corpus, skills_file, profile, mode, top_k=top_k)
+            pruned_below = DEFAULT_CUTOFF
+        else:
+            results = PATHS[name](corpus, skills_file, profile, mode)
+
+        reports[name] = compare_results(
+            golden["results"], results, tolerances, top_k, min_rank_tau,
+            approximated_tolerances=approximated_tolerances,
+            min_approximated_tau=min_approximated_tau,
+            pruned_below=pruned_below,
+        )
+
+    return reports
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _print_report(reports: dict):
+    for name, report in reports.items():
+        if "skipped" in report:
+            print(f"{name:<13} SKIPPED  {report['skipped']}")
+            continue
+
+        status = "PASS" if report["passed"] else "FAIL"
+        rank = report["rank"]
+        pruned = f" ({report['pruned']} pruned)" if report["pruned"] else ""
+        print(
+            f"{name:<13} {status:<8} {report['pairs']} pairs{pruned}, "
+            f"top-{rank['k']} tau mean {rank['mean_tau']} / min {rank['min_tau']}, "
+            f"overlap {rank['mean_overlap']}, "
+            f"skills {'exact' if report['skills_exact'] else 'differ'}"
+        )
+        for field, stats in report["fields"].items():
+            marker = " (approximated)" if stats["approximated"] else ""
+            print(f"    {field:<26} max diff {stats['max_abs_diff']:<8} "
+                  f"violations {stats['violations']}{marker}")
+        for message in report["failures"]:
+            print(f"    ! {message}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Golden-output regression harness.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Write a deterministic corpus")
+    generate.add_argument("--corpus", required=True, help="Corpus directory")
+    generate.add_argument("--jds", type=int, default=6, help="Number of JDs")
+    generate.add_argument("--resumes", type=int, default=40, help="Number of resumes")
+    generate.add_argument("--seed", type=int, default=0, help="Random seed")
+    generate.add_argument("--skills", default=SKILLS_FILE, help="Skills list file")
+
+    record = commands.add_parser("record", help="Record golden results with process_application")
+    record.add_argument("--corpus", required=True, help="Corpus directory")
+    record.add_argument("--golden", help=f"Golden file (default: <corpus>/{GOLDEN_FILE})")
+    record.add_argument("--skills", default=SKILLS_FILE, help="Skills list file")
+    record.add_argument("--profile", help="Scoring profile JSON file")
+    record.add_argument("--mode", choices=MODES, default="full",
+                        help="Engine mode of the reference run")
+
+    check = commands.add_parser("check", help="Diff alternative paths against the golden file")
+    check.add_argument("--corpus", required=True, help="Corpus directory")
+    check.add_argument("--golden", help=f"Golden file (default: <corpus>/{GOLDEN_FILE})")
+    check.add_argument("--skills", default=SKILLS_FILE, help="Skills list file")
+    check.add_argument("--paths", nargs="+", choices=sorted(PATHS),
+                       help="Paths to check (default: all that apply to the golden's mode)")
+    check.add_argument("--top-k", type=int, default=10, help="Ranking length compared per JD")
+    check.add_argument("--min-rank-tau", type=float, default=DEFAULT_MIN_RANK_TAU,
+                       help="Minimum top-K Kendall tau for non-approximated paths")
+    check.add_argument("--min-approximated-tau", type=float,
+                       default=DEFAULT_MIN_APPROXIMATED_TAU,
+                       help="Minimum top-K Kendall tau for paths with approximated components")
+    check.add_argument("--tolerances", help="JSON file of score field -> max abs difference")
+    check.add_argument("--approximated-tolerances",
+                       help="JSON file of score field -> max abs difference where approximated")
+    check.add_argument("--report", help="Write the full report as JSON")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "generate":
+        manifest = generate_corpus(args.corpus, args.jds, args.resumes, args.seed, args.skills)
+        print(f"Wrote {len(manifest['jds'])} JDs and {len(manifest['resumes'])} resumes "
+              f"to {args.corpus}")
+        return 0
+
+    golden_path = args.golden or os.path.join(args.corpus, GOLDEN_FILE)
+    corpus = load_corpus(args.corpus)
+
+    if args.command == "record":
+        profile = load_profile(args.profile) if args.profile else DEFAULT_PROFILE
+        golden = record_golden(corpus, args.skills, profile, args.mode)
+        with open(golden_path, "w", encoding="utf-8") as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+        print(f"Recorded {len(corpus['jds'])} x {len(corpus['resumes'])} {args.mode}-mode "
+              f"results to {golden_path}")
+        return 0
+
+    with open(golden_path, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+
+    tolerances, approximated_tolerances = None, None
+    if args.tolerances:
+        with open(args.tolerances, "r", encoding="utf-8") as f:
+            tolerances = json.load(f)
+    if args.approximated_tolerances:
+        with open(args.approximated_tolerances, "r", encoding="utf-8") as f:
+            approximated_tolerances = json.load(f)
+
+    paths = args.paths or applicable_paths(golden["mode"])
+    reports = check_paths(corpus, golden, paths, args.skills, tolerances,
+                          args.top_k, args.min_rank_tau, approximated_tolerances,
+                          args.min_approximated_tau)
+    _print_report(reports)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+
+    return 0 if all(report["passed"] for report in reports.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
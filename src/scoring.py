@@ -0,0 +1,201 @@
+"""
+Scoring Profiles
+
+Turns cached resume/JD feature vectors into final scores using a
+configurable weighting profile, so a processed pool can be re-ranked
+without re-running spaCy or the sentence encoder.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import List, Mapping
+
+from matcher import (
+    DEFAULT_TIER_WEIGHTS,
+    calculate_dynamic_match,
+    apply_experience_penalty,
+    calculate_final_score,
+)
+
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """
+    Weights applied when combining score components.
+
+    The component weights are relative: they are normalized to sum to 1,
+    so skill=6, project=2, semantic=2 is the same profile as 0.6/0.2/0.2.
+
+    Attributes:
+        name (str): Profile identifier shown alongside results
+        skill_weight (float): Weight of the experience-adjusted skill score
+        project_weight (float): Weight of the project relevance score
+        semantic_weight (float): Weight of the full resume semantic similarity
+        experience_penalty (float): Points deducted per unmet year requirement
+        tier_weights (Mapping): Skill weights for core_tech/frameworks/tools/default
+            (read-only; not part of the hash)
+        frequency_boost (float): Extra weight per repeated JD mention of a skill
+    """
+    name: str = "default"
+    skill_weight: float = 0.5
+    project_weight: float = 0.2
+    semantic_weight: float = 0.3
+    experience_penalty: float = 5
+    tier_weights: Mapping = field(default_factory=lambda: dict(DEFAULT_TIER_WEIGHTS), hash=False)
+    frequency_boost: float = 0.2
+
+    def __post_init__(self):
+        weights = (self.skill_weight, self.project_weight, self.semantic_weight)
+        if any(w < 0 for w in weights):
+            raise ValueError("Component weights must be non-negative")
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("At least one component weight must be positive")
+        if not math.isclose(total, 1):
+            object.__setattr__(self, "skill_weight", self.skill_weight / total)
+            object.__setattr__(self, "project_weight", self.project_weight / total)
+            object.__setattr__(self, "semantic_weight", self.semantic_weight / total)
+        if self.experience_penalty < 0:
+            raise ValueError("experience_penalty must be non-negative")
+        if self.frequency_boost < 0:
+            raise ValueError("frequency_boost must be non-negative")
+
+        missing_tiers = set(DEFAULT_TIER_WEIGHTS) - set(self.tier_weights)
+        if missing_tiers:
+            raise ValueError(f"tier_weights is missing tiers: {sorted(missing_tiers)}")
+        negative_tiers = sorted(tier for tier, w in self.tier_weights.items() if w < 0)
+        if negative_tiers:
+            raise ValueError(f"tier_weights must be non-negative: {negative_tiers}")
+        object.__setattr__(self, "tier_weights", MappingProxyType(dict(self.tier_weights)))
+
+    def __reduce__(self):
+        # MappingProxyType cannot be pickled
+        return type(self).from_dict, (self.to_dict(),)
+
+    @property
+    def component_weights(self) -> tuple:
+        return (self.skill_weight, self.project_weight, self.semantic_weight)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScoringProfile":
+        tier_weights = dict(DEFAULT_TIER_WEIGHTS)
+        tier_weights.update(data.get("tier_weights", {}))
+        return cls(**{**data, "tier_weights": tier_weights})
+
+    def to_dict(self) -> dict:
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["tier_weights"] = dict(self.tier_weights)
+        return data
+
+
+DEFAULT_PROFILE = ScoringProfile()
+
+
+def load_profile(file_path: str) -> ScoringProfile:
+    """Load a scoring profile from a JSON file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return ScoringProfile.from_dict(json.load(f))
+
+
+def score_skill_match(features: dict, profile: ScoringProfile = DEFAULT_PROFILE) -> tuple:
+    """
+    Score only the skill component (no similarity scores needed).
+
+    Returns:
+        tuple: (skill_match_result, skill_score, experience_adjusted_score)
+    """
+    skill_match_result = calculate_dynamic_match(
+        "",
+        set(features["jd_skills"]),
+        set(features["resume_skills"]),
+        jd_frequency=features["jd_frequency"],
+        tier_weights=profile.tier_weights,
+        boost_step=profile.frequency_boost,
+    )
+    skill_score = skill_match_result["match_percentage"]
+
+    experience_adjusted_score = apply_experience_penalty(
+        skill_score,
+        features["jd_experience"],
+        features["candidate_experience"],
+        penalty_per_gap=profile.experience_penalty,
+    )
+
+    return skill_match_result, skill_score, experience_adjusted_score
+
+
+def score_upper_bound(experience_adjusted_score: float,
+                      project_score: float = 100,
+                      semantic_score: float = 100,
+                      profile: ScoringProfile = DEFAULT_PROFILE) -> float:
+    """
+    Best final score reachable given the components known so far; unknown
+    components are passed as their ceiling.
+    """
+    return calculate_final_score(
+        experience_adjusted_score,
+        project_score,
+        semantic_score,
+        weights=profile.component_weights,
+    )
+
+
+def score_features(features: dict, profile: ScoringProfile = DEFAULT_PROFILE) -> dict:
+    """
+    Score a cached feature vector with the given profile.
+
+    Args:
+        features (dict): Output of core_engine.build_feature_vector
+        profile (ScoringProfile): Weights to apply
+
+    Returns:
+        dict: Same result shape as core_engine.process_application
+    """
+    skill_match_result, skill_score, experience_adjusted_score = score_skill_match(
+        features, profile
+    )
+
+    project_score = features["project_score"]
+    semantic_score = features["semantic_score"]
+
+    final_score = calculate_final_score(
+        experience_adjusted_score,
+        project_score,
+        semantic_score,
+        weights=profile.component_weights,
+    )
+
+    return {
+        "final_score": final_score,
+        "skill_score": round(skill_score, 2),
+        "experience_adjusted_score": round(experience_adjusted_score, 2),
+        "project_score": round(project_score, 2),
+        "semantic_score": round(semantic_score, 2),
+        "matched_skills": sorted(skill_match_result["matched_skills"]),
+        "missing_skills": sorted(skill_match_result["missing_skills"]),
+        "jd_skills": sorted(features["jd_skills"]),
+        "resume_skills": sorted(features["resume_skills"]),
+        "mode": features.get("mode", "full"),
+        "approximated": dict(features.get("approximated", {})),
+    }
+
+
+def rerank(feature_pool: dict, profile: ScoringProfile = DEFAULT_PROFILE) -> List[tuple]:
+    """
+    Re-rank an already-processed pool under a (new) scoring profile.
+
+    Args:
+        feature_pool (dict): Mapping of candidate ID to cached feature vector
+        profile (ScoringProfile): Weights to apply
+
+    Returns:
+        list: (candidate_id, result) pairs sorted by final score, best first
+    """
+    scored = [
+        (candidate_id, score_features(features, profile))
+        for candidate_id, features in feature_pool.items()
+    ]
+    scored.sort(key=lambda item: (-item[1]["final_score"], str(item[0])))
+    return scored
@@ -0,0 +1,128 @@
+"""
+Resume Section Segmentation
+
+Splits a resume into its sections in one pass over the text, so the
+scorer can work on precise slices instead of re-scanning the document:
+
+    header      - text before the first recognised heading (name, summary)
+    projects    - personal / academic projects
+    experience  - work history, internships
+    education   - degrees, coursework
+    skills      - skill lists
+    honors      - awards, achievements, certifications
+
+PDF text extraction puts each heading on its own line, so a heading is a
+line holding only a known title (optionally followed by a colon), or a
+title followed by a colon and inline content ("skills: python, sql"). A
+section title mentioned inside a sentence ("5 years of experience in ...")
+is never a heading. Inside a project or job entry, inline skill and award
+lines ("tech stack: python, fastapi", "achievements: ...") are fields of
+the entry, not new sections.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+HEADER = "header"
+
+# Section -> heading titles that open it
+SECTION_HEADINGS = {
+    "projects": (
+        "projects", "project", "personal projects", "academic projects",
+        "key projects", "project experience", "projects & research",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience",
+        "employment", "employment history", "work history", "internships",
+        "internship", "internship experience",
+    ),
+    "education": (
+        "education", "academic background", "academics", "qualifications",
+        "educational qualifications",
+    ),
+    "skills": (
+        "skills", "technical skills", "key skills", "core competencies",
+        "technologies", "tech stack", "skills & tools",
+    ),
+    "honors": (
+        "honors", "honours", "awards", "achievements", "honors and awards",
+        "honors & awards", "awards and achievements", "certifications",
+        "certificates", "accomplishments",
+    ),
+}
+
+SECTIONS = (HEADER,) + tuple(SECTION_HEADINGS)
+
+# Sections whose entries commonly carry inline "title: ..." fields, and the
+# sections those fields belong to
+_ENTRY_SECTIONS = {"projects", "experience"}
+_ENTRY_FIELD_SECTIONS = {"skills", "honors"}
+
+_TITLE_TO_SECTION = {
+    title: section
+    for section, titles in SECTION_HEADINGS.items()
+    for title in titles
+}
+
+# Longest titles first so "work experience" wins over "experience"
+_HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:[-*#•▪■►][ \t]*)?"
+    r"(?P<title>" + "|".join(
+        re.escape(title) for title in sorted(_TITLE_TO_SECTION, key=len, reverse=True)
+    ) + r")"
+    r"[ \t]*(?::[ \t]*(?P<inline>[^\n]*?))?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+Span = Tuple[int, int]
+
+
+def segment_sections(text: str) -> Dict[str, List[Span]]:
+    """
+    Index a resume's sections by character offsets.
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        dict: Section name -> list of (start, end) offsets of its content
+        (heading excluded), in document order; sections that do not occur
+        are absent. A document without recognisable headings is all header.
+    """
+    sections = {}
+    current, start = HEADER, 0
+
+    for match in _HEADING_PATTERN.finditer(text):
+        section = _TITLE_TO_SECTION[match.group("title").lower()]
+        inline = bool(match.group("inline"))
+
+        if inline and current in _ENTRY_SECTIONS and section in _ENTRY_FIELD_SECTIONS:
+            continue
+
+        if start < match.start():
+            sections.setdefault(current, []).append((start, match.start()))
+
+        current = section
+        # Inline content ("skills: python, sql") starts after the colon
+        start = match.start("inline") if inline else match.end()
+
+    if start < len(text):
+        sections.setdefault(current, []).append((start, len(text)))
+
+    return sections
+
+
+def section_text(text: str, sections: Dict[str, List[Span]], names: Iterable[str]) -> str:
+    """
+    Join the content of the named sections, in document order.
+
+    Args:
+        text (str): The text the sections were computed for
+        sections (dict): Output of segment_sections
+        names (iterable): Section names to include
+
+    Returns:
+        str: The selected slices separated by newlines ("" if none occur)
+    """
+    spans = sorted(span for name in names for span in sections.get(name, ()))
+    return "\n".join(text[start:end].strip() for start, end in spans).strip()
@@ -1,12 +1,76 @@
 import spacy
 from spacy.matcher import PhraseMatcher
-from sentence_transformers import SentenceTransformer, util
+from functools import lru_cache
+from itertools import compress, repeat
+import re
 from typing import List
-import torch
+import warnings
 
-# Load models once
-nlp = spacy.load("en_core_web_sm")
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+import numpy as np
+
+from embedding_cache import PhraseEmbeddingCache
+from matcher import MODEL_NAME, get_model
+
+# Skill discovery uses the similarity encoder, so a process holds one MiniLM copy
+EMBEDDING_MODEL_NAME = MODEL_NAME
+
+# Models are loaded once, on first use, so the lexical path never pays for them
+nlp = None
+tokenizer_nlp = None
+phrase_cache = None
+
+
+def get_nlp():
+    global nlp
+    if nlp is None:
+        nlp = spacy.load("en_core_web_sm")
+    return nlp
+
+
+def get_tokenizer_nlp():
+    """Tokenizer-only English pipeline used by the lexical engine mode."""
+    global tokenizer_nlp
+    if tokenizer_nlp is None:
+        tokenizer_nlp = spacy.blank("en")
+    return tokenizer_nlp
+
+
+def get_embedding_model():
+    """The shared MiniLM encoder (matcher.get_model)."""
+    return get_model()
+
+
+def configure_phrase_cache(path: str = None, max_entries: int = 50000) -> PhraseEmbeddingCache:
+    """
+    (Re)create the phrase embedding cache used for skill discovery.
+
+    Args:
+        path (str): SQLite file for the on-disk tier (None = memory only)
+        max_entries (int): In-memory LRU capacity
+    """
+    global phrase_cache
+    if phrase_cache is not None:
+        phrase_cache.close()
+    phrase_cache = PhraseEmbeddingCache(EMBEDDING_MODEL_NAME, max_entries=max_entries, path=path)
+    return phrase_cache
+
+
+def get_phrase_cache() -> PhraseEmbeddingCache:
+    if phrase_cache is None:
+        configure_phrase_cache()
+    return phrase_cache
+
+
+def _encode_phrases(phrases: List[str]) -> np.ndarray:
+    return get_embedding_model().encode(
+        phrases, convert_to_numpy=True, normalize_embeddings=True
+    )
+
+
+@lru_cache(maxsize=4)
+def _known_skill_embeddings(known_skills: tuple) -> np.ndarray:
+    """The taxonomy is fixed per run, so it is encoded once, not per document."""
+    return np.asarray(_encode_phrases(list(known_skills)), dtype=np.float32)
 
 # Generic non-technical terms to filter out
 GENERIC_TERMS = {
@@ -55,18 +119,193 @@ def load_skills(file_path: str) -> List[str]:
 # -----------------------------
 # Build PhraseMatcher
 # -----------------------------
-def build_matcher(skills_list: List[str]) -> PhraseMatcher:
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-    patterns = [nlp.make_doc(skill) for skill in skills_list]
+def build_matcher(skills_list: List[str], lexical: bool = False):
+    """
+    PhraseMatcher over the full spaCy pipeline, or for the lexical mode a
+    LexicalSkillMatcher (same matches, without tokenizing whole documents).
+    """
+    if lexical:
+        return LexicalSkillMatcher(skills_list)
+
+    pipeline = get_nlp()
+    matcher = PhraseMatcher(pipeline.vocab, attr="LOWER")
+    patterns = [pipeline.make_doc(skill) for skill in skills_list]
     matcher.add("SKILLS", patterns)
     return matcher
 
 
+_MISSING = object()
+_END = ""  # trie key marking a complete pattern (no token is empty)
+_LETTER_RUN = re.compile(r"[^\W\d_]+")
+_WHITESPACE_RUN = re.compile(r"(\s+)")
+
+# spaCy release the chunk-skipping rules were checked against (requirements.txt)
+VALIDATED_SPACY_VERSION = "3.7.2"
+
+
+class LexicalSkillMatcher:
+    """
+    Same matches as a PhraseMatcher(attr="LOWER") over the tokenizer-only
+    pipeline, without tokenizing whole documents.
+
+    spaCy splits on whitespace before tokenizing, so tokens are cached per
+    space-separated chunk and a trie of pattern tokens is walked across
+    chunks. New chunks that cannot hold a pattern token are not tokenized
+    at all. That check relies on tokenizer details (its special cases; two
+    letters are never split apart), so it only runs under
+    VALIDATED_SPACY_VERSION and is turned off with a warning otherwise.
+
+    Args:
+        skills_list (list): Skills, as passed to build_matcher
+        max_cached_chunks (int): Chunk cache size before it is reset
+    """
+
+    def __init__(self, skills_list: List[str], max_cached_chunks: int = 500000):
+        self._tokenizer = get_tokenizer_nlp().tokenizer
+        self._trie = {}
+        self._vocab = set()
+        self._chunks = {}
+        self._max_cached_chunks = max_cached_chunks
+
+        for skill in skills_list:
+            tokens = [token.lower_ for token in self._tokenizer(skill)]
+            # Patterns with whitespace tokens are not supported (none in the taxonomy)
+            if not tokens or any(token.isspace() for token in tokens):
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = True
+            self._vocab.update(tokens)
+
+        self._skip_chunks = spacy.__version__ == VALIDATED_SPACY_VERSION
+        if not self._skip_chunks:
+            warnings.warn(
+                f"LexicalSkillMatcher was validated with spaCy {VALIDATED_SPACY_VERSION}, "
+                f"not {spacy.__version__}; tokenizing every chunk (slower)",
+                RuntimeWarning,
+            )
+            return
+
+        # Strings whose presence lets a chunk yield a pattern token
+        hints = set(self._vocab)
+        for special in self._tokenizer.rules:
+            special = special.lower()
+            if any(token.lower_ in self._vocab for token in self._tokenizer(special)):
+                hints.add(special)
+        # A hint starting (ending) with a letter is only a token boundary
+        # when no letter precedes (follows) it; for all-letter hints that
+        # means being one of the chunk's letter runs
+        self._hint_words = {hint for hint in hints if hint.isalpha()}
+        others = sorted(hints - self._hint_words)
+        self._hint = re.compile("|".join(
+            (r"(?<![^\W\d_])" if hint[0].isalpha() else "")
+            + re.escape(hint)
+            + (r"(?![^\W\d_])" if hint[-1].isalpha() else "")
+            for hint in others
+        )) if others else None
+
+    def _may_match(self, chunk: str) -> bool:
+        """False when none of the chunk's tokens can belong to a pattern."""
+        if not self._skip_chunks:
+            return True
+        if not self._hint_words.isdisjoint(_LETTER_RUN.findall(chunk)):
+            return True
+        return self._hint is not None and self._hint.search(chunk) is not None
+
+    def _chunk_items(self, chunk: str):
+        """
+        The chunk's tokens as (LOWER, text, glue) items, None for tokens of
+        no pattern; None if no token belongs to a pattern. Glue is what joins
+        a token to the previous one in a match: " " for the chunk's first
+        token (which only continues a match from the adjacent chunk), else "".
+
+        Line breaks and other whitespace split a chunk as spaCy does, so
+        "end.\nnext" reuses the items of "end." and "next".
+        """
+        parts = _WHITESPACE_RUN.split(chunk)
+        items = None
+        if len(parts) > 1:
+            items = []
+            for part in parts:
+                if not part:
+                    continue
+                if part.isspace():
+                    items.append(None)
+                    continue
+                part_items = self._chunks.get(part, _MISSING)
+                if part_items is _MISSING:
+                    part_items = self._chunk_items(part)
+                items.extend(part_items or (None,))
+            items = tuple(items) if any(items) else None
+        elif self._may_match(chunk):
+            items = tuple(
+                (token.lower_, token.text, " " if i == 0 else "")
+                if token.lower_ in self._vocab else None
+                for i, token in enumerate(self._tokenizer(chunk))
+            )
+            if not any(items):
+                items = None
+
+        if len(self._chunks) >= self._max_cached_chunks:
+            self._chunks.clear()
+        self._chunks[chunk] = items
+        return items
+
+    def __call__(self, text: str) -> set:
+        """Matched span texts of a lowercased text, like {doc[start:end].text}."""
+        pieces = text.split(" ")
+        entries = list(map(self._chunks.get, pieces, repeat(_MISSING)))
+
+        # Items of the chunks that matter, with None wherever a match
+        # cannot continue
+        stream = []
+        previous = None
+        for i in compress(range(len(entries)), entries):
+            entry = entries[i]
+            if entry is _MISSING:
+                entry = self._chunk_items(pieces[i])
+                if entry is None:
+                    continue
+
+            if previous != i - 1:
+                stream.append(None)
+            stream.extend(entry)
+            previous = i
+
+        found = set()
+        stream.append(None)
+        trie = self._trie
+        for start, item in enumerate(stream):
+            if item is None or item[0] not in trie:
+                continue
+            node = trie[item[0]]
+            parts = [item[1]]
+            if _END in node:
+                found.add(item[1])
+
+            position = start + 1
+            item = stream[position]
+            while item is not None:
+                lower, token_text, glue = item
+                node = node.get(lower)
+                if node is None:
+                    break
+                parts.append(glue)
+                parts.append(token_text)
+                if _END in node:
+                    found.add("".join(parts))
+                position += 1
+                item = stream[position]
+
+        return found
+
+
 # -----------------------------
 # Extract known skills
 # -----------------------------
 def extract_known_skills(text: str, matcher: PhraseMatcher) -> List[str]:
-    doc = nlp(text.lower())
+    doc = get_nlp()(text.lower())
     matches = matcher(doc)
 
     found = set()
@@ -80,7 +319,7 @@ def extract_known_skills(text: str, matcher: PhraseMatcher) -> List[str]:
 # Extract candidate noun phrases
 # -----------------------------
 def extract_candidate_phrases(text: str) -> List[str]:
-    doc = nlp(text.lower())
+    doc = get_nlp()(text.lower())
     phrases = set()
 
     for chunk in doc.noun_chunks:
@@ -143,17 +382,16 @@ def filter_skill_like_phrases(
     if not candidate_phrases:
         return []
 
-    skill_embeddings = embedding_model.encode(known_skills, convert_to_tensor=True)
-    phrase_embeddings = embedding_model.encode(candidate_phrases, convert_to_tensor=True)
+    # Unit vectors, so dot products are cosine similarities
+    skill_embeddings = _known_skill_embeddings(tuple(known_skills))
+    phrase_embeddings = get_phrase_cache().encode(candidate_phrases, _encode_phrases)
+    max_scores = (phrase_embeddings @ skill_embeddings.T).max(axis=1)
 
     discovered = set()
 
-    for i, phrase_embedding in enumerate(phrase_embeddings):
-        similarities = util.cos_sim(phrase_embedding, skill_embeddings)
-        max_score = torch.max(similarities).item()
-
+    for phrase, max_score in zip(candidate_phrases, max_scores):
         if max_score > threshold:
-            cleaned = clean_phrase(candidate_phrases[i])
+            cleaned = clean_phrase(phrase)
             matches = extract_known_skills_from_phrase(cleaned, known_skills)
             
             if matches:
@@ -167,13 +405,15 @@ def filter_skill_like_phrases(
 # -----------------------------
 # Final Hybrid Extraction
 # -----------------------------
-def extract_skills_hybrid(text: str, matcher: PhraseMatcher, skills_list: List[str]) -> List[str]:
+def extract_skills_hybrid(text: str, matcher: PhraseMatcher, skills_list: List[str],
+                          discovery_text: str = None) -> List[str]:
     """
     Extract skills using hybrid approach and apply normalization/filtering.
     
     Steps:
     1. Extract known skills using matcher
-    2. Extract candidate phrases
+    2. Extract candidate phrases (from discovery_text when given, e.g. only
+       the resume sections worth parsing and embedding)
     3. Discover new skills via semantic similarity
     4. Normalize all skills (lowercase, strip whitespace)
     5. Remove duplicates
@@ -183,7 +423,7 @@ def extract_skills_hybrid(text: str, matcher: PhraseMatcher, skills_list: List[s
         List of normalized, filtered skills
     """
     known = extract_known_skills(text, matcher)
-    candidates = extract_candidate_phrases(text)
+    candidates = extract_candidate_phrases(text if discovery_text is None else discovery_text)
     discovered = filter_skill_like_phrases(candidates, skills_list)
 
     # Combine all skills
@@ -201,3 +441,30 @@ def extract_skills_hybrid(text: str, matcher: PhraseMatcher, skills_list: List[s
     
     # Return as sorted list for consistency
     return sorted(list(normalized_skills))
+
+
+# -----------------------------
+# Lexical-only Extraction
+# -----------------------------
+def _normalize_skills(skills) -> List[str]:
+    normalized_skills = set()
+    for skill in skills:
+        normalized_skill = skill.lower().strip()
+        if normalized_skill not in GENERIC_TERMS:
+            normalized_skills.add(normalized_skill)
+    return sorted(normalized_skills)
+
+
+def extract_skills_lexical_batch(texts: List[str], matcher: "LexicalSkillMatcher") -> List[List[str]]:
+    """
+    Extract known skills by exact phrase matching only.
+
+    No tagger, parser or embedding model is run, so phrase-based skill
+    discovery is skipped. The matcher must come from
+    build_matcher(..., lexical=True).
+    """
+    return [_normalize_skills(matcher(text.lower())) for text in texts]
+
+
+def extract_skills_lexical(text: str, matcher: "LexicalSkillMatcher") -> List[str]:
+    return extract_skills_lexical_batch([text], matcher)[0]
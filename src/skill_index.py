@@ -0,0 +1,219 @@
+"""
+Inverted Skill Index
+
+Maps each skill to the set of resume IDs that have it, so "must-have"
+boolean filters can prune a pool before any expensive scoring.
+
+Query syntax:
+    python AND (aws OR gcp)
+    "machine learning" AND NOT java
+    tier:frameworks AND docker
+
+Operators are AND, OR, NOT (case-insensitive) and parentheses. Skills can
+be quoted or written bare; consecutive bare words form one skill
+("machine learning"). tier:core_tech, tier:frameworks and tier:tools
+expand to any skill of that taxonomy tier.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Set
+
+from matcher import CORE_TECH, FRAMEWORKS, TOOLS
+
+TIERS = {
+    "core_tech": CORE_TECH,
+    "frameworks": FRAMEWORKS,
+    "tools": TOOLS,
+}
+
+_OPERATORS = {"and", "or", "not"}
+_TOKEN_PATTERN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+
+# -----------------------------
+# Query parsing
+# -----------------------------
+def _tokenize(query: str) -> list:
+    tokens = []
+    position = 0
+    query = query.strip()
+
+    while position < len(query):
+        match = _TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Invalid skill query near: {query[position:]!r}")
+        position = match.end()
+
+        lparen, rparen, quoted, word = match.groups()
+        if lparen:
+            tokens.append(("(", None))
+        elif rparen:
+            tokens.append((")", None))
+        elif quoted is not None:
+            tokens.append(("skill", quoted.strip().lower()))
+        elif word.lower() in _OPERATORS:
+            tokens.append((word.lower(), None))
+        elif word.lower().startswith("tier:"):
+            tier = word.lower()[len("tier:"):]
+            if tier not in TIERS:
+                raise ValueError(f"Unknown skill tier: {tier!r}")
+            tokens.append(("tier", tier))
+        elif tokens and tokens[-1][0] == "word":
+            # Consecutive bare words form one multi-word skill
+            tokens[-1] = ("word", tokens[-1][1] + " " + word.lower())
+        else:
+            tokens.append(("word", word.lower()))
+
+    return [("skill", value) if kind == "word" else (kind, value) for kind, value in tokens]
+
+
+@lru_cache(maxsize=256)
+def parse_query(query: str) -> tuple:
+    """
+    Parse a boolean skill query into a nested tuple expression tree:
+    ("skill", name), ("tier", name), ("not", expr), ("and"|"or", left, right).
+    """
+    tokens = _tokenize(query)
+    if not tokens:
+        raise ValueError("Empty skill query")
+
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError(f"Unexpected end of skill query: {query!r}")
+        kind, value = tokens[position]
+        if expected and kind != expected:
+            raise ValueError(f"Expected {expected!r} in skill query: {query!r}")
+        position += 1
+        return kind, value
+
+    def parse_or():
+        expr = parse_and()
+        while peek() == "or":
+            take()
+            expr = ("or", expr, parse_and())
+        return expr
+
+    def parse_and():
+        expr = parse_not()
+        while peek() == "and":
+            take()
+            expr = ("and", expr, parse_not())
+        return expr
+
+    def parse_not():
+        if peek() == "not":
+            take()
+            return ("not", parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        kind, value = take()
+        if kind == "(":
+            expr = parse_or()
+            take(")")
+            return expr
+        if kind in ("skill", "tier"):
+            return (kind, value)
+        raise ValueError(f"Unexpected {kind!r} in skill query: {query!r}")
+
+    expr = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position][0]!r} in skill query: {query!r}")
+    return expr
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class SkillIndex:
+    """Skill -> posting list (set of resume IDs), updated incrementally."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, frozenset] = {}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._documents
+
+    @classmethod
+    def from_pool(cls, pool: dict) -> "SkillIndex":
+        """Build from resume ID -> resume features (or a list of skills)."""
+        index = cls()
+        for resume_id, features in pool.items():
+            skills = features["skills"] if isinstance(features, dict) else features
+            index.add(resume_id, skills)
+        return index
+
+    @classmethod
+    def from_store(cls, store, candidate_ids: Iterable[str] = None) -> "SkillIndex":
+        """
+        Build from a FeatureStore without loading embeddings, covering only
+        the given stored candidates when candidate_ids is set.
+        """
+        index = cls()
+        if candidate_ids is None:
+            candidate_ids = store.candidate_ids()
+        documents = {str(resume_id): set() for resume_id in candidate_ids}
+        for skill, resume_ids in store.skill_postings(list(documents)).items():
+            index._postings[skill] = set(resume_ids)
+            for resume_id in resume_ids:
+                documents[resume_id].add(skill)
+        index._documents = {resume_id: frozenset(skills) for resume_id, skills in documents.items()}
+        return index
+
+    def add(self, resume_id: str, resume_skills: Iterable[str]):
+        """Index a resume's extracted skills, replacing any previous entry."""
+        if resume_id in self._documents:
+            self.remove(resume_id)
+
+        skills = frozenset(skill.lower().strip() for skill in resume_skills)
+        self._documents[resume_id] = skills
+        for skill in skills:
+            self._postings.setdefault(skill, set()).add(resume_id)
+
+    def remove(self, resume_id: str):
+        for skill in self._documents.pop(resume_id, ()):
+            posting = self._postings[skill]
+            posting.discard(resume_id)
+            if not posting:
+                del self._postings[skill]
+
+    def postings(self, skill: str) -> Set[str]:
+        return self._postings.get(skill.lower().strip(), set())
+
+    def skills(self, resume_id: str) -> frozenset:
+        return self._documents.get(resume_id, frozenset())
+
+    def _evaluate(self, expr: tuple) -> Set[str]:
+        kind = expr[0]
+
+        if kind == "skill":
+            return self.postings(expr[1])
+        if kind == "tier":
+            result = set()
+            for skill in TIERS[expr[1]]:
+                result |= self._postings.get(skill, set())
+            return result
+        if kind == "not":
+            return set(self._documents).difference(self._evaluate(expr[1]))
+        if kind == "and":
+            left = self._evaluate(expr[1])
+            return left.intersection(self._evaluate(expr[2])) if left else set()
+        if kind == "or":
+            return self._evaluate(expr[1]).union(self._evaluate(expr[2]))
+
+        raise ValueError(f"Unknown query node: {kind!r}")
+
+    def query(self, query: str) -> Set[str]:
+        """Return IDs of resumes satisfying a boolean skill query."""
+        return set(self._evaluate(parse_query(query)))
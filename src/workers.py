@@ -0,0 +1,296 @@
+"""
+Memory-Aware Worker Pool
+
+Runs batch tasks in forked worker processes that share the parent's
+already-loaded models copy-on-write:
+
+- Models are loaded in the parent (preload_models) before forking, and the
+  GC is frozen so reference-count updates do not un-share those pages.
+- Torch intra-op threads are capped per worker to avoid oversubscription.
+- A worker retires after max_docs documents or once its RSS exceeds
+  max_rss_mb, and is replaced by a fresh fork of the parent.
+- A task whose worker dies (e.g. OOM-killed) is retried once on a new
+  worker, then reported as failed.
+- Each worker's peak RSS is recorded for the batch summary.
+"""
+
+import gc
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+from collections import deque
+
+
+# -----------------------------
+# Memory accounting
+# -----------------------------
+def _proc_status_mb(field: str):
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024  # kB -> MB
+    except OSError:
+        pass
+    return None
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    current = _proc_status_mb("VmRSS")
+    return current if current is not None else peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kB elsewhere
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+# -----------------------------
+# Model sharing
+# -----------------------------
+def preload_models(mode: str = "full"):
+    """Load every model the given engine mode needs in the current process."""
+    from skill_extracter import get_nlp, get_tokenizer_nlp
+    from matcher import get_model
+
+    if mode == "lexical":
+        get_tokenizer_nlp()
+    else:
+        get_nlp()
+        get_model()  # shared by skill discovery and similarity scoring
+
+
+def cap_torch_threads(threads: int):
+    """Limit torch intra-op parallelism, without importing torch if unused."""
+    if threads and "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+
+# -----------------------------
+# Worker process
+# -----------------------------
+def _worker_loop(worker_id, inbox, outbox, task_fn, max_docs, max_rss_mb, torch_threads,
+                 stats_fn=None):
+    cap_torch_threads(torch_threads)
+    docs = 0
+    reason = "finished"
+
+    while True:
+        item = inbox.get()
+        if item is None:
+            break
+
+        task_id, task, size = item
+        try:
+            outbox.put(("result", worker_id, task_id, task_fn(task), None))
+        except Exception as e:
+            outbox.put(("result", worker_id, task_id, None, f"{type(e).__name__}: {e}"))
+
+        docs += size
+        if max_docs and docs >= max_docs:
+            reason = "max_docs"
+            break
+        if max_rss_mb and rss_mb() > max_rss_mb:
+            reason = "max_rss"
+            break
+
+    stats = {
+        "pid": os.getpid(),
+        "docs": docs,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "reason": reason,
+    }
+    if stats_fn is not None:
+        stats.update(stats_fn())
+    outbox.put(("exit", worker_id, None, stats, None))
+
+
+class WorkerPool:
+    """
+    Forking pool with per-worker document and RSS limits.
+
+    Args:
+        task_fn (callable): Runs one task in a worker; must be defined (and
+            its inputs prepared) in the parent before map_unordered is called
+        workers (int): Number of concurrent worker processes
+        max_docs (int): Recycle a worker after this many documents (0 = never)
+        max_rss_mb (float): Recycle a worker whose RSS exceeds this (0 = never)
+        torch_threads (int): Torch intra-op threads per worker (0 = leave as is)
+        task_size (callable): Documents in a task, for max_docs accounting
+        stats_fn (callable): Extra per-worker stats (a dict) collected in the
+            worker when it exits
+    """
+
+    def __init__(self, task_fn, workers: int, max_docs: int = 0, max_rss_mb: float = 0,
+                 torch_threads: int = 0, task_size=len, stats_fn=None):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("WorkerPool shares models via fork, which this platform lacks")
+
+        self.task_fn = task_fn
+        self.workers = workers
+        self.max_docs = max_docs
+        self.max_rss_mb = max_rss_mb
+        self.torch_threads = torch_threads
+        self.task_size = task_size
+        self.stats_fn = stats_fn
+        self.worker_stats = []
+        self.parent_rss_mb = None
+
+        self._context = multiprocessing.get_context("fork")
+        self._outbox = self._context.Queue()
+        self._live = {}
+        self._next_worker_id = 0
+
+    def _spawn(self):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+
+        inbox = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_loop,
+            args=(worker_id, inbox, self._outbox, self.task_fn,
+                  self.max_docs, self.max_rss_mb, self.torch_threads, self.stats_fn),
+            daemon=True,
+        )
+        process.start()
+        self._live[worker_id] = {"process": process, "inbox": inbox, "task_id": None}
+
+    def _assign(self, worker_id, pending, tasks):
+        if pending:
+            task_id = pending.popleft()
+            self._live[worker_id]["task_id"] = task_id
+            self._live[worker_id]["inbox"].put((task_id, tasks[task_id], self.task_size(tasks[task_id])))
+
+    def _record_stats(self, worker_id, stats):
+        self.worker_stats = [s for s in self.worker_stats if s["worker"] != worker_id]
+        self.worker_stats.append({"worker": worker_id, **stats})
+        self.worker_stats.sort(key=lambda s: s["worker"])
+
+    def _retire(self, worker_id, stats):
+        worker = self._live.pop(worker_id)
+        worker["process"].join()
+        self._record_stats(worker_id, stats)
+
+    def map_unordered(self, tasks):
+        """
+        Run every task and yield (task, result, error) as tasks finish.
+
+        error is None on success, otherwise a message (result is None).
+        """
+        tasks = list(tasks)
+        pending = deque(range(len(tasks)))
+        attempts = [0] * len(tasks)
+        done = set()
+
+        # Everything loaded so far is shared read-only with the workers
+        gc.collect()
+        gc.freeze()
+        self.parent_rss_mb = round(rss_mb(), 1)
+
+        try:
+            for _ in range(min(self.workers, len(tasks))):
+                self._spawn()
+            for worker_id in list(self._live):
+                self._assign(worker_id, pending, tasks)
+
+            while len(done) < len(tasks):
+                try:
+                    kind, worker_id, task_id, payload, error = self._outbox.get(timeout=1)
+                except queue.Empty:
+                    for failed_id, message in self._reap_dead(pending, attempts, done, tasks):
+                        done.add(failed_id)
+                        yield tasks[failed_id], None, message
+                    continue
+
+                worker = self._live.get(worker_id)
+
+                if kind == "result":
+                    if worker is not None and worker["task_id"] == task_id:
+                        worker["task_id"] = None
+                    if task_id in done:
+                        # Late result of a task already retried elsewhere
+                        continue
+                    done.add(task_id)
+                    if task_id in pending:
+                        pending.remove(task_id)
+                    yield tasks[task_id], payload, error
+                    # Idle workers pick up the next task; a retiring one hands
+                    # it back when its exit message arrives
+                    if worker is not None and worker["task_id"] is None:
+                        self._assign(worker_id, pending, tasks)
+                elif kind == "exit":
+                    if worker is None:
+                        # Already reaped as dead; keep the real stats
+                        self._record_stats(worker_id, payload)
+                        continue
+                    task_id = worker["task_id"]
+                    self._retire(worker_id, payload)
+                    if task_id is not None and task_id not in done:
+                        pending.appendleft(task_id)
+                    if pending:
+                        self._spawn()
+                        self._assign(self._next_worker_id - 1, pending, tasks)
+        finally:
+            self._shutdown()
+            gc.unfreeze()
+
+    def _reap_dead(self, pending, attempts, done, tasks):
+        """
+        Handle workers that died without reporting (e.g. OOM kill).
+
+        Returns:
+            list: (task_id, error) for tasks that have now failed twice
+        """
+        failed = []
+
+        for worker_id, worker in list(self._live.items()):
+            process = worker["process"]
+            if process.is_alive():
+                continue
+
+            task_id = worker["task_id"]
+            self._live.pop(worker_id)
+            self._record_stats(worker_id, {
+                "pid": process.pid,
+                "docs": None,
+                "peak_rss_mb": None,
+                "reason": f"died (exit code {process.exitcode})",
+            })
+
+            if task_id is not None and task_id not in done:
+                attempts[task_id] += 1
+                if attempts[task_id] < 2:
+                    pending.appendleft(task_id)
+                else:
+                    failed.append((task_id, f"worker died (exit code {process.exitcode})"))
+
+            if pending:
+                self._spawn()
+                self._assign(self._next_worker_id - 1, pending, tasks)
+
+        return failed
+
+    def _shutdown(self):
+        for worker in self._live.values():
+            worker["inbox"].put(None)
+
+        while self._live:
+            try:
+                kind, worker_id, _, payload, _ = self._outbox.get(timeout=5)
+            except queue.Empty:
+                break
+            if kind == "exit" and worker_id in self._live:
+                self._retire(worker_id, payload)
+
+        for worker in self._live.values():
+            worker["process"].terminate()
+            worker["process"].join()
+        self._live.clear()
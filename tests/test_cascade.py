@@ -0,0 +1,39 @@
+import os
+
+from cascade import DEFAULT_CEILINGS, DEFAULT_CUTOFF, cascade_rank
+from core_engine import extract_jd_features, extract_pool_features, load_taxonomy, score_pool
+from regression import _resume_texts, load_corpus
+from scoring import DEFAULT_PROFILE, score_upper_bound
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(ROOT, "data", "regression")
+SKILLS_FILE = os.path.join(ROOT, "data", "skills.txt")
+
+
+def test_default_ceilings_let_weak_candidates_exit_at_skill_tier():
+    # With ceilings of 100 the similarity weights alone reach the cutoff
+    assert score_upper_bound(0, 100, 100, DEFAULT_PROFILE) >= DEFAULT_CUTOFF
+    for ceilings in DEFAULT_CEILINGS.values():
+        assert score_upper_bound(0, ceilings["project_ceiling"], ceilings["semantic_ceiling"],
+                                 DEFAULT_PROFILE) < DEFAULT_CUTOFF
+
+    corpus = load_corpus(CORPUS_DIR)
+    skills_list, nlp_matcher = load_taxonomy(SKILLS_FILE, "lexical")
+    pool = extract_pool_features(_resume_texts(corpus), nlp_matcher, skills_list, mode="lexical")
+
+    skill_exits = 0
+    for jd_text in corpus["jds"].values():
+        jd_features = extract_jd_features(jd_text, nlp_matcher, skills_list, "lexical")
+        outcome = cascade_rank(jd_features, pool, DEFAULT_PROFILE)
+        skill_exits += outcome["tier_counts"]["skill"]
+
+        # Nobody who reaches the cutoff when fully scored was dropped
+        full = dict(score_pool(jd_features, pool, DEFAULT_PROFILE))
+        ranked = dict(outcome["ranked"])
+        for candidate_id, result in full.items():
+            if result["final_score"] >= DEFAULT_CUTOFF:
+                assert candidate_id in ranked
+        assert outcome["tier_counts"]["over_ceiling"] == 0
+
+    assert skill_exits > 0
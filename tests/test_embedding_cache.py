@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pytest
+
+from embedding_cache import PhraseEmbeddingCache
+
+
+class StubEncoder:
+    """Deterministic encode_fn that records every batch it is asked for."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, phrases):
+        self.calls.append(list(phrases))
+        return np.array([[len(phrase), sum(map(ord, phrase))] for phrase in phrases], dtype=float)
+
+
+def _vector(phrase):
+    return np.array([len(phrase), sum(map(ord, phrase))], dtype=np.float32)
+
+
+def test_encodes_distinct_unseen_phrases_once_and_counts():
+    cache = PhraseEmbeddingCache("model", max_entries=10)
+    encoder = StubEncoder()
+
+    vectors = cache.encode(["Rest  API", "rest api", "docker"], encoder)
+
+    assert encoder.calls == [["rest api", "docker"]]
+    assert vectors.dtype == np.float32 and vectors.shape == (3, 2)
+    assert np.array_equal(vectors[0], vectors[1])
+    assert np.array_equal(vectors[2], _vector("docker"))
+
+    cache.encode(["docker", "kafka"], encoder)
+    assert encoder.calls[1:] == [["kafka"]]
+    assert cache.stats() == {
+        "lookups": 4, "memory_hits": 1, "disk_hits": 0, "misses": 3,
+        "hit_rate": 0.25, "entries": 3,
+    }
+
+    cache.reset_stats()
+    assert cache.stats()["lookups"] == 0
+    assert cache.encode([], encoder).shape == (0, 0)
+
+
+def test_lru_evicts_least_recently_used_at_max_entries():
+    cache = PhraseEmbeddingCache("model", max_entries=2)
+    encoder = StubEncoder()
+
+    cache.encode(["a", "b"], encoder)
+    cache.encode(["a"], encoder)  # "a" is now the most recently used
+    cache.encode(["c"], encoder)  # evicts "b"
+
+    assert cache.stats()["entries"] == 2
+    cache.encode(["a", "b"], encoder)
+    assert encoder.calls[-1] == ["b"]
+    assert cache.memory_hits == 2 and cache.misses == 4
+
+
+def test_disk_tier_is_reused_across_instances(tmp_path):
+    path = str(tmp_path / "cache" / "phrases.db")
+    first = PhraseEmbeddingCache("model", path=path)
+    first.encode(["rest api", "docker"], StubEncoder())
+    first.close()
+
+    second = PhraseEmbeddingCache("model", path=path)
+    encoder = StubEncoder()
+    vectors = second.encode(["docker", "rest api", "docker"], encoder)
+
+    assert encoder.calls == []
+    assert second.disk_hits == 2 and second.misses == 0
+    assert np.array_equal(vectors[0], _vector("docker"))
+    # Promoted to memory: the next lookup does not touch the disk
+    second.encode(["docker"], encoder)
+    assert second.memory_hits == 1
+
+    # Keys include the model ID
+    other = PhraseEmbeddingCache("other-model", path=path)
+    other.encode(["docker"], encoder)
+    assert encoder.calls == [["docker"]] and other.disk_hits == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_process_reconnects(tmp_path):
+    cache = PhraseEmbeddingCache("model", path=str(tmp_path / "phrases.db"))
+    cache.encode(["docker"], StubEncoder())
+    parent_conn = cache._conn
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child: must not reuse the parent's connection
+        status = 1
+        try:
+            cache._memory.clear()
+            encoder = StubEncoder()
+            cache.encode(["docker", "kafka"], encoder)
+            reconnected = cache._conn is not parent_conn and cache._conn_pid == os.getpid()
+            if reconnected and encoder.calls == [["kafka"]] and cache.disk_hits == 1:
+                status = 0
+            cache.close()
+        finally:
+            os.write(write_end, bytes([status]))
+            os._exit(0)
+
+    os.close(write_end)
+    status = os.read(read_end, 1)
+    os.waitpid(pid, 0)
+    os.close(read_end)
+    assert status == b"\0"
+
+    # The child's write is visible here, and the parent's connection still works
+    encoder = StubEncoder()
+    cache._memory.clear()
+    cache.encode(["kafka"], encoder)
+    assert cache._conn is parent_conn
+    assert encoder.calls == [] and cache.disk_hits == 1
@@ -0,0 +1,256 @@
+import os
+
+import numpy as np
+import pytest
+
+import core_engine
+from feature_store import EMBEDDINGS_FILE, SCHEMA_VERSION, FeatureStore
+from skill_index import SkillIndex
+
+
+SKILLS = ["python", "sql", "docker"]
+
+
+def _features(text, skills, embedding=None):
+    return {
+        "text_hash": core_engine.text_hash(text),
+        "skills": skills,
+        "experience": {"python": 3.0},
+        "project_text": "built a " + text,
+        "embedding": embedding,
+        "project_embedding": None,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    with FeatureStore(str(tmp_path / "store")) as store:
+        yield store
+
+
+def test_put_get_and_replace(store):
+    store.put_many({
+        "a": _features("resume a", ["python", "sql"], np.ones(4)),
+        "b": _features("resume b", ["docker"]),
+    })
+
+    assert len(store) == 2 and "a" in store and "c" not in store
+    a = store.get("a")
+    assert a["skills"] == ["python", "sql"]
+    assert a["experience"] == {"python": 3.0}
+    assert np.array_equal(a["embedding"], np.ones(4, dtype=np.float32))
+    assert store.get("b")["embedding"] is None
+    assert store.get("c") is None
+
+    store.put("a", _features("resume a v2", ["docker"], np.full(4, 2.0)))
+
+    a = store.get("a")
+    assert len(store) == 2
+    assert a["text_hash"] == core_engine.text_hash("resume a v2")
+    assert np.array_equal(a["embedding"], np.full(4, 2.0, dtype=np.float32))
+    assert set(store.get_many(["a", "b", "missing"])) == {"a", "b"}
+
+
+def test_skill_postings_follow_replacement(store):
+    store.put_many({
+        "a": _features("resume a", ["python", "sql"]),
+        "b": _features("resume b", ["python"]),
+    })
+    assert store.skill_postings() == {"python": ["a", "b"], "sql": ["a"]}
+
+    store.put("a", _features("resume a v2", ["docker"]))
+
+    assert store.skill_postings() == {"docker": ["a"], "python": ["b"]}
+    assert store.candidates_with_skill("Python") == ["b"]
+
+
+def test_dimension_mismatch_rejected(store):
+    store.put("a", _features("resume a", [], np.ones(4)))
+
+    with pytest.raises(ValueError):
+        store.put("b", _features("resume b", [], np.ones(3)))
+
+
+def test_partial_row_is_dropped_before_append(store):
+    store.put("a", _features("resume a", [], np.ones(4)))
+    with open(os.path.join(store.path, EMBEDDINGS_FILE), "ab") as f:
+        f.write(b"\0" * 6)  # a writer died mid-row
+
+    store.put("b", _features("resume b", [], np.full(4, 2.0)))
+
+    assert np.array_equal(store.get("a")["embedding"], np.ones(4, dtype=np.float32))
+    assert np.array_equal(store.get("b")["embedding"], np.full(4, 2.0, dtype=np.float32))
+
+
+def _matrix_rows(store):
+    return os.path.getsize(os.path.join(store.path, EMBEDDINGS_FILE)) // (4 * 4)
+
+
+def test_stored_vectors_are_not_appended_again(store):
+    a = _features("resume a", ["python"], np.ones(4))
+    store.put("a", a)
+
+    a["project_embedding"] = np.full(4, 3.0)
+    store.put("a", a)
+    store.put("a", a)
+
+    assert _matrix_rows(store) == 2
+    stored = store.get("a")
+    assert np.array_equal(stored["embedding"], np.ones(4, dtype=np.float32))
+    assert np.array_equal(stored["project_embedding"], np.full(4, 3.0, dtype=np.float32))
+
+
+def test_compact_drops_replaced_rows(store):
+    store.put_many({
+        "a": _features("resume a", [], np.ones(4)),
+        "b": _features("resume b", [], np.full(4, 2.0)),
+    })
+    store.get("b")  # maps the old file
+    store.put("a", _features("resume a v2", [], np.full(4, 5.0)))
+    assert _matrix_rows(store) == 3
+
+    assert store.compact() == 1
+    assert store.compact() == 0
+    assert _matrix_rows(store) == 2
+    assert np.array_equal(store.get("a")["embedding"], np.full(4, 5.0, dtype=np.float32))
+    assert np.array_equal(store.get("b")["embedding"], np.full(4, 2.0, dtype=np.float32))
+
+
+def test_stamp_mismatch_clears_store(store):
+    assert not store.ensure_stamp("taxonomy-1", "model-1")
+    store.put("a", _features("resume a", ["python"], np.ones(4)))
+
+    assert store.ensure_stamp("taxonomy-1", "model-1")
+    assert "a" in store
+    assert store.stamp() == {
+        "schema_version": str(SCHEMA_VERSION),
+        "taxonomy_hash": "taxonomy-1",
+        "model_id": "model-1",
+    }
+
+    assert not store.ensure_stamp("taxonomy-2", "model-1")
+    assert len(store) == 0 and store.skill_postings() == {}
+    assert store.embedding_dim is None
+
+
+def test_stamp_is_checked_once_and_hashes_per_batch(store, monkeypatch):
+    store.ensure_stamp("taxonomy-1", "model-1")
+    store.put_many({
+        "a": _features("resume a", ["python"]),
+        "b": _features("resume b", ["sql"]),
+    })
+
+    def stamp():
+        raise AssertionError("stamp re-read")
+
+    monkeypatch.setattr(store, "stamp", stamp)
+    assert store.ensure_stamp("taxonomy-1", "model-1")
+
+    assert store.text_hashes(["a", "missing"]) == {"a": core_engine.text_hash("resume a")}
+    assert set(store.text_hashes()) == {"a", "b"}
+
+
+@pytest.fixture
+def fake_extraction(monkeypatch):
+    """Full-mode extraction without spaCy/MiniLM; records which texts were processed."""
+    calls = []
+
+    def extract_resume_features(text, nlp_matcher, skills_list, mode="full", resume_skills=None):
+        calls.append(text)
+        return {
+            "mode": mode,
+            "text": text,
+            "text_hash": core_engine.text_hash(text),
+            "skills": [skill for skill in skills_list if skill in text],
+            "experience": {},
+            "project_text": "",
+        }
+
+    monkeypatch.setattr(core_engine, "extract_resume_features", extract_resume_features)
+    monkeypatch.setattr(
+        core_engine, "encode_texts", lambda texts: np.ones((len(texts), 4), dtype=np.float32)
+    )
+    return calls
+
+
+def test_pool_reuses_unchanged_resumes(store, fake_extraction):
+    texts = {"a": "python and sql", "b": "docker"}
+    core_engine.extract_pool_features(texts, None, SKILLS, store=store)
+    assert fake_extraction == ["python and sql", "docker"]
+
+    fake_extraction.clear()
+    pool = core_engine.extract_pool_features(
+        {"a": "python and sql", "b": "docker and python"}, None, SKILLS, store=store
+    )
+
+    assert fake_extraction == ["docker and python"]
+    assert pool["a"]["skills"] == ["python", "sql"]
+    assert pool["a"]["text"] == "python and sql"
+    assert pool["b"]["skills"] == ["python", "docker"]
+
+
+def test_pool_ignores_store_built_with_another_taxonomy(store, fake_extraction):
+    texts = {"a": "python and sql"}
+    core_engine.extract_pool_features(texts, None, SKILLS, store=store)
+
+    fake_extraction.clear()
+    pool = core_engine.extract_pool_features(texts, None, SKILLS + ["kafka"], store=store)
+
+    assert fake_extraction == ["python and sql"]
+    assert store.stamp()["taxonomy_hash"] == core_engine.taxonomy_hash(SKILLS + ["kafka"])
+    assert len(store) == 1 and pool["a"]["skills"] == ["python", "sql"]
+
+
+def test_pool_without_embeddings_fills_them_on_reuse(store, fake_extraction):
+    texts = {"a": "python and sql"}
+    pool = core_engine.extract_pool_features(texts, None, SKILLS, store=store, embed=False)
+    assert pool["a"].get("embedding") is None
+    assert store.get("a")["embedding"] is None
+
+    fake_extraction.clear()
+    pool = core_engine.extract_pool_features(texts, None, SKILLS, store=store)
+
+    assert fake_extraction == []
+    assert pool["a"]["embedding"] is not None
+    assert np.array_equal(store.get("a")["embedding"], np.ones(4, dtype=np.float32))
+
+
+def test_must_have_filters_before_embedding(store, fake_extraction, monkeypatch):
+    texts = {"a": "python and sql", "b": "docker"}
+    pool = core_engine.extract_pool_features(
+        texts, None, SKILLS, store=store, must_have="python AND NOT docker",
+    )
+
+    assert list(pool) == ["a"]
+    assert pool["a"]["embedding"] is not None
+    # Filtered resumes are still stored, just never embedded
+    assert store.get("b")["skills"] == ["docker"]
+    assert store.get("b")["embedding"] is None
+
+    # Stored resumes are filtered on their stored skills before loading
+    loaded = []
+    get_many = store.get_many
+    monkeypatch.setattr(store, "get_many", lambda ids: loaded.extend(ids) or get_many(ids))
+    fake_extraction.clear()
+    pool = core_engine.extract_pool_features(
+        dict(texts, c="sql and docker"), None, SKILLS, store=store, must_have="docker",
+    )
+
+    assert sorted(pool) == ["b", "c"]
+    assert fake_extraction == ["sql and docker"]
+    assert loaded == ["b"]
+
+
+def test_skill_index_from_store_covers_given_candidates(store):
+    store.put_many({
+        "a": _features("resume a", ["python", "sql"]),
+        "b": _features("resume b", []),
+        "c": _features("resume c", ["python"]),
+    })
+
+    index = SkillIndex.from_store(store, ["a", "b"])
+
+    assert len(index) == 2 and "c" not in index
+    assert index.query("python") == {"a"}
+    assert index.query("NOT sql") == {"b"}
+    assert SkillIndex.from_store(store).query("python") == {"a", "c"}
@@ -0,0 +1,125 @@
+import os
+import random
+import re
+
+import numpy as np
+import pytest
+import spacy
+from spacy.matcher import PhraseMatcher
+
+from matcher import LEXICAL_FEATURES, _extract_skill_years, lexical_vectors
+from skill_extracter import LexicalSkillMatcher, build_matcher, get_tokenizer_nlp, load_skills
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILLS = load_skills(os.path.join(ROOT, "data", "skills.txt"))
+
+TRICKY = [
+    "Python, SQL and C++ (node.js); c# / .net",
+    "ci/cd\nci / cd ci/ cd",
+    "machine learning\nmachine  learning machine\tlearning machine learning.",
+    "a/b testing, A / B testing and a/b-testing",
+    "email c@r.com, C, R, c-level, r&d, (c) 2021",
+    "i'ma dev, ima dev; ain't no :) c++:) =d 8-d",
+    "5+ yrs of java\n3 years python",
+    "   leading spaces \n\n trailing  \t",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def matchers():
+    nlp = get_tokenizer_nlp()
+    reference = PhraseMatcher(nlp.vocab, attr="LOWER")
+    reference.add("SKILLS", [nlp.make_doc(skill) for skill in SKILLS])
+    return reference, build_matcher(SKILLS, lexical=True)
+
+
+def _random_texts(count, seed=0):
+    rng = random.Random(seed)
+    words = ["built", "Python3", "A/B", "R&D", "e.g.", "ML-based", "x", "(react)", "AWS's", ":)"]
+    separators = [" ", "  ", "\n", "\t", ",", ", ", "/", "-", ".", "(", ")", " & ", ":", " \n ", "+", "#"]
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 25)):
+            word = rng.choice(SKILLS) if rng.random() < 0.6 else rng.choice(words)
+            parts.append(word.upper() if rng.random() < 0.3 else word)
+            parts.append(rng.choice(separators))
+        texts.append("".join(parts))
+    return texts
+
+
+def test_lexical_matcher_finds_what_the_phrase_matcher_finds(matchers):
+    reference, fast = matchers
+    tokenizer = get_tokenizer_nlp().tokenizer
+
+    for text in TRICKY + _random_texts(500):
+        doc = tokenizer(text.lower())
+        expected = {doc[start:end].text for _, start, end in reference(doc)}
+        assert fast(text.lower()) == expected, text
+
+
+def test_skipped_chunks_hold_no_pattern_token(matchers):
+    _, fast = matchers
+    tokenizer = get_tokenizer_nlp().tokenizer
+    vocab = sorted(fast._vocab)
+    pieces = list("abcrxz019.,-/#+&'()%$:;=_é²") + ["km", "gb", "ima", "ain't", "°c."]
+
+    rng = random.Random(0)
+    for _ in range(20000):
+        chunk = "".join(
+            rng.choice(vocab) if rng.random() < 0.35 else rng.choice(pieces)
+            for _ in range(rng.randint(1, 4))
+        )
+        if not fast._may_match(chunk):
+            assert not any(token.lower_ in fast._vocab for token in tokenizer(chunk)), chunk
+
+
+def test_other_spacy_version_tokenizes_every_chunk(matchers, monkeypatch):
+    reference, _ = matchers
+    tokenizer = get_tokenizer_nlp().tokenizer
+    monkeypatch.setattr(spacy, "__version__", "99.0.0")
+
+    with pytest.warns(RuntimeWarning, match="validated with spaCy"):
+        fallback = LexicalSkillMatcher(SKILLS)
+
+    assert all(fallback._may_match(chunk) for chunk in ("xyz", "12", ":)"))
+    for text in TRICKY + _random_texts(100, seed=1):
+        doc = tokenizer(text.lower())
+        assert fallback(text.lower()) == {doc[start:end].text for _, start, end in reference(doc)}
+
+
+def test_lexical_vectors_equal_hashing_vectorizer():
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.preprocessing import normalize
+
+    texts = TRICKY + _random_texts(200) + ["the and of", "Python PYTHON python"]
+    expected = HashingVectorizer(
+        n_features=LEXICAL_FEATURES, stop_words="english", alternate_sign=False, norm=None,
+    ).transform(texts).tocsr()
+    expected.data = 1 + np.log(expected.data)
+    expected = normalize(expected)
+
+    vectors = lexical_vectors(texts)
+
+    assert vectors.shape == expected.shape
+    assert np.array_equal(vectors.indptr, expected.indptr)
+    assert np.array_equal(vectors.indices, expected.indices)
+    assert np.array_equal(vectors.data, expected.data)
+    assert lexical_vectors([]).shape == (0, LEXICAL_FEATURES)
+
+
+def test_skill_years_match_the_per_skill_pattern():
+    rng = random.Random(0)
+    pieces = ["3", "12", "+", " ", "\n", "years", "yrs", "year", "of", "python", "sql", "java", ","]
+    skills = {"python", "sql", "java"}
+
+    for _ in range(3000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        expected = {}
+        for skill in skills:
+            match = re.search(rf'(\d+)\+?\s*(?:years|yrs).*?\b{skill}\b', text)
+            if match:
+                expected[skill] = int(match.group(1))
+        assert _extract_skill_years(text, skills) == expected, text
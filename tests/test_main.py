@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from main import parse_args, run
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(ROOT, "data", "regression")
+
+
+def _args(output, *options):
+    return parse_args([
+        "--jd", os.path.join(CORPUS_DIR, "jds", "jd00.txt"),
+        "--resumes", os.path.join(CORPUS_DIR, "resumes"),
+        "--skills", os.path.join(ROOT, "data", "skills.txt"),
+        "--mode", "lexical", "-o", str(output), "-q", *options,
+    ])
+
+
+def test_cascade_summary_counts_only_full_results_as_scored(tmp_path):
+    output = tmp_path / "out.jsonl"
+
+    summary = run(_args(output, "--cascade-cutoff", "50"))
+
+    with open(output, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    exited = [record for record in records if "exit_tier" in record]
+    assert exited and summary["exited"] == len(exited)
+    assert summary["scored"] == len(records) - len(exited)
+    assert summary["tier_counts"]["semantic"] == summary["scored"]
+
+
+def test_resume_refuses_a_different_run_configuration(tmp_path):
+    output = tmp_path / "out.jsonl"
+    total = run(_args(output, "--cascade-cutoff", "50"))["total"]
+
+    assert run(_args(output, "--cascade-cutoff", "50"))["skipped"] == total
+
+    for options in (["--cascade-cutoff", "40"], ["--must-have", "python"], []):
+        with pytest.raises(SystemExit, match="different options"):
+            run(_args(output, *options))
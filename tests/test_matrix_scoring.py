@@ -0,0 +1,81 @@
+import random
+import zlib
+
+import numpy as np
+import pytest
+
+import core_engine
+from matcher import CORE_TECH, FRAMEWORKS, TOOLS
+from matrix_scoring import matrix_result, score_matrix
+from scoring import ScoringProfile
+
+
+SKILLS = sorted(CORE_TECH)[:6] + sorted(FRAMEWORKS)[:6] + sorted(TOOLS)[:6] + ["graphql", "kafka"]
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch):
+    """Unit MiniLM-sized vectors derived from the text, without the model."""
+
+    def encode_texts(texts):
+        vectors = []
+        for text in texts:
+            rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+            # A shared direction of varying weight spreads similarities over 0-100
+            vectors.append(rng.normal(size=384) + rng.uniform(0, 3))
+        vectors = np.array(vectors, dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    monkeypatch.setattr(core_engine, "encode_texts", encode_texts)
+
+
+def _jd(rng, index):
+    skills = rng.sample(SKILLS, rng.randint(0, 8))
+    return {
+        "mode": "full",
+        "text": f"job {index}: " + " ".join(skills),
+        "skills": skills,
+        "frequency": {skill: rng.randint(1, 4) for skill in skills},
+        "experience": {skill: rng.randint(1, 6) for skill in skills if rng.random() < 0.4},
+    }
+
+
+def _resume(rng, index):
+    skills = rng.sample(SKILLS, rng.randint(0, 10))
+    return {
+        "mode": "full",
+        "text": "" if index == 0 else f"resume {index}: " + " ".join(skills),
+        "project_text": "" if rng.random() < 0.2 else f"project {index} with {rng.choice(SKILLS)}",
+        "skills": skills,
+        "experience": {skill: rng.randint(0, 8) for skill in skills if rng.random() < 0.5},
+    }
+
+
+def _profile(rng, index):
+    return ScoringProfile(
+        name=f"random-{index}",
+        skill_weight=rng.uniform(0, 3),
+        project_weight=rng.uniform(0, 3),
+        semantic_weight=rng.uniform(0.1, 3),
+        experience_penalty=rng.choice([0, 2.5, 5, 10, 40]),
+        tier_weights={tier: rng.choice([0, 0.5, 1, 2, 3, 5])
+                      for tier in ("core_tech", "frameworks", "tools", "default")},
+        frequency_boost=rng.choice([0, 0.1, 0.2, 0.75]),
+    )
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_full_mode_matrix_equals_score_pool(fake_encoder, seed):
+    rng = random.Random(seed)
+    jd_pool = {f"jd{i}": _jd(rng, i) for i in range(4)}
+    pool = {f"r{i}": _resume(rng, i) for i in range(25)}
+    profile = _profile(rng, seed)
+
+    matrix = score_matrix(jd_pool, pool, profile)
+
+    assert matrix["mode"] == "full"
+    for jd_id, jd_features in jd_pool.items():
+        for candidate_id, expected in core_engine.score_pool(jd_features, pool, profile):
+            assert matrix_result(matrix, jd_pool, pool, jd_id, candidate_id) == expected, (
+                jd_id, candidate_id,
+            )
@@ -0,0 +1,116 @@
+import json
+import os
+
+import pytest
+
+from regression import (
+    FULL_GOLDEN_FILE,
+    GOLDEN_FILE,
+    applicable_paths,
+    check_paths,
+    compare_results,
+    load_corpus,
+)
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(ROOT, "data", "regression")
+SKILLS_FILE = os.path.join(ROOT, "data", "skills.txt")
+
+
+def _result(final_score, approximated=None, **scores):
+    result = {
+        "final_score": final_score,
+        "skill_score": 50.0,
+        "experience_adjusted_score": 50.0,
+        "project_score": 50.0,
+        "semantic_score": 50.0,
+        "matched_skills": ["python"],
+        "missing_skills": [],
+        "jd_skills": ["python"],
+        "resume_skills": ["python"],
+        "approximated": approximated or {},
+    }
+    result.update(scores)
+    return result
+
+
+def _check_golden(golden_file):
+    with open(os.path.join(CORPUS_DIR, golden_file), "r", encoding="utf-8") as f:
+        golden = json.load(f)
+
+    reports = check_paths(load_corpus(CORPUS_DIR), golden, applicable_paths(golden["mode"]),
+                          SKILLS_FILE)
+
+    failed = {
+        name: report.get("failures") or report.get("skipped")
+        for name, report in reports.items() if not report["passed"]
+    }
+    assert not failed
+    # The deployed cascade must keep scoring some candidates in full
+    assert reports["cascade_topk"]["pairs"] > 0
+    return reports
+
+
+def test_golden_corpus_passes_every_path():
+    _check_golden(GOLDEN_FILE)
+
+
+def test_full_mode_golden_passes_every_path():
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("en_core_web_sm")
+    if not os.path.exists(os.path.join(CORPUS_DIR, FULL_GOLDEN_FILE)):
+        pytest.skip(f"no {FULL_GOLDEN_FILE}; record it with python src/regression.py record "
+                    f"--corpus data/regression --golden data/regression/{FULL_GOLDEN_FILE}")
+
+    reports = _check_golden(FULL_GOLDEN_FILE)
+    assert "store" in reports
+
+
+def test_skipped_path_does_not_pass():
+    with open(os.path.join(CORPUS_DIR, GOLDEN_FILE), "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    assert golden["mode"] == "lexical" and "store" not in applicable_paths("lexical")
+
+    reports = check_paths(load_corpus(CORPUS_DIR), golden, ["store"], SKILLS_FILE)
+
+    assert reports["store"]["skipped"] and not reports["store"]["passed"]
+
+
+def test_pruning_a_golden_top_candidate_fails():
+    golden = {"jd": {"a": _result(80.0), "b": _result(60.0), "c": _result(20.0)}}
+
+    report = compare_results(golden, {"jd": {"a": _result(80.0)}}, pruned_below=50)
+    assert not report["passed"]
+    assert report["failures"] == ["jd / b: missing result"]
+
+    report = compare_results(golden, {"jd": {"a": _result(80.0), "b": _result(60.0)}},
+                             pruned_below=50)
+    assert report["passed"] and report["pruned"] == 1
+
+
+@pytest.mark.parametrize("semantic_score, passed", [(80.0, True), (5.0, False)])
+def test_approximated_fields_use_loose_tolerances(semantic_score, passed):
+    golden = {"jd": {"a": _result(60.0), "b": _result(40.0)}}
+    approximated = {"semantic_score": "term-vector cosine instead of MiniLM embeddings"}
+    candidate = {"jd": {
+        "a": _result(60.0, approximated, semantic_score=semantic_score),
+        "b": _result(40.0, approximated),
+    }}
+
+    report = compare_results(golden, candidate)
+
+    assert report["passed"] is passed
+    assert report["fields"]["semantic_score"]["approximated"]
+
+
+def test_approximated_path_keeps_a_rank_floor():
+    golden = {"jd": {name: _result(score) for name, score in zip("abcd", (90, 80, 70, 60))}}
+    approximated = {"semantic_score": "term-vector cosine instead of MiniLM embeddings"}
+    reversed_scores = {name: _result(score, approximated)
+                       for name, score in zip("abcd", (75, 76, 77, 78))}
+
+    report = compare_results(golden, {"jd": reversed_scores})
+
+    assert not report["passed"]
+    assert report["rank"]["min_tau"] == -1.0
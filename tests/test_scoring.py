@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+from scoring import DEFAULT_PROFILE, ScoringProfile, score_upper_bound
+
+
+def test_component_weights_are_normalized():
+    profile = ScoringProfile(skill_weight=6, project_weight=2, semantic_weight=2)
+
+    assert profile.component_weights == pytest.approx((0.6, 0.2, 0.2))
+    # A half and a full skill match no longer both clamp to 100
+    assert score_upper_bound(50, 100, 100, profile) == 70
+    assert score_upper_bound(100, 100, 100, profile) == 100
+    assert DEFAULT_PROFILE.component_weights == (0.5, 0.2, 0.3)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"skill_weight": -0.1},
+    {"skill_weight": 0, "project_weight": 0, "semantic_weight": 0},
+    {"experience_penalty": -1},
+    {"frequency_boost": -0.2},
+    {"tier_weights": {"core_tech": 3, "frameworks": -2, "tools": 1, "default": 1}},
+    {"tier_weights": {"core_tech": 3}},
+])
+def test_invalid_profiles_are_rejected(overrides):
+    with pytest.raises(ValueError):
+        ScoringProfile(**overrides)
+
+
+def test_profile_is_hashable_and_round_trips():
+    profile = ScoringProfile.from_dict({"name": "ops", "tier_weights": {"tools": 4}})
+
+    assert hash(DEFAULT_PROFILE) == hash(ScoringProfile())
+    assert {DEFAULT_PROFILE, profile} == {ScoringProfile(), profile}
+    with pytest.raises(TypeError):
+        profile.tier_weights["tools"] = 1
+
+    assert ScoringProfile.from_dict(profile.to_dict()) == profile
+    assert pickle.loads(pickle.dumps(profile)) == profile
+    assert profile.to_dict()["tier_weights"]["tools"] == 4
@@ -0,0 +1,70 @@
+from sections import segment_sections, section_text
+from matcher import extract_project_section
+
+
+RESUME = """jane doe
+backend engineer with 4 years of python
+
+projects
+chatbot assistant
+built an llm chatbot; gained experience with rag
+tech stack: python, fastapi
+billing service
+migrated invoices to event sourcing
+technologies: kafka, postgresql
+achievements: cut batch time by 40%
+
+work experience
+acme corp, 3+ years python
+skills: python, sql
+
+education
+b.tech computer science
+skills: python, sql, docker
+"""
+
+
+def test_sections_found_by_heading_lines():
+    sections = segment_sections(RESUME)
+
+    assert list(sections) == ["header", "projects", "experience", "education", "skills"]
+    assert section_text(RESUME, sections, ("header",)) == (
+        "jane doe\nbackend engineer with 4 years of python"
+    )
+    assert section_text(RESUME, sections, ("experience",)) == (
+        "acme corp, 3+ years python\nskills: python, sql"
+    )
+    assert section_text(RESUME, sections, ("education",)) == "b.tech computer science"
+    assert section_text(RESUME, sections, ("skills",)) == "python, sql, docker"
+
+
+def test_section_word_inside_sentence_is_not_a_heading():
+    project_text = extract_project_section(RESUME)
+
+    assert "gained experience with rag" in project_text
+    assert "billing service" in project_text
+
+
+def test_inline_entry_fields_keep_the_project_section_open():
+    project_text = extract_project_section(RESUME)
+
+    # Both projects, including their per-project stack and achievement lines
+    assert project_text.startswith("chatbot assistant")
+    assert "tech stack: python, fastapi" in project_text
+    assert "technologies: kafka, postgresql" in project_text
+    assert project_text.endswith("achievements: cut batch time by 40%")
+
+
+def test_inline_heading_outside_entries_opens_a_section():
+    text = "summary line\nskills: python, sql\neducation\nb.sc physics\n"
+    sections = segment_sections(text)
+
+    assert section_text(text, sections, ("skills",)) == "python, sql"
+    assert section_text(text, sections, ("education",)) == "b.sc physics"
+
+
+def test_no_headings_is_all_header():
+    text = "led three projects and gained experience in python"
+
+    assert segment_sections(text) == {"header": [(0, len(text))]}
+    assert extract_project_section(text) == ""
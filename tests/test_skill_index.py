@@ -0,0 +1,57 @@
+import pytest
+
+from skill_index import SkillIndex, parse_query
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("python OR java AND sql", ("or", ("skill", "python"),
+                                ("and", ("skill", "java"), ("skill", "sql")))),
+    ("(python OR java) AND sql", ("and", ("or", ("skill", "python"), ("skill", "java")),
+                                  ("skill", "sql"))),
+    ("NOT python AND sql", ("and", ("not", ("skill", "python")), ("skill", "sql"))),
+    ("NOT NOT python", ("not", ("not", ("skill", "python")))),
+    ("a AND b AND c", ("and", ("and", ("skill", "a"), ("skill", "b")), ("skill", "c"))),
+])
+def test_operator_precedence(query, expected):
+    assert parse_query(query) == expected
+
+
+def test_quoted_and_multi_word_skills():
+    assert parse_query('"Machine Learning" and deep learning or node.js') == (
+        "or",
+        ("and", ("skill", "machine learning"), ("skill", "deep learning")),
+        ("skill", "node.js"),
+    )
+    assert parse_query('" power bi "') == ("skill", "power bi")
+    assert parse_query("c++ AND ci/cd") == ("and", ("skill", "c++"), ("skill", "ci/cd"))
+
+
+def test_tier_expands_to_taxonomy_skills():
+    index = SkillIndex.from_pool({
+        "ops": ["docker"],
+        "bi": ["power bi", "python"],
+        "web": ["react"],
+    })
+
+    assert parse_query("TIER:Tools") == ("tier", "tools")
+    assert index.query("tier:tools") == {"ops", "bi"}
+    assert index.query("tier:tools AND NOT tier:core_tech") == {"ops"}
+    assert index.query("tier:frameworks OR docker") == {"web", "ops"}
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "   ",
+    "python AND",
+    "AND python",
+    "NOT",
+    "(python OR java",
+    "python)",
+    "()",
+    '"machine learning',
+    "tier:nope",
+    "python (java)",
+])
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(ValueError):
+        parse_query(query)